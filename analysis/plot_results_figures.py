@@ -2,18 +2,26 @@ import os
 import sys
 
 import matplotlib.pyplot as plt
+import numpy as np
 
-from tables import collect_tables, build_compilation_entries, build_execution_entries
-from plotting import plot_bar_chart
+from tables import collect_tables, collect_titled_tables, collect_json_tables, collect_json_first_call_tables
+from tables import build_compilation_entries, build_execution_entries, build_first_call_entries
+from plotting import plot_bar_chart, plot_first_call_chart
 
 if __name__ == '__main__':
     filenames = sys.argv[1:]
 
     for f in filenames:
-        compilation_table, execution_table = collect_tables(f)
+        if f.endswith('.json'):
+            (compilation_header, compilation_entries), (execution_header, execution_entries) = collect_json_tables(f)
+        else:
+            compilation_table, execution_table = collect_tables(f)[:2]
 
-        compilation_header, compilation_body = compilation_table
-        execution_header, execution_body = execution_table
+            compilation_header, compilation_body = compilation_table
+            execution_header, execution_body = execution_table
+
+            compilation_entries = build_compilation_entries(compilation_body)
+            execution_entries = build_execution_entries(execution_body)
 
         n_accelerators = len(compilation_header) - 1
 
@@ -30,7 +38,7 @@ if __name__ == '__main__':
         compilation_filename = os.path.join(dirname, basename_without_version + '_compilation.svg')
         execution_filename   = os.path.join(dirname, basename_without_version + '_execution.svg')
 
-        fig, ax = plot_bar_chart(build_compilation_entries(compilation_body), compilation_keys)
+        fig, ax = plot_bar_chart(compilation_entries, compilation_keys)
         ax.set_ylabel('Compilation time [s]')
         ax.set_yscale('linear')
         ax.grid(True, which='major', axis='y', alpha=0.5, linewidth=0.50)
@@ -39,7 +47,7 @@ if __name__ == '__main__':
 
         plt.savefig(compilation_filename, dpi=150)
 
-        fig, ax = plot_bar_chart(build_execution_entries(execution_body), execution_keys, 0)
+        fig, ax = plot_bar_chart(execution_entries, execution_keys, 0)
         ax.set_ylabel('Speedup')
         ax.set_yscale('log')
         ylim = ax.get_ylim()
@@ -51,4 +59,30 @@ if __name__ == '__main__':
 
         plt.savefig(execution_filename, dpi=150)
         print(execution_filename, compilation_filename)
+
+        # The first call times are only measured if the first_call phase was run
+        if f.endswith('.json'):
+            (first_call_header, first_call_entries), (_, steady_entries) = collect_json_first_call_tables(f)
+        else:
+            first_call_tables = [tab for title, tab in collect_titled_tables(f).items() if title.startswith('First call time')]
+            if first_call_tables:
+                first_call_header, first_call_body = first_call_tables[0]
+                first_call_entries, steady_entries = build_first_call_entries(first_call_body)
+            else:
+                first_call_entries = []
+
+        if first_call_entries and not np.all(np.isnan([e.values for e in first_call_entries])):
+            first_call_keys = {first_call_header[1+i]: i for i in range(n_accelerators)}
+            first_call_filename = os.path.join(dirname, basename_without_version + '_first_call.svg')
+
+            fig, ax = plot_first_call_chart(first_call_entries, steady_entries, first_call_keys)
+            ax.set_ylabel('Time [s]')
+            ax.set_yscale('log')
+            ax.grid(True, which='major', axis='y', alpha=0.5, linewidth=0.50)
+            ax.set_axisbelow(True)
+            fig.tight_layout()
+
+            plt.savefig(first_call_filename, dpi=150)
+            print(first_call_filename)
+
         plt.show()
@@ -0,0 +1,34 @@
+import os
+import re
+import sys
+
+import matplotlib.pyplot as plt
+
+from tables import collect_sweep_series
+from plotting import plot_scaling
+
+if __name__ == '__main__':
+    filenames = sys.argv[1:]
+
+    for f in filenames:
+        dirname = os.path.dirname(f)
+        basename = os.path.splitext(os.path.basename(f))[0]
+
+        for test, series in collect_sweep_series(f).items():
+            test_name = re.sub(r'\W+', '_', test).strip('_').lower()
+            work_unit = next(iter(series.values())).work_unit
+
+            fig, ax = plot_scaling(series, 'throughputs', 'Throughput [{}/s]'.format(work_unit))
+            ax.set_title(test)
+            fig.tight_layout()
+            throughput_filename = os.path.join(dirname, '{}_{}_throughput.svg'.format(basename, test_name))
+            plt.savefig(throughput_filename, dpi=150)
+
+            fig, ax = plot_scaling(series, 'times', 'Execution time [s]')
+            ax.set_title(test)
+            fig.tight_layout()
+            time_filename = os.path.join(dirname, '{}_{}_scaling.svg'.format(basename, test_name))
+            plt.savefig(time_filename, dpi=150)
+
+            print(throughput_filename, time_filename)
+            plt.close('all')
@@ -35,3 +35,44 @@ def plot_bar_chart(results, result_keys, normalise_key = -1):
     ax.legend(loc='center left', bbox_to_anchor=(1, 0.5))
 
     return fig, ax
+
+def plot_first_call_chart(first_calls, steady_state, result_keys):
+    """
+    Plot the time of the first call of each test for each accelerator as bars, with the
+    time of a steady-state call marked on each bar.
+    """
+    labels = [v.test for v in first_calls]
+
+    x = np.arange(len(first_calls))
+    width = 0.75/len(result_keys)
+
+    fig, ax = plt.subplots(figsize=(7, 2.2))
+    start = x-width/2
+    for i, (lab, c) in enumerate(result_keys.items()):
+        first = np.array([v.values[c] * v.factor for v in first_calls])
+        steady = np.array([v.values[c] * v.factor for v in steady_state])
+        ax.bar(start + i*width, first, width, label=lab, color='C'+str(c))
+        ax.scatter(start + i*width, steady, marker='_', color='k', s=20, zorder=3,
+                   label='Steady state' if i == 0 else None)
+
+    ax.set_xticks(x + width*(len(result_keys)-1)/2 - width/2)
+    ax.set_xticklabels(labels, rotation=30, ha='right', rotation_mode="anchor")
+    ax.legend(loc='center left', bbox_to_anchor=(1, 0.5))
+
+    return fig, ax
+
+def plot_scaling(series, values_key, ylabel):
+    """
+    Plot a quantity as a function of the problem size for each accelerator on log-log axes.
+    """
+    fig, ax = plt.subplots(figsize=(7, 3))
+    for i, (lab, v) in enumerate(series.items()):
+        ax.loglog(v.sizes, getattr(v, values_key), marker='o', label=lab, color='C'+str(i))
+
+    ax.set_xlabel(next(iter(series.values())).size_parameter)
+    ax.set_ylabel(ylabel)
+    ax.grid(True, which='major', alpha=0.5, linewidth=0.50)
+    ax.grid(True, which='minor', alpha=0.5, linewidth=0.25)
+    ax.legend(loc='center left', bbox_to_anchor=(1, 0.5))
+
+    return fig, ax
@@ -0,0 +1,245 @@
+"""
+Functions for collecting the historical results into a database and detecting performance regressions
+
+The results saved in version_specific_results are collected into an SQLite
+database which is cached on disk. Only files which have been modified since
+the previous run are parsed again. The timings of each (test, accelerator,
+python version) are then compared between consecutive pyccel releases (and
+between the latest release and the development branch) to find significant
+slowdowns.
+"""
+from argparse import ArgumentParser
+from collections import namedtuple
+import glob
+import math
+import os
+import re
+import sqlite3
+
+import numpy as np
+
+from tables import collect_tables, build_compilation_entries, build_execution_entries, header_neat_names
+
+Regression = namedtuple('Regression', ['test', 'accelerator', 'python', 'phase', 'old_version',
+                                       'new_version', 'old_value', 'new_value', 'slowdown', 'zscore'])
+
+filename_regexp = re.compile(r'(pypi|devel)_performance_3(\d+)(?:_([0-9.]+))?\.md$')
+
+# The same accelerator has been named differently in the headers of the results over
+# time. The names are mapped to one canonical name so that their timings form a single
+# series: the neat names of pyccel <= 1.x results, the pyccel_<family>_<language> names
+# used by the runner since pyccel 2.0, and the names used before the compiler family was
+# recorded (when pyccel used gcc/gfortran and the default language was Fortran).
+accelerator_aliases = dict(header_neat_names)
+accelerator_aliases.update({
+        'pypy' : 'PyPy',
+        'pythran' : 'Pythran (g++)',
+        'pyccel' : 'Pyccel (Fortran, gfortran)',
+        'pyccel_fortran' : 'Pyccel (Fortran, gfortran)',
+        'pyccel_c' : 'Pyccel (C, gcc)',
+        'pyccel_gnu_fortran' : 'Pyccel (Fortran, gfortran)',
+        'pyccel_gnu_c' : 'Pyccel (C, gcc)',
+        'pyccel_intel_fortran' : 'Pyccel (Fortran, ifort)',
+        'pyccel_intel_c' : 'Pyccel (C, icc)',
+        })
+
+def canonical_accelerator(name):
+    """
+    Get the canonical name of an accelerator from the name found in the header of a table.
+    """
+    return accelerator_aliases.get(name, name)
+
+def version_key(version):
+    """
+    Get a key which can be used to sort pyccel versions. The development branch comes last.
+    """
+    if version == 'devel':
+        return (math.inf,)
+    return tuple(int(v) for v in version.split('.'))
+
+def open_database(filename):
+    """
+    Open the database of historical results, creating the tables if necessary.
+
+    Parameters
+    -----------
+    filename : str
+         The file where the database is saved.
+
+    Results
+    --------
+    sqlite3.Connection
+        The connection to the database.
+    """
+    connection = sqlite3.connect(filename)
+    connection.executescript("""
+        CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime REAL);
+        CREATE TABLE IF NOT EXISTS timings (path TEXT, python TEXT, version TEXT,
+                                            test TEXT, accelerator TEXT, phase TEXT,
+                                            value REAL, error REAL);
+        CREATE INDEX IF NOT EXISTS timings_series ON timings (test, accelerator, python, phase);
+        CREATE INDEX IF NOT EXISTS timings_path ON timings (path);
+        """)
+    return connection
+
+def ingest_results(connection, results_dir):
+    """
+    Add the results found in a folder to the database.
+
+    Files which are already in the database and have not been modified are skipped.
+    The accelerators are saved under their canonical names (see `canonical_accelerator`).
+
+    Parameters
+    -----------
+    connection : sqlite3.Connection
+         The connection to the database.
+    results_dir : str
+         The folder containing the markdown files with the results.
+    """
+    for filename in sorted(glob.glob(os.path.join(results_dir, '*.md'))):
+        match = filename_regexp.search(os.path.basename(filename))
+        if not match:
+            continue
+        branch, python_minor, version = match.groups()
+        python = '3.' + python_minor
+        if branch == 'devel':
+            version = 'devel'
+
+        path = os.path.abspath(filename)
+        mtime = os.path.getmtime(filename)
+        known = connection.execute('SELECT mtime FROM files WHERE path = ?', (path,)).fetchone()
+        if known is not None and known[0] == mtime:
+            continue
+
+        connection.execute('DELETE FROM timings WHERE path = ?', (path,))
+        tables = collect_tables(filename)
+        rows = []
+        # Files recording a failure contain no tables. More recent files may contain
+        # additional tables (e.g. memory usage) after the compilation and execution tables.
+        if len(tables) >= 2:
+            (compilation_header, compilation_body), (execution_header, execution_body) = tables[:2]
+            for phase, header, entries in (('compilation', compilation_header, build_compilation_entries(compilation_body)),
+                                           ('execution', execution_header, build_execution_entries(execution_body))):
+                for e in entries:
+                    errors = e.errors if e.errors is not None else [np.nan]*len(e.values)
+                    for accelerator, value, error in zip(header[1:], e.values, errors):
+                        if not np.isnan(value):
+                            rows.append((path, python, version, e.test, canonical_accelerator(accelerator), phase,
+                                         value * e.factor, None if np.isnan(error) else error * e.factor))
+        connection.executemany('INSERT INTO timings VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        connection.execute('INSERT OR REPLACE INTO files VALUES (?, ?)', (path, mtime))
+    connection.commit()
+
+def find_regressions(connection, phase = 'execution', min_slowdown = 0.1, z_threshold = 3.0, reference = 'Python'):
+    """
+    Find the significant slowdowns between consecutive versions of pyccel.
+
+    When both timings have a standard deviation (results obtained with pyperf)
+    the significance is measured with the z-score of the difference. Otherwise
+    the noise is estimated from the spread of the ratios between consecutive
+    versions over the whole history of the (test, accelerator, python version).
+
+    If the reference accelerator (pure python by default) also slows down
+    between the two versions then the test itself was modified, so the
+    slowdown is not reported.
+
+    Parameters
+    -----------
+    connection : sqlite3.Connection
+         The connection to the database.
+    phase : str, default='execution'
+         The phase whose timings are compared ('execution' or 'compilation').
+    min_slowdown : float, default=0.1
+         The minimum relative slowdown which is reported.
+    z_threshold : float, default=3.0
+         The minimum z-score for a slowdown to be considered significant.
+    reference : str or None, default='Python'
+         The accelerator whose timings indicate that the test was modified.
+         If None then all slowdowns are reported.
+
+    Results
+    --------
+    list of Regression
+        The regressions found, ranked from the largest slowdown to the smallest.
+    """
+    series = {}
+    for python, version, test, accelerator, value, error in connection.execute(
+            'SELECT python, version, test, accelerator, value, error FROM timings WHERE phase = ?', (phase,)):
+        series.setdefault((test, accelerator, python), []).append((version_key(version), version, value, error))
+
+    regressions = []
+    for (test, accelerator, python), points in series.items():
+        if accelerator == reference:
+            continue
+        reference_values = {version : value for _, version, value, _ in series.get((test, reference, python), ())}
+        points.sort()
+        if len(points) < 2:
+            continue
+        log_ratios = np.array([math.log(new[2] / old[2]) for old, new in zip(points[:-1], points[1:])
+                               if old[2] > 0 and new[2] > 0])
+        if len(log_ratios) == 0:
+            continue
+        # Robust estimate of the noise between consecutive versions (at least 2%)
+        sigma = max(1.4826 * np.median(np.abs(log_ratios - np.median(log_ratios))), 0.02)
+
+        for old, new in zip(points[:-1], points[1:]):
+            _, old_version, old_value, old_error = old
+            _, new_version, new_value, new_error = new
+            if old_value <= 0 or new_value <= 0:
+                continue
+            slowdown = new_value / old_value - 1
+            if slowdown < min_slowdown:
+                continue
+            old_reference = reference_values.get(old_version, None)
+            new_reference = reference_values.get(new_version, None)
+            if old_reference and new_reference and new_reference / old_reference - 1 >= min_slowdown:
+                # The test was modified
+                continue
+            if old_error and new_error:
+                zscore = (new_value - old_value) / math.sqrt(old_error**2 + new_error**2)
+            else:
+                zscore = math.log(new_value / old_value) / sigma
+            if zscore >= z_threshold:
+                regressions.append(Regression(test, accelerator, python, phase, old_version, new_version,
+                                              old_value, new_value, slowdown, zscore))
+
+    regressions.sort(key = lambda r: (r.slowdown, r.zscore), reverse = True)
+    return regressions
+
+def format_report(regressions):
+    """
+    Format the regressions as a ranked markdown table.
+    """
+    lines = ['| Rank | Test | Accelerator | Python | Versions | Before [s] | After [s] | Slowdown | z-score |',
+             '| ---- | ---- | ----------- | ------ | -------- | ---------- | --------- | -------- | ------- |']
+    for i, r in enumerate(regressions):
+        lines.append('| {} | {} | {} | {} | {} -> {} | {:.3g} | {:.3g} | {:.1f}% | {:.1f} |'.format(
+                     i+1, r.test, r.accelerator, r.python, r.old_version, r.new_version,
+                     r.old_value, r.new_value, 100*r.slowdown, r.zscore))
+    return '\n'.join(lines)
+
+if __name__ == '__main__':
+    default_results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'version_specific_results')
+
+    parser = ArgumentParser(description='Detect performance regressions between consecutive versions of pyccel')
+    parser.add_argument('--results-dir', type=str, default=default_results_dir,
+                            help='Folder containing the results (default=version_specific_results)')
+    parser.add_argument('--database', type=str, default=None,
+                            help='File where the database of results is cached (default=<results-dir>/performance_history.sqlite)')
+    parser.add_argument('--phase', choices=('execution', 'compilation'), default='execution',
+                            help='Phase whose timings are compared (default=execution)')
+    parser.add_argument('--min-slowdown', type=float, default=0.1,
+                            help='Minimum relative slowdown which is reported (default=0.1)')
+    parser.add_argument('--z-threshold', type=float, default=3.0,
+                            help='Minimum z-score for a slowdown to be considered significant (default=3)')
+    parser.add_argument('--all', action='store_true',
+                            help='Report all slowdowns, including those where the pure python timing also slowed down')
+    args = parser.parse_args()
+
+    database = args.database or os.path.join(args.results_dir, 'performance_history.sqlite')
+
+    connection = open_database(database)
+    ingest_results(connection, args.results_dir)
+    print(format_report(find_regressions(connection, args.phase, args.min_slowdown, args.z_threshold,
+                                         None if args.all else 'Python')))
+    connection.close()
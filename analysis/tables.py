@@ -1,12 +1,13 @@
 """
-Functions for collecting tables from markdown
+Functions for collecting tables from markdown or from the JSON results file
 """
 from collections import namedtuple
+import json
 import re
 
 import numpy as np
 
-Entry = namedtuple('Entry', ['test', 'values', 'factor'])
+Entry = namedtuple('Entry', ['test', 'values', 'factor', 'errors'], defaults = [None])
 
 def collect_tables(filename):
     """
@@ -32,6 +33,42 @@ def collect_tables(filename):
 
     return [unpack_table(tab) for tab in tables]
 
+def collect_titled_tables(filename):
+    """
+    Collect all tables in a markdown file which are preceded by a title
+
+    Parameters
+    -----------
+    filename : str
+         The markdown file containing the tables.
+
+    Results
+    --------
+    dict
+        A dictionary mapping the title of each table (without the leading '#')
+        to the header and the contents of the cells of the table.
+    """
+    with open(filename, encoding='utf8') as f:
+        lines = f.readlines()
+
+    tables = {}
+    title = None
+    i = 0
+    while i < len(lines):
+        if lines[i].startswith('#'):
+            title = lines[i].strip('#').strip()
+        elif '|' in lines[i]:
+            table_start = i
+            while i < len(lines) and '|' in lines[i]:
+                i += 1
+            if title is not None:
+                tables[title] = unpack_table(lines[table_start:i])
+            title = None
+            continue
+        i += 1
+
+    return tables
+
 def unpack_table(lines):
     """
     Unpacks a list of strings describing lines of a markdown array into the lists describing the cells
@@ -73,11 +110,133 @@ def build_execution_entries(table_body):
     time_str = [[t.split(r'$\pm$') for t in l[1:]] for l in table_body]
     times = [[np.nan if t[0] == '-' else float(t[0].strip()) for t in l] for l in time_str]
     errors = [[np.nan if len(t) == 1 else float(t[1].strip()) for t in l] for l in time_str]
-    return [Entry(n, v, f) for n,v,f in zip(name, times, time_factor)]
+    return [Entry(n, v, f, e) for n,v,f,e in zip(name, times, time_factor, errors)]
+
+def build_first_call_entries(table_body):
+    """
+    From a list describing the cells of a table of first call times, extract the entries
+
+    Each cell contains the time of the first call and the time of a steady-state
+    call separated by a '/'. Two lists of entries are returned, one for each time.
+    """
+    units = {'s':1, 'ms' : 1e-3, r'\textmu s' : 1e-6, 'ns' : 1e-9}
+    name_with_units = [re.split(r'\(|\)', b[0]) for b in table_body]
+    name = [n[0].strip() for n in name_with_units]
+    time_factor = [units[n[1]] if len(n) > 1 else 1 for n in name_with_units]
+    time_str = [[t.split('/') for t in l[1:]] for l in table_body]
+    first_calls = [[np.nan if t[0].strip() == '-' else float(t[0].strip()) for t in l] for l in time_str]
+    steady = [[np.nan if len(t) == 1 or t[1].strip() == '-' else float(t[1].strip()) for t in l] for l in time_str]
+    return ([Entry(n, v, f) for n,v,f in zip(name, first_calls, time_factor)],
+            [Entry(n, v, f) for n,v,f in zip(name, steady, time_factor)])
+
+def collect_json_tables(filename):
+    """
+    Collect the compilation and execution entries from a JSON file written by run_benchmarks.py
+
+    The entries are built directly from the raw measurements so no precision
+    is lost. All times are expressed in seconds.
+
+    Parameters
+    -----------
+    filename : str
+         The JSON file containing the results.
+
+    Results
+    --------
+    compilation_table : tuple
+        The header of the compilation table and a list of entries describing its rows.
+    execution_table : tuple
+        The header of the execution table and a list of entries describing its rows.
+    """
+    with open(filename, encoding='utf8') as f:
+        results = json.load(f)
+
+    header = neaten_header(['Algorithm'] + [a['name'] for a in results['accelerators']])
+    stat = 'mean' if results['timer'] == 'pyperf' else 'best'
+
+    return (header, build_json_entries(results, 'compilation', 'best')), (header, build_json_entries(results, 'execution', stat))
+
+def collect_json_first_call_tables(filename):
+    """
+    Collect the first call and steady-state entries from a JSON file written by run_benchmarks.py
+
+    All times are expressed in seconds.
+
+    Parameters
+    -----------
+    filename : str
+         The JSON file containing the results.
+
+    Results
+    --------
+    first_call_table : tuple
+        The header of the table and a list of entries describing the median
+        time of the first call in a fresh process for each test.
+    steady_state_table : tuple
+        The header of the table and a list of entries describing the best
+        time of a steady-state call for each test.
+    """
+    with open(filename, encoding='utf8') as f:
+        results = json.load(f)
+
+    header = neaten_header(['Algorithm'] + [a['name'] for a in results['accelerators']])
+
+    return (header, build_json_entries(results, 'first_call', 'median')), (header, build_json_entries(results, 'execution', 'best'))
+
+def build_json_entries(results, phase, stat):
+    """
+    From the results of the benchmark suite, extract the entries describing a statistic of a phase (in seconds)
+    """
+    records = {(r['test'], r['accelerator']) : r for r in results['records'] if r['status'] == 'ok' and r['phase'] == phase}
+    entries = []
+    for test in results['tests']:
+        test_records = [records.get((test, a['id']), None) for a in results['accelerators']]
+        values = [np.nan if r is None else r['statistics'][stat] * 1e-9 for r in test_records]
+        errors = [np.nan if r is None else r['statistics']['stddev'] * 1e-9 for r in test_records]
+        entries.append(Entry(test, values, 1, errors))
+    return entries
+
+SweepSeries = namedtuple('SweepSeries', ['size_parameter', 'work_unit', 'sizes', 'times', 'throughputs'])
+
+def collect_sweep_series(filename):
+    """
+    Collect the results of the problem-size sweeps from a JSON file written by run_benchmarks.py
+
+    Parameters
+    -----------
+    filename : str
+         The JSON file containing the results.
+
+    Results
+    --------
+    dict
+        A dictionary mapping the name of each test to a dictionary which maps
+        the (neat) name of each accelerator to a SweepSeries. The times are
+        expressed in seconds and the throughputs in work units per second.
+    """
+    with open(filename, encoding='utf8') as f:
+        results = json.load(f)
+
+    series = {}
+    for test in results['tests']:
+        test_series = {}
+        for a in results['accelerators']:
+            records = sorted((r for r in results['records'] if r['test'] == test and r['accelerator'] == a['id']
+                                and r['phase'] == 'sweep' and r['status'] == 'ok'), key = lambda r: r['size'])
+            if not records:
+                continue
+            times = np.array([r['statistics']['best'] * 1e-9 for r in records])
+            test_series[neaten_header([a['name']])[0]] = SweepSeries(records[0]['size_parameter'], records[0]['work_unit'],
+                                                     np.array([r['size'] for r in records]), times,
+                                                     np.array([r['work'] for r in records]) / times)
+        if test_series:
+            series[test] = test_series
+    return series
 
 header_neat_names = {
         'python' : 'Python',
         'numba' : 'Numba',
+        'numba_cached' : 'Numba (cached)',
         'pythran_gnu' : 'Pythran (g++)',
         'pythran_intel' : 'Pythran (icx)',
         'pyccel_fortran_gnu' : 'Pyccel (Fortran, gfortran)',
@@ -0,0 +1,49 @@
+"""
+Tests for the collection of the historical results into the regression database
+"""
+import os
+
+from regressions import open_database, ingest_results
+
+old_results = """### Performance Comparison (as of 1.9.0)
+## Compilation time
+Algorithm                 | python                    | pythran_gnu               | numba                     | pyccel_fortran_gnu        | pyccel_c_gnu
+------------------------- | ------------------------- | ------------------------- | ------------------------- | ------------------------- | -------------------------
+Ackermann                 | -                         | 2.00                      | 0.30                      | 1.40                      | 1.40
+
+## Execution time
+Algorithm                 | python                    | pythran_gnu               | numba                     | pyccel_fortran_gnu        | pyccel_c_gnu
+------------------------- | ------------------------- | ------------------------- | ------------------------- | ------------------------- | -------------------------
+Ackermann (ms)            | 300.00 $\\pm$ 5.00         | 3.00 $\\pm$ 0.10           | 9.00 $\\pm$ 0.40           | 1.30 $\\pm$ 0.01           | 1.20 $\\pm$ 0.01
+"""
+
+new_results = """### Performance Comparison (as of 2.0.1)
+## Compilation time
+Algorithm                 | python                    | pythran_gnu               | numba                     | pyccel_gnu_c              | pyccel_gnu_fortran
+------------------------- | ------------------------- | ------------------------- | ------------------------- | ------------------------- | -------------------------
+Ackermann                 | -                         | 2.10                      | 0.30                      | 1.40                      | 1.40
+
+## Execution time
+Algorithm                 | python                    | pythran_gnu               | numba                     | pyccel_gnu_c              | pyccel_gnu_fortran
+------------------------- | ------------------------- | ------------------------- | ------------------------- | ------------------------- | -------------------------
+Ackermann (ms)            | 300.00 $\\pm$ 5.00         | 3.00 $\\pm$ 0.10           | 9.00 $\\pm$ 0.40           | 2.40 $\\pm$ 0.01           | 1.30 $\\pm$ 0.01
+"""
+
+def test_header_styles_form_one_series(tmp_path):
+    with open(os.path.join(tmp_path, 'pypi_performance_310_1.9.0.md'), 'w', encoding='utf8') as f:
+        f.write(old_results)
+    with open(os.path.join(tmp_path, 'pypi_performance_310_2.0.1.md'), 'w', encoding='utf8') as f:
+        f.write(new_results)
+
+    connection = open_database(os.path.join(tmp_path, 'history.sqlite'))
+    ingest_results(connection, tmp_path)
+
+    accelerators = [a for a, in connection.execute(
+            "SELECT DISTINCT accelerator FROM timings WHERE phase = 'execution' ORDER BY accelerator")]
+    assert accelerators == ['Numba', 'Pyccel (C, gcc)', 'Pyccel (Fortran, gfortran)', 'Python', 'Pythran (g++)']
+
+    series = connection.execute("""SELECT version, value FROM timings
+                                   WHERE phase = 'execution' AND accelerator = 'Pyccel (C, gcc)'
+                                   ORDER BY version""").fetchall()
+    assert series == [('1.9.0', 1.2e-3), ('2.0.1', 2.4e-3)]
+    connection.close()
@@ -0,0 +1,135 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+""" Module providing a persistent cache of the shared libraries built by pyccel and pythran
+"""
+import glob
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+class BuildCache:
+    """
+    A content-addressed cache of compiled extension modules.
+
+    Each entry is a folder named after a hash describing everything which
+    influences the build (source code, compiler configuration, tool versions).
+    The folder contains the shared libraries which were generated by the build.
+    The modification time of an entry records when it was last used so that
+    the least recently used entries can be removed when the cache grows larger
+    than the maximum size.
+
+    Parameters
+    ----------
+    folder : str
+        The folder where the cache is saved.
+    max_size : int
+        The maximum size of the cache in bytes.
+    """
+    def __init__(self, folder, max_size):
+        self._folder = folder
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    @staticmethod
+    def get_key(*components):
+        """
+        Get the key describing a build from the components which influence it.
+
+        Parameters
+        ----------
+        *components : str or bytes
+            The objects which influence the build (source code, compiler
+            configuration, tool versions, etc.).
+
+        Returns
+        -------
+        str
+            The hash identifying the build.
+        """
+        h = hashlib.sha256()
+        for c in components:
+            if isinstance(c, str):
+                c = c.encode()
+            h.update(len(c).to_bytes(8, 'little'))
+            h.update(c)
+        return h.hexdigest()
+
+    def restore(self, key, folder):
+        """
+        Copy the shared libraries saved for a build into a folder.
+
+        Parameters
+        ----------
+        key : str
+            The hash identifying the build.
+        folder : str
+            The folder where the shared libraries should be copied.
+
+        Returns
+        -------
+        bool
+            True if the build was found in the cache, False otherwise.
+        """
+        entry = os.path.join(self._folder, key)
+        with self._lock:
+            if not os.path.isdir(entry):
+                return False
+            for f in os.listdir(entry):
+                shutil.copy2(os.path.join(entry, f), os.path.join(folder, f))
+            os.utime(entry)
+        return True
+
+    def store(self, key, folder):
+        """
+        Save the shared libraries found in a folder in the cache.
+
+        Parameters
+        ----------
+        key : str
+            The hash identifying the build.
+        folder : str
+            The folder where the build was carried out.
+        """
+        libs = glob.glob(os.path.join(folder, '*.so'))
+        if not libs:
+            return
+        entry = os.path.join(self._folder, key)
+        with self._lock:
+            if os.path.isdir(entry):
+                os.utime(entry)
+                return
+            # Write to a temporary folder first so an incomplete entry is never visible
+            tmp_entry = tempfile.mkdtemp(dir=self._folder, prefix='.tmp_')
+            for f in libs:
+                shutil.copy2(f, tmp_entry)
+            try:
+                os.rename(tmp_entry, entry)
+            except OSError:
+                # The entry was created by another process
+                shutil.rmtree(tmp_entry)
+            self._evict()
+
+    def _evict(self):
+        """
+        Remove the least recently used entries until the cache is smaller than its maximum size.
+        """
+        entries = []
+        for key in os.listdir(self._folder):
+            entry = os.path.join(self._folder, key)
+            if key.startswith('.') or not os.path.isdir(entry):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+            entries.append((os.path.getmtime(entry), size, entry))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total_size <= self._max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
@@ -0,0 +1,477 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+""" Module providing functions to save the results of the benchmark suite and to render them as tables
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+
+try:
+    from importlib.metadata import version, PackageNotFoundError
+except ImportError: # pragma: no cover
+    version = None
+    PackageNotFoundError = Exception
+
+possible_units = ['sec','ms','us','ns']
+latex_units = ['s','ms','\\textmu s','ns']
+
+cell_splitter = {'latex'    : ' & ',
+                 'markdown' : ' | '}
+row_splitter  = {'latex'    : '\\\\\n\\hline\n',
+                 'markdown' : '\n'}
+
+out_header = {'latex'    : lambda s : r'\textbf{'+s+'}',
+              'markdown' : lambda s : '## '+s
+             }
+
+def compute_statistics(samples):
+    """
+    Compute the statistics describing a set of timing samples.
+
+    Parameters
+    ----------
+    samples : list of int
+        The duration of each timed call in nanoseconds.
+
+    Returns
+    -------
+    dict
+        A dictionary containing the best, mean, median and standard deviation
+        of the samples in nanoseconds, and the number of samples.
+    """
+    return {'best'   : min(samples),
+            'mean'   : statistics.mean(samples),
+            'median' : statistics.median(samples),
+            'stddev' : statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            'n_samples' : len(samples)}
+
+def get_unit_index(time_ns):
+    """
+    Get the index of the most appropriate unit in possible_units to display a time.
+
+    As in timeit, the largest unit for which the time is at least 1 is chosen.
+    The unit of a negative time is chosen from its absolute value.
+    """
+    for i in range(len(possible_units)):
+        if abs(time_ns) >= 1000**(3-i):
+            return i
+    return len(possible_units)-1
+
+def get_package_version(package):
+    """
+    Get the version of an installed package, or None if it is not installed.
+    """
+    if version is None:
+        return None
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return None
+
+def get_environment():
+    """
+    Get a description of the environment in which the benchmarks are run.
+
+    Returns
+    -------
+    dict
+        A dictionary describing the git commit of the benchmarks, the versions
+        of python and the accelerators, and the host machine.
+    """
+    try:
+        git_sha = subprocess.run(['git', 'rev-parse', 'HEAD'], stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL, universal_newlines=True, check=True,
+                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        git_sha = None
+
+    cpu_model = platform.processor()
+    try:
+        with open('/proc/cpuinfo', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    cpu_model = line.split(':', 1)[1].strip()
+                    break
+    except OSError:
+        pass
+
+    return {'git_sha' : git_sha,
+            'python' : platform.python_version(),
+            'python_implementation' : platform.python_implementation(),
+            'versions' : {p : get_package_version(p) for p in ('pyccel', 'numba', 'pythran', 'numpy', 'pyperf')},
+            'host' : {'name' : platform.node(),
+                      'platform' : platform.platform(),
+                      'machine' : platform.machine(),
+                      'cpu' : cpu_model,
+                      'cpu_count' : os.cpu_count()},
+           }
+
+def make_record(test, accelerator, phase, samples_ns = None, status = 'ok', **kwargs):
+    """
+    Create a record describing the result of one phase of a test case.
+
+    Parameters
+    ----------
+    test : str
+        The name of the test.
+    accelerator : str
+        The name of the accelerator (the test case).
+    phase : str
+        The phase which was measured (e.g. 'compilation', 'execution').
+    samples_ns : list of int, optional
+        The raw measurements in nanoseconds.
+    status : str, default='ok'
+        'ok' if the phase succeeded, 'failed' otherwise.
+    **kwargs : dict
+        Any additional information about the measurement.
+
+    Returns
+    -------
+    dict
+        The record.
+    """
+    record = {'test' : test,
+              'accelerator' : accelerator,
+              'phase' : phase,
+              'status' : status,
+              'samples_ns' : samples_ns or []}
+    if samples_ns:
+        record['statistics'] = compute_statistics(samples_ns)
+    record.update(kwargs)
+    return record
+
+def save_results(filename, results):
+    """
+    Save the results of the benchmark suite to a JSON file.
+    """
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=1)
+
+def load_results(filename):
+    """
+    Load the results of the benchmark suite from a JSON file.
+    """
+    with open(filename, encoding='utf-8') as f:
+        return json.load(f)
+
+def get_record(results, test, accelerator, phase):
+    """
+    Get the successful record for a given test case and phase, or None if it does not exist.
+    """
+    for r in results['records']:
+        if r['test'] == test and r['accelerator'] == accelerator and r['phase'] == phase:
+            return r if r['status'] == 'ok' else None
+    return None
+
+def format_row(cells, output_format):
+    """
+    Format the cells of a table row.
+    """
+    return cell_splitter[output_format].join('{0: <25}'.format(s) for s in cells)
+
+def format_table(results, output_format, name, rows, first_column = 'Algorithm'):
+    """
+    Format a table of results with a header.
+
+    Parameters
+    ----------
+    results : dict
+        The results of the benchmark suite.
+    output_format : str
+        The format of the table ('markdown' or 'latex').
+    name : str
+        The name of the table.
+    rows : list of list of str
+        The cells of each row of the table.
+    first_column : str, default='Algorithm'
+        The title of the first column.
+
+    Returns
+    -------
+    str
+        The formatted table.
+    """
+    test_case_names = [a['name'] for a in results['accelerators']]
+    table = [format_row([first_column]+test_case_names, output_format)]
+    if output_format == 'markdown':
+        table.append(format_row(['-'*25]*(len(test_case_names)+1), output_format))
+    table.extend(format_row(r, output_format) for r in rows)
+    return out_header[output_format](name) + '\n' + row_splitter[output_format].join(table) + '\n'
+
+def compilation_rows(results):
+    """
+    Get the cells of the compilation time table (in seconds).
+    """
+    rows = []
+    for test in results['tests']:
+        row = [test]
+        for a in results['accelerators']:
+            r = get_record(results, test, a['id'], 'compilation')
+            row.append('-' if r is None else '{:.2f}'.format(r['statistics']['best']*1e-9))
+        rows.append(row)
+    return rows
+
+def execution_rows(results, phase = 'execution', stat = None):
+    """
+    Get the cells of a table of timings.
+
+    All timings in a row are expressed in the same units which are indicated
+    next to the name of the test.
+
+    Parameters
+    ----------
+    results : dict
+        The results of the benchmark suite.
+    phase : str, default='execution'
+        The phase whose timings are printed.
+    stat : str, optional
+        The statistic which is printed. By default the best time is printed,
+        or the mean and the standard deviation if the timings were collected
+        with pyperf.
+
+    Returns
+    -------
+    list of list of str
+        The cells of each row of the table.
+    """
+    with_stddev = stat is None and results['timer'] == 'pyperf'
+    if stat is None:
+        stat = 'mean' if with_stddev else 'best'
+    rows = []
+    for test in results['tests']:
+        records = [get_record(results, test, a['id'], phase) for a in results['accelerators']]
+        used_units = [get_unit_index(r['statistics'][stat]) for r in records if r is not None]
+        if not used_units:
+            rows.append([test] + ['-']*len(records))
+            continue
+        unit_index = round(sum(used_units)/len(used_units))
+        factor = 1000**(3-unit_index)
+        row = [test + ' ('+latex_units[unit_index]+')']
+        for r in records:
+            if r is None:
+                row.append('-')
+            elif with_stddev:
+                row.append('{mean:.2f} $\\pm$ {stddev:.2f}'.format(
+                            mean=r['statistics']['mean']/factor,
+                            stddev=r['statistics']['stddev']/factor))
+            else:
+                row.append('{:.2f}'.format(r['statistics'][stat]/factor))
+        rows.append(row)
+    return rows
+
+def memory_rows(results):
+    """
+    Get the cells of the memory table.
+
+    Each cell contains the peak resident set size of the process in MB, the
+    peak size of the memory traced by tracemalloc (python objects and numpy
+    arrays) in MB and the median number of page faults during the first call
+    in a fresh process. Later calls mostly reuse the pages which the
+    allocator already holds, so they show almost no page faults.
+    """
+    rows = []
+    for test in results['tests']:
+        row = [test]
+        for a in results['accelerators']:
+            r = get_record(results, test, a['id'], 'execution')
+            m = r.get('memory', None) if r is not None else None
+            f = get_record(results, test, a['id'], 'first_call')
+            page_faults = f.get('page_faults', None) if f is not None else None
+            if m is None:
+                row.append('-')
+            else:
+                row.append('{:.1f} / {:.1f} / {}'.format(m['peak_rss_bytes']/1024**2, m['traced_peak_bytes']/1024**2,
+                                                        '-' if not page_faults else round(statistics.median(page_faults))))
+        rows.append(row)
+    return rows
+
+def first_call_rows(results):
+    """
+    Get the cells of the first call table.
+
+    Each cell contains the median time of the first call in a fresh process
+    and the best time of a steady-state call. All timings in a row are
+    expressed in the same units which are indicated next to the name of the
+    test.
+    """
+    rows = []
+    for test in results['tests']:
+        first_calls = [get_record(results, test, a['id'], 'first_call') for a in results['accelerators']]
+        steady = [get_record(results, test, a['id'], 'execution') for a in results['accelerators']]
+        used_units = [get_unit_index(r['statistics']['median']) for r in first_calls if r is not None]
+        if not used_units:
+            rows.append([test] + ['-']*len(first_calls))
+            continue
+        unit_index = round(sum(used_units)/len(used_units))
+        factor = 1000**(3-unit_index)
+        row = [test + ' ('+latex_units[unit_index]+')']
+        for f, e in zip(first_calls, steady):
+            if f is None:
+                row.append('-')
+            else:
+                row.append('{:.2f} / {}'.format(f['statistics']['median']/factor,
+                                                '-' if e is None else '{:.2f}'.format(e['statistics']['best']/factor)))
+        rows.append(row)
+    return rows
+
+def sweep_tables(results, output_format):
+    """
+    Format the tables describing the throughput of each test at each point of its problem-size sweep.
+
+    Parameters
+    ----------
+    results : dict
+        The results of the benchmark suite.
+    output_format : str
+        The format of the tables ('markdown' or 'latex').
+
+    Returns
+    -------
+    list of str
+        The formatted tables.
+    """
+    tables = []
+    for test in results['tests']:
+        records = [r for r in results['records'] if r['test'] == test and r['phase'] == 'sweep' and r['status'] == 'ok']
+        if not records:
+            continue
+        sizes = sorted({r['size'] for r in records})
+        throughput = {(r['accelerator'], r['size']) : r['work'] / (r['statistics']['best']*1e-9) for r in records}
+        rows = [[str(size)] + ['{:.3e}'.format(throughput[(a['id'], size)]) if (a['id'], size) in throughput else '-'
+                               for a in results['accelerators']]
+                for size in sizes]
+        name = '{} throughput ({}/s)'.format(test, records[0]['work_unit'])
+        tables.append(format_table(results, output_format, name, rows, records[0]['size_parameter']))
+    return tables
+
+def scaling_tables(results, output_format):
+    """
+    Format the tables describing the strong scaling of each parallel test.
+
+    Each cell contains the best time, the speedup and the parallel efficiency
+    with a given number of threads. The speedup and the efficiency are
+    relative to the run of the same accelerator with the fewest threads n0:
+    speedup(n) = T(n0) / T(n) and efficiency(n) = speedup(n) * n0 / n.
+
+    Parameters
+    ----------
+    results : dict
+        The results of the benchmark suite.
+    output_format : str
+        The format of the tables ('markdown' or 'latex').
+
+    Returns
+    -------
+    list of str
+        The formatted tables.
+    """
+    percent = '\\%' if output_format == 'latex' else '%'
+    tables = []
+    for test in results['tests']:
+        records = [r for r in results['records'] if r['test'] == test and r['phase'] == 'scaling' and r['status'] == 'ok']
+        if not records:
+            continue
+        counts = sorted({r['threads'] for r in records})
+        best = {(r['accelerator'], r['threads']) : r['statistics']['best'] for r in records}
+        used_units = [get_unit_index(b) for b in best.values()]
+        unit_index = round(sum(used_units)/len(used_units))
+        factor = 1000**(3-unit_index)
+        rows = []
+        for n in counts:
+            row = [str(n)]
+            for a in results['accelerators']:
+                if (a['id'], n) not in best:
+                    row.append('-')
+                    continue
+                n0 = min(c for c in counts if (a['id'], c) in best)
+                speedup = best[(a['id'], n0)] / best[(a['id'], n)]
+                row.append('{:.2f} / {:.2f} / {:.0f}{}'.format(best[(a['id'], n)]/factor, speedup,
+                                                              100 * speedup * n0 / n, percent))
+            rows.append(row)
+        name = '{} strong scaling (time [{}] / speedup / efficiency)'.format(test, latex_units[unit_index])
+        tables.append(format_table(results, output_format, name, rows, 'threads'))
+    return tables
+
+def weak_scaling_rows(results, n_processes):
+    """
+    Get the cells of the weak scaling table.
+
+    Each cell contains the aggregate throughput of the concurrent processes
+    (the sum over the processes of the number of calls per second, computed
+    from the median time of each process) and the per-process slowdown (the
+    mean over the processes of the median time, divided by the median time
+    of a single process) with n_processes processes.
+    """
+    def get_weak_record(test, accelerator, processes):
+        for r in results['records']:
+            if r['test'] == test and r['accelerator'] == accelerator and r['phase'] == 'weak_scaling' \
+                    and r.get('processes', None) == processes:
+                return r if r['status'] == 'ok' else None
+        return None
+
+    rows = []
+    for test in results['tests']:
+        row = [test]
+        for a in results['accelerators']:
+            single = get_weak_record(test, a['id'], 1)
+            multiple = get_weak_record(test, a['id'], n_processes)
+            if single is None or multiple is None:
+                row.append('-')
+                continue
+            medians = [statistics.median(p) for p in multiple['process_samples_ns']]
+            throughput = sum(1e9 / m for m in medians)
+            slowdown = statistics.mean(medians) / single['statistics']['median']
+            row.append('{:.3g} / {:.2f}'.format(throughput, slowdown))
+        rows.append(row)
+    return rows
+
+def render_tables(results, output_format):
+    """
+    Render the results of the benchmark suite as the tables printed in bench.out.
+
+    Parameters
+    ----------
+    results : dict
+        The results of the benchmark suite.
+    output_format : str
+        The format of the tables ('markdown' or 'latex').
+
+    Returns
+    -------
+    str
+        The tables.
+    """
+    phases = results['phases']
+    out = ''
+    if 'compilation' in phases:
+        out += format_table(results, output_format, "Compilation time", compilation_rows(results))
+    out += '\n'
+    if 'execution' in phases:
+        out += format_table(results, output_format, "Execution time", execution_rows(results))
+    if 'memory' in phases:
+        out += '\n' + format_table(results, output_format, "Memory (peak RSS [MB] / traced peak [MB] / page faults of the first call in a fresh process)",
+                                   memory_rows(results))
+    if 'cache_load' in phases:
+        out += '\n' + format_table(results, output_format, "Numba cache load time (first call overhead with a warm cache)",
+                                   execution_rows(results, 'cache_load', 'best'))
+    if 'startup' in phases:
+        out += '\n' + format_table(results, output_format, "Startup time (import in a fresh interpreter)",
+                                   execution_rows(results, 'startup', 'best'))
+    if 'first_call' in phases:
+        out += '\n' + format_table(results, output_format, "First call time (first call in a fresh process / steady state)",
+                                   first_call_rows(results))
+    if 'sweep' in phases:
+        out += ''.join('\n' + table for table in sweep_tables(results, output_format))
+    if 'scaling' in phases:
+        out += ''.join('\n' + table for table in scaling_tables(results, output_format))
+    if 'weak_scaling' in phases:
+        n_processes = max(r.get('processes', 1) for r in results['records'] if r['phase'] == 'weak_scaling')
+        out += '\n' + format_table(results, output_format,
+                                   "Weak scaling with {} processes (aggregate throughput [calls/s] / per-process slowdown)".format(n_processes),
+                                   weak_scaling_rows(results, n_processes))
+    return out
@@ -8,19 +8,35 @@
 """
 from argparse import ArgumentParser
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import functools
+import io
 import json
 import os
+import queue
 import re
-import resource
 import shutil
+import statistics
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 from typing import TYPE_CHECKING
 
+from build_cache import BuildCache
+from results import get_environment, make_record, render_tables, save_results
+
 if TYPE_CHECKING:
     from typing import List
 
-TestInfo = namedtuple('TestInfo', 'name basename imports setup call')
+# Tests whose code contains OpenMP pragmas (and prange loops in the numba version) are marked
+# as parallel. They are compiled with OpenMP and can be timed with several threads.
+TestInfo = namedtuple('TestInfo', 'name basename imports setup call sweep parallel', defaults = [None, False])
+# A grid of problem sizes. The setup and call are format strings which are filled with the
+# parameters of each point. work returns the number of work units carried out at a point.
+SweepInfo = namedtuple('SweepInfo', 'setup call points size work unit')
 
 parser = ArgumentParser(description='Run the benchmarks to compare pyccel with pure python, pythran and numba')
 
@@ -30,24 +46,73 @@ parser.add_argument('--no_compilation', action='store_false', dest='compilation'
                         help="Don't time the compilation step")
 parser.add_argument('--no_execution', action='store_false', dest='execution', \
                         help="Don't time the execution step")
+parser.add_argument('--warmup', type=int, default=1, help='Number of untimed calls before the timing begins (default=1)')
+parser.add_argument('--min-samples', type=int, default=5, help='Minimum number of timed calls for each test (default=5)')
+parser.add_argument('--min-time', type=float, default=0.2, help='Minimum time spent in timed calls for each test in seconds (default=0.2)')
+parser.add_argument('--repeats', type=int, default=1, \
+                        help='Number of independent processes used to time each test case. All processes reuse the same compiled code (default=1)')
+parser.add_argument('--no-memory', action='store_false', dest='memory', \
+                        help="Don't measure the memory used by each test case")
+parser.add_argument('--no-startup', action='store_false', dest='startup', \
+                        help="Don't time the import of each test case in a fresh interpreter")
+parser.add_argument('--startup-samples', type=int, default=10, \
+                        help='Number of fresh interpreters used to time the import of each test case (default=10)')
+parser.add_argument('--no-first-call', action='store_false', dest='first_call', \
+                        help="Don't time the first call of each test case in a fresh process")
+parser.add_argument('--first-call-samples', type=int, default=5, \
+                        help='Number of fresh processes used to time the first call of each test case (default=5)')
 parser.add_argument('--pypy', action='store_true', help='Run test cases with pypy')
 parser.add_argument('--no_numba', action='store_true', help="Don't run numba tests")
+parser.add_argument('--no_numba_cached', action='store_true', help="Don't run numba tests with the compiled code cached on disk")
 parser.add_argument('--pythran-config-files', type=str, nargs='*', help='Provide configuration files for pythran', default = [])
 parser.add_argument('--pyccel-config-families', type=str, nargs='*', help='Provide (default or registered) configuration families for pyccel', default = [])
 parser.add_argument('--output', choices=('latex', 'markdown'), \
                         help='Format of the output table (default=markdown)',default='markdown')
 parser.add_argument('--verbose', action='store_true', help='Enables verbose mode.')
+parser.add_argument('--suite', choices=('default', 'cfd'), default='default', \
+                        help='Collection of tests to be run. The cfd suite contains the steps of the CFD Python lessons on production-sized grids (default=default)')
+sweep_group = parser.add_mutually_exclusive_group()
+sweep_group.add_argument('--sweep', action='store_true', \
+                        help='Time each test which declares a grid of problem sizes at every point of the grid instead of timing the default problem size')
+sweep_group.add_argument('--threads', type=int, nargs='+', default=[], \
+                        help='Time each parallel test with each of the numbers of threads provided (through OMP_NUM_THREADS and NUMBA_NUM_THREADS) and report the strong scaling')
+sweep_group.add_argument('--processes', type=int, default=0, \
+                        help='Time each test in 1 and in N concurrent processes, each pinned to its own core, and report the weak scaling')
+parser.add_argument('--build-cache', type=str, help='Folder where compiled shared libraries are cached. The cache is only used to skip compilation when the compilation is not timed',
+                        default=os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join('~', '.cache')), 'pyccel-benchmarks'))
+parser.add_argument('--build-cache-size', type=float, default=2048, help='Maximum size of the build cache in MB (default=2048)')
+parser.add_argument('--no-build-cache', action='store_false', dest='use_build_cache', help="Don't use the build cache")
+parser.add_argument('--jobs', type=int, default=1, \
+                        help='Number of (test, accelerator) pairs which are compiled and timed concurrently. Each timed run is pinned to its own core where taskset is available (default=1)')
 
 args = parser.parse_args()
 
+if any(n < 1 for n in args.threads):
+    parser.error('The number of threads must be positive')
+if args.processes < 0:
+    parser.error('The number of processes must be positive')
+
 verbose = args.verbose
 output_format = args.output
 
 pyperf = args.pyperf
 time_compilation = args.compilation
 time_execution = args.execution
+measure_memory = args.memory
+time_startup = args.startup and args.startup_samples > 0
+time_first_call = args.first_call and args.first_call_samples > 0
 pyccel_configs = args.pyccel_config_families
 pythran_configs = [os.path.abspath(f) for f in args.pythran_config_files]
+n_jobs = max(args.jobs, 1)
+n_repeats = max(args.repeats, 1)
+run_sweep = args.sweep
+thread_counts = sorted(set(args.threads))
+n_processes = args.processes
+suite = args.suite
+if args.use_build_cache:
+    build_cache = BuildCache(os.path.expanduser(args.build_cache), int(args.build_cache_size*1024**2))
+else:
+    build_cache = None
 
 
 test_cases = ['python']
@@ -61,6 +126,9 @@ for i,f in enumerate(pythran_configs):
 if not args.no_numba:
     test_cases.append('numba')
     test_case_names.append('numba')
+    if not args.no_numba_cached:
+        test_cases.append('numba_cached')
+        test_case_names.append('numba_cached')
 n_configs = 0
 for i,name in enumerate(pyccel_configs):
     for l in ('c', 'fortran'):
@@ -79,11 +147,28 @@ tests = [
         ['bellman_ford_test'],
         '',
         'err = bellman_ford_test()'),
+    TestInfo('Bellman Ford - Parallel',
+        'bellman_ford_omp_mod.py',
+        ['bellman_ford_omp_test'],
+        '',
+        'err = bellman_ford_omp_test()',
+        parallel = True),
     TestInfo('Dijkstra',
         'dijkstra.py',
         ['dijkstra_distance_test'],
         '',
         'd = dijkstra_distance_test()'),
+    TestInfo('Dijkstra - Sparse',
+        'dijkstra_heap.py',
+        ['dijkstra_heap_distance_test'],
+        '',
+        'd = dijkstra_heap_distance_test(100000)',
+        SweepInfo('',
+            'd = dijkstra_heap_distance_test({nv})',
+            [{'nv' : nv} for nv in (1000, 10000, 100000, 1000000)],
+            'nv',
+            lambda p: 8*p['nv'],
+            'edges')),
     TestInfo('Euler',
         'euler_mod.py',
         ['euler_humps_test'],
@@ -104,279 +189,1305 @@ tests = [
         ['rk4_humps_test'],
         '',
         'err = rk4_humps_test(0., 2000., 1000000)'),
+    TestInfo('RK4 - In Place',
+        'rk4_inplace_mod.py',
+        ['rk4_inplace_humps_test'],
+        '',
+        'err = rk4_inplace_humps_test(0., 2000., 1000000)'),
+    TestInfo('RK45 - Dormand Prince',
+        'dopri5_mod.py',
+        ['dopri5_humps_test'],
+        '',
+        'err, nsteps = dopri5_humps_test(0., 2000., 1e-10, 1000)',
+        SweepInfo('',
+            'err, nsteps = dopri5_humps_test(0., 2000., {tol}, 1000)',
+            [{'tol' : tol} for tol in (1e-4, 1e-6, 1e-8, 1e-10, 1e-12)],
+            'tol',
+            lambda p: 1,
+            'solutions')),
+    TestInfo('Euler - Batch',
+        'ode_batch_mod.py',
+        ['euler_batch_test'],
+        '',
+        'y = euler_batch_test(1000, 1e-4, 1000)',
+        SweepInfo('',
+            'y = euler_batch_test({batch}, 1e-4, {n})',
+            [{'batch' : b, 'n' : max(10, 10**6 // b)} for b in (1, 10, 100, 1000, 10000, 100000)],
+            'batch',
+            lambda p: p['batch'] * p['n'],
+            'member steps')),
+    TestInfo('Midpoint Explicit - Batch',
+        'ode_batch_mod.py',
+        ['midpoint_explicit_batch_test'],
+        '',
+        'y = midpoint_explicit_batch_test(1000, 1e-4, 1000)',
+        SweepInfo('',
+            'y = midpoint_explicit_batch_test({batch}, 1e-4, {n})',
+            [{'batch' : b, 'n' : max(10, 10**6 // b)} for b in (1, 10, 100, 1000, 10000, 100000)],
+            'batch',
+            lambda p: p['batch'] * p['n'],
+            'member steps')),
+    TestInfo('Midpoint Fixed - Batch',
+        'ode_batch_mod.py',
+        ['midpoint_fixed_batch_test'],
+        '',
+        'y = midpoint_fixed_batch_test(1000, 1e-4, 1000)',
+        SweepInfo('',
+            'y = midpoint_fixed_batch_test({batch}, 1e-4, {n})',
+            [{'batch' : b, 'n' : max(10, 10**6 // b)} for b in (1, 10, 100, 1000, 10000, 100000)],
+            'batch',
+            lambda p: p['batch'] * p['n'],
+            'member steps')),
+    TestInfo('RK4 - Batch',
+        'ode_batch_mod.py',
+        ['rk4_batch_test'],
+        '',
+        'y = rk4_batch_test(1000, 1e-4, 1000)',
+        SweepInfo('',
+            'y = rk4_batch_test({batch}, 1e-4, {n})',
+            [{'batch' : b, 'n' : max(10, 10**6 // b)} for b in (1, 10, 100, 1000, 10000, 100000)],
+            'batch',
+            lambda p: p['batch'] * p['n'],
+            'member steps')),
+    TestInfo('PP - Midpoint Explicit',
+        'ode_test.py',
+        ['midpoint_explicit_predator_prey_test'],
+        'import numpy as np; tspan = np.array([0., 5.]); y0 = np.array([5000., 100.]);',
+        't, y = midpoint_explicit_predator_prey_test(tspan, y0, 1000000)'),
+    TestInfo('PP - Midpoint Fixed',
+        'ode_test.py',
+        ['midpoint_fixed_predator_prey_test'],
+        'import numpy as np; tspan = np.array([0., 5.]); y0 = np.array([5000., 100.]);',
+        't, y = midpoint_fixed_predator_prey_test(tspan, y0, 1000000)'),
+    TestInfo('PP - RK4',
+        'ode_test.py',
+        ['rk4_predator_prey_test'],
+        'import numpy as np; tspan = np.array([0., 5.]); y0 = np.array([5000., 100.]);',
+        't, y = rk4_predator_prey_test(tspan, y0, 1000000)'),
+    TestInfo('SHM - Leapfrog',
+        'ode_test.py',
+        ['leapfrog_shm_test'],
+        'import numpy as np; tspan = np.array([0., 20.]); y0 = np.array([1., 0.]);',
+        't, y = leapfrog_shm_test(tspan, y0, 1000000)'),
+    TestInfo('Chain - RK4',
+        'ode_test.py',
+        ['rk4_chain_test'],
+        '',
+        'err = rk4_chain_test(500, 50., 5000)',
+        SweepInfo('',
+            'err = rk4_chain_test({nm}, 50., {n})',
+            [{'nm' : nm, 'n' : max(100, 10**6 // nm)} for nm in (10, 100, 1000, 10000)],
+            'nm',
+            lambda p: 2 * p['nm'] * p['n'],
+            'component updates')),
+    TestInfo('Chain - Leapfrog',
+        'ode_test.py',
+        ['leapfrog_chain_test'],
+        '',
+        'err = leapfrog_chain_test(500, 50., 5000)',
+        SweepInfo('',
+            'err = leapfrog_chain_test({nm}, 50., {n})',
+            [{'nm' : nm, 'n' : max(100, 10**6 // nm)} for nm in (10, 100, 1000, 10000)],
+            'nm',
+            lambda p: 2 * p['nm'] * p['n'],
+            'component updates')),
     TestInfo('FD - L Convection',
         'linearconv_1d_mod.py',
         ['linearconv_1d'],
         '',
-        'x, u = linearconv_1d(2001, 0.0003, 3000)'),
+        'x, u = linearconv_1d(2001, 0.0003, 3000)',
+        SweepInfo('',
+            'x, u = linearconv_1d({nx}, {dt}, {nt})',
+            [{'nx' : nx, 'dt' : 0.6 / (nx-1), 'nt' : max(16, 10**7 // nx)} for nx in (10**3, 10**4, 10**5, 10**6, 10**7)],
+            'nx',
+            lambda p: (p['nx']-1) * p['nt'],
+            'grid-point updates')),
     TestInfo('FD - NL Convection',
         'nonlinearconv_1d_mod.py',
         ['nonlinearconv_1d'],
         '',
-        'x, u = nonlinearconv_1d(2001, 0.00035, 3000)'),
+        'x, u = nonlinearconv_1d(2001, 0.00035, 3000)',
+        SweepInfo('',
+            'x, u = nonlinearconv_1d({nx}, {dt}, {nt})',
+            [{'nx' : nx, 'dt' : 0.7 / (nx-1), 'nt' : max(16, 10**7 // nx)} for nx in (10**3, 10**4, 10**5, 10**6, 10**7)],
+            'nx',
+            lambda p: (p['nx']-1) * p['nt'],
+            'grid-point updates')),
+    TestInfo('FD - L Convection Blocked',
+        'linearconv_1d_blocked_mod.py',
+        ['linearconv_1d_blocked'],
+        '',
+        'x, u = linearconv_1d_blocked(2001, 0.0003, 3000)',
+        SweepInfo('',
+            'x, u = linearconv_1d_blocked({nx}, {dt}, {nt})',
+            [{'nx' : nx, 'dt' : 0.6 / (nx-1), 'nt' : max(16, 10**7 // nx)} for nx in (10**3, 10**4, 10**5, 10**6, 10**7)],
+            'nx',
+            lambda p: (p['nx']-1) * p['nt'],
+            'grid-point updates')),
+    TestInfo('FD - NL Convection Blocked',
+        'nonlinearconv_1d_blocked_mod.py',
+        ['nonlinearconv_1d_blocked'],
+        '',
+        'x, u = nonlinearconv_1d_blocked(2001, 0.00035, 3000)',
+        SweepInfo('',
+            'x, u = nonlinearconv_1d_blocked({nx}, {dt}, {nt})',
+            [{'nx' : nx, 'dt' : 0.7 / (nx-1), 'nt' : max(16, 10**7 // nx)} for nx in (10**3, 10**4, 10**5, 10**6, 10**7)],
+            'nx',
+            lambda p: (p['nx']-1) * p['nt'],
+            'grid-point updates')),
     TestInfo('FD - Poisson',
         'poisson_2d_mod.py',
         ['poisson_2d'],
         '',
-        'x, y, phi = poisson_2d(150, 150, 200)'),
+        'x, y, phi = poisson_2d(150, 150, 200)',
+        SweepInfo('',
+            'x, y, phi = poisson_2d({n}, {n}, {nt})',
+            [{'n' : n, 'nt' : max(1, 4*10**6 // n**2)} for n in (16, 32, 64, 128, 256, 512, 1024, 2048)],
+            'n',
+            lambda p: (p['n']-2)**2 * p['nt'],
+            'grid-point updates')),
     TestInfo('FD - Laplace',
         'laplace_2d_mod.py',
         ['laplace_2d'],
         '',
-        'x, y, phi, niter = laplace_2d(150, 150, 5e-5, 5000)'),
+        'x, y, phi, niter = laplace_2d(150, 150, 5e-5, 5000)',
+        # A negative tolerance ensures that exactly nt iterations are carried out (this is checked)
+        SweepInfo('',
+            'x, y, phi, niter = laplace_2d({n}, {n}, -1.0, {nt}); assert niter == {nt}',
+            [{'n' : n, 'nt' : max(1, 4*10**6 // n**2)} for n in (16, 32, 64, 128, 256, 512, 1024, 2048)],
+            'n',
+            lambda p: (p['n']-2)**2 * p['nt'],
+            'grid-point updates')),
+    TestInfo('FD - Poisson Parallel',
+        'poisson_2d_omp_mod.py',
+        ['poisson_2d_omp'],
+        '',
+        'x, y, phi = poisson_2d_omp(150, 150, 200)',
+        SweepInfo('',
+            'x, y, phi = poisson_2d_omp({n}, {n}, {nt})',
+            [{'n' : n, 'nt' : max(1, 4*10**6 // n**2)} for n in (16, 32, 64, 128, 256, 512, 1024, 2048)],
+            'n',
+            lambda p: (p['n']-2)**2 * p['nt'],
+            'grid-point updates'),
+        parallel = True),
+    TestInfo('FD - Laplace Parallel',
+        'laplace_2d_omp_mod.py',
+        ['laplace_2d_omp'],
+        '',
+        'x, y, phi, niter = laplace_2d_omp(150, 150, 5e-5, 5000)',
+        # A negative tolerance ensures that exactly nt iterations are carried out (this is checked)
+        SweepInfo('',
+            'x, y, phi, niter = laplace_2d_omp({n}, {n}, -1.0, {nt}); assert niter == {nt}',
+            [{'n' : n, 'nt' : max(1, 4*10**6 // n**2)} for n in (16, 32, 64, 128, 256, 512, 1024, 2048)],
+            'n',
+            lambda p: (p['n']-2)**2 * p['nt'],
+            'grid-point updates'),
+        parallel = True),
+    TestInfo('FD - Poisson SOR',
+        'poisson_2d_sor_mod.py',
+        ['poisson_2d_sor'],
+        '',
+        'x, y, phi = poisson_2d_sor(150, 150, 200)',
+        SweepInfo('',
+            'x, y, phi = poisson_2d_sor({n}, {n}, {nt})',
+            [{'n' : n, 'nt' : max(1, 4*10**6 // n**2)} for n in (16, 32, 64, 128, 256, 512, 1024, 2048)],
+            'n',
+            lambda p: (p['n']-2)**2 * p['nt'],
+            'grid-point updates')),
+    TestInfo('FD - Multigrid',
+        'poisson_2d_mg_mod.py',
+        ['poisson_2d_mg'],
+        '',
+        'x, y, phi, niter = poisson_2d_mg(257, 1e-8, 100)',
+        # A negative tolerance ensures that exactly nt V-cycles are carried out
+        SweepInfo('',
+            'x, y, phi, niter = poisson_2d_mg({n}, -1.0, {nt})',
+            [{'n' : 2**k+1, 'nt' : max(1, 4*10**6 // (2**k+1)**2)} for k in range(4, 12)],
+            'n',
+            lambda p: p['n']**2 * p['nt'],
+            'grid-point V-cycles')),
+    TestInfo('FD - Laplace SOR',
+        'laplace_2d_sor_mod.py',
+        ['laplace_2d_sor'],
+        '',
+        # A smaller grid than the Jacobi version as a pure python SOR iteration is much slower
+        'x, y, phi, niter = laplace_2d_sor(50, 50, 5e-5, 5000)',
+        # A negative tolerance ensures that exactly nt iterations are carried out (this is checked)
+        SweepInfo('',
+            'x, y, phi, niter = laplace_2d_sor({n}, {n}, -1.0, {nt}); assert niter == {nt}',
+            [{'n' : n, 'nt' : max(1, 4*10**6 // n**2)} for n in (16, 32, 64, 128, 256, 512, 1024, 2048)],
+            'n',
+            lambda p: (p['n']-2)**2 * p['nt'],
+            'grid-point updates')),
     TestInfo('M-D',
         'md_mod.py',
         ['md'],
         '',
-        'p, k = md(3, 100, 200, 0.1)'),
+        'p, k = md(3, 100, 200, 0.1)',
+        SweepInfo('',
+            'p, k = md(3, {p_num}, {step_num}, 0.1)',
+            [{'p_num' : n, 'step_num' : max(1, 10**6 // n**2)} for n in (50, 100, 200, 400, 800, 1600, 3200)],
+            'p_num',
+            lambda p: p['p_num'] * (p['p_num']-1) * (p['step_num']+1),
+            'particle-pair interactions')),
+    TestInfo('M-D - Parallel',
+        'md_omp_mod.py',
+        ['md_omp'],
+        '',
+        'p, k = md_omp(3, 100, 200, 0.1)',
+        SweepInfo('',
+            'p, k = md_omp(3, {p_num}, {step_num}, 0.1)',
+            [{'p_num' : n, 'step_num' : max(1, 10**6 // n**2)} for n in (50, 100, 200, 400, 800, 1600, 3200)],
+            'p_num',
+            lambda p: p['p_num'] * (p['p_num']-1) * (p['step_num']+1),
+            'particle-pair interactions'),
+        parallel = True),
+    TestInfo('M-D - Cell Lists',
+        'md_cells_mod.py',
+        ['md_cells'],
+        '',
+        'p, k = md_cells(10000, 2, 0.1)',
+        SweepInfo('',
+            'p, k = md_cells({p_num}, {step_num}, 0.1)',
+            [{'p_num' : n, 'step_num' : max(1, 10**5 // n)} for n in (1000, 3000, 10000, 30000, 100000)],
+            'p_num',
+            lambda p: p['p_num'] * (p['step_num']+1),
+            'particle updates')),
     TestInfo('Splines',
         'splines.py',
         ['Spline'],
         'import numpy as np; s = Spline(5, knots = np.linspace(0,1, 1000), coeffs = np.ones(1000)); x = np.random.rand(100000); y = np.empty(100000);',
-        's.eval(x, y)'),
+        's.eval(x, y)',
+        SweepInfo('import numpy as np; s = Spline(5, knots = np.linspace(0,1, {n}), coeffs = np.ones({n})); x = np.random.rand(100000); y = np.empty(100000);',
+            's.eval(x, y)',
+            [{'n' : n} for n in (64, 512, 4096, 32768, 262144, 2097152, 16777216)],
+            'n',
+            lambda p: 100000,
+            'point evaluations')),
+    TestInfo('Splines - Sorted',
+        'splines.py',
+        ['Spline'],
+        'import numpy as np; s = Spline(5, knots = np.linspace(0,1, 1000), coeffs = np.ones(1000)); x = np.sort(np.random.rand(100000)); y = np.empty(100000);',
+        's.eval_sorted(x, y)',
+        SweepInfo('import numpy as np; s = Spline(5, knots = np.linspace(0,1, {n}), coeffs = np.ones({n})); x = np.sort(np.random.rand(100000)); y = np.empty(100000);',
+            's.eval_sorted(x, y)',
+            [{'n' : n} for n in (64, 512, 4096, 32768, 262144, 2097152, 16777216)],
+            'n',
+            lambda p: 100000,
+            'point evaluations')),
+    TestInfo('Splines - Parallel',
+        'splines_omp_mod.py',
+        ['spline_eval_omp'],
+        'import numpy as np; knots = np.linspace(0,1, 1000); coeffs = np.ones(1000); x = np.random.rand(100000); y = np.empty(100000);',
+        'spline_eval_omp(5, knots, coeffs, x, y)',
+        SweepInfo('import numpy as np; knots = np.linspace(0,1, {n}); coeffs = np.ones({n}); x = np.random.rand(100000); y = np.empty(100000);',
+            'spline_eval_omp(5, knots, coeffs, x, y)',
+            [{'n' : n} for n in (64, 512, 4096, 32768, 262144, 2097152, 16777216)],
+            'n',
+            lambda p: 100000,
+            'point evaluations'),
+        parallel = True),
+    TestInfo('Splines - 2D',
+        'splines.py',
+        ['Spline', 'Spline2D'],
+        'import numpy as np; s = Spline2D(Spline(3, knots = np.linspace(0,1, 200), coeffs = np.ones(200)), Spline(3, knots = np.linspace(0,1, 200), coeffs = np.ones(200)), np.ones((200, 200))); x1 = np.random.rand(100000); x2 = np.random.rand(100000); y = np.empty(100000);',
+        's.eval(x1, x2, y)',
+        SweepInfo('import numpy as np; s = Spline2D(Spline(3, knots = np.linspace(0,1, {n}), coeffs = np.ones({n})), Spline(3, knots = np.linspace(0,1, {n}), coeffs = np.ones({n})), np.ones(({n}, {n}))); x1 = np.random.rand(100000); x2 = np.random.rand(100000); y = np.empty(100000);',
+            's.eval(x1, x2, y)',
+            [{'n' : n} for n in (16, 64, 256, 1024, 4096)],
+            'n',
+            lambda p: 100000,
+            'point evaluations')),
+    TestInfo('Splines - 3D',
+        'splines.py',
+        ['Spline', 'Spline3D'],
+        'import numpy as np; s = Spline3D(Spline(3, knots = np.linspace(0,1, 50), coeffs = np.ones(50)), Spline(3, knots = np.linspace(0,1, 50), coeffs = np.ones(50)), Spline(3, knots = np.linspace(0,1, 50), coeffs = np.ones(50)), np.ones((50, 50, 50))); x1 = np.random.rand(100000); x2 = np.random.rand(100000); x3 = np.random.rand(100000); y = np.empty(100000);',
+        's.eval(x1, x2, x3, y)',
+        SweepInfo('import numpy as np; s = Spline3D(Spline(3, knots = np.linspace(0,1, {n}), coeffs = np.ones({n})), Spline(3, knots = np.linspace(0,1, {n}), coeffs = np.ones({n})), Spline(3, knots = np.linspace(0,1, {n}), coeffs = np.ones({n})), np.ones(({n}, {n}, {n}))); x1 = np.random.rand(100000); x2 = np.random.rand(100000); x3 = np.random.rand(100000); y = np.empty(100000);',
+            's.eval(x1, x2, x3, y)',
+            [{'n' : n} for n in (8, 16, 32, 64, 128, 256)],
+            'n',
+            lambda p: 100000,
+            'point evaluations')),
 ]
 
+cfd_tests = [
+    TestInfo('CFD - Burgers 1D',
+        'cfd_python_test.py',
+        ['test_burgers_1d'],
+        '',
+        'u = test_burgers_1d(100001, 100, 0.07)',
+        SweepInfo('',
+            'u = test_burgers_1d({nx}, {nt}, 0.07)',
+            [{'nx' : nx, 'nt' : max(16, 10**7 // nx)} for nx in (10**3, 10**4, 10**5, 10**6, 10**7)],
+            'nx',
+            lambda p: (p['nx']-1) * p['nt'],
+            'grid-point updates')),
+    TestInfo('CFD - L Diffusion 1D',
+        'cfd_python_test.py',
+        ['test_lineardiff_1d'],
+        '',
+        'u = test_lineardiff_1d(100001, 100, 0.3)',
+        SweepInfo('',
+            'u = test_lineardiff_1d({nx}, {nt}, 0.3)',
+            [{'nx' : nx, 'nt' : max(16, 10**7 // nx)} for nx in (10**3, 10**4, 10**5, 10**6, 10**7)],
+            'nx',
+            lambda p: (p['nx']-2) * p['nt'],
+            'grid-point updates')),
+    TestInfo('CFD - L Convection 2D',
+        'cfd_python_test.py',
+        ['test_linearconv_2d'],
+        '',
+        'u = test_linearconv_2d(1001, 1001, 10, 1.0)',
+        SweepInfo('',
+            'u = test_linearconv_2d({n}, {n}, {nt}, 1.0)',
+            [{'n' : n, 'nt' : max(1, 4*10**6 // n**2)} for n in (16, 32, 64, 128, 256, 512, 1024, 2048)],
+            'n',
+            lambda p: (p['n']-1)**2 * (p['nt']+1),
+            'grid-point updates')),
+    TestInfo('CFD - L Diffusion 2D',
+        'cfd_python_test.py',
+        ['test_lineardiff_2d'],
+        '',
+        'u = test_lineardiff_2d(5, 1001, 1001, 0.05)',
+        SweepInfo('',
+            'u = test_lineardiff_2d({nt}, {n}, {n}, 0.05)',
+            [{'n' : n, 'nt' : max(1, 4*10**6 // n**2)} for n in (16, 32, 64, 128, 256, 512, 1024, 2048)],
+            'n',
+            lambda p: (p['n']-2)**2 * (p['nt']+1),
+            'grid-point updates')),
+    TestInfo('CFD - NL Convection 2D',
+        'cfd_python_test.py',
+        ['test_nonlinearconv_2d'],
+        '',
+        'u, v = test_nonlinearconv_2d(1001, 1001, 3, 1.0)',
+        SweepInfo('',
+            'u, v = test_nonlinearconv_2d({n}, {n}, {nt}, 1.0)',
+            [{'n' : n, 'nt' : max(1, 4*10**6 // n**2)} for n in (16, 32, 64, 128, 256, 512, 1024, 2048)],
+            'n',
+            lambda p: (p['n']-1)**2 * (p['nt']+1),
+            'grid-point updates')),
+    TestInfo('CFD - Burgers 2D',
+        'cfd_python_test.py',
+        ['test_burgers_2d'],
+        '',
+        'u, v = test_burgers_2d(1001, 1001, 2, 0.01)',
+        SweepInfo('',
+            'u, v = test_burgers_2d({n}, {n}, {nt}, 0.01)',
+            [{'n' : n, 'nt' : max(1, 4*10**6 // n**2)} for n in (16, 32, 64, 128, 256, 512, 1024, 2048)],
+            'n',
+            lambda p: (p['n']-2)**2 * (p['nt']+1),
+            'grid-point updates')),
+    TestInfo('CFD - Cavity Flow',
+        'cfd_python_test.py',
+        ['test_cavity_flow_2d'],
+        '',
+        'u, v, p = test_cavity_flow_2d(401, 401, 2, 1.0, 0.1)',
+        # Each time step carries out 50 sweeps of the pressure solve and 2 other sweeps
+        SweepInfo('',
+            'u, v, p = test_cavity_flow_2d({n}, {n}, {nt}, 1.0, 0.1)',
+            [{'n' : n, 'nt' : max(1, 10**5 // n**2)} for n in (16, 32, 64, 128, 256, 512)],
+            'n',
+            lambda p: (p['n']-2)**2 * 52 * p['nt'],
+            'grid-point updates')),
+]
+
+if suite == 'cfd':
+    tests = cfd_tests
+
+if run_sweep:
+    tests = [t for t in tests if t.sweep is not None]
+
+if thread_counts:
+    tests = [t for t in tests if t.parallel]
+
 if verbose:
     log_file = sys.stdout
 else:
     log_file = open("bench.log",'w')
 
-timeit_cmd = ['pyperf', 'timeit', '--copy-env', '--fast'] if pyperf else ['timeit']
+timing_worker = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'timing_worker.py')
+weak_scaling_worker = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'weak_scaling_worker.py')
 
-cell_splitter = {'latex'    : ' & ',
-                 'markdown' : ' | '}
-row_splitter  = {'latex'    : '\\\\\n\\hline\n',
-                 'markdown' : '\n'}
+start_dir = os.getcwd()
 
-test_cases_row = cell_splitter[output_format].join('{0: <25}'.format(s) for s in ['Algorithm']+test_case_names)
-comp_result_table = [test_cases_row]
-exec_result_table = [test_cases_row]
+code_folder = os.path.join(os.path.dirname(__file__), 'tests')
 
-out_header = {'latex'    : lambda s : r'\textbf{'+s+'}',
-              'markdown' : lambda s : '## '+s
-             }
+log_lock = threading.Lock()
 
-if output_format == 'markdown':
-    header_row = cell_splitter[output_format].join('-------------------------' for _ in range(len(test_cases)+1))
-    comp_result_table.append(header_row)
-    exec_result_table.append(header_row)
+# The timed processes are pinned to their cores with taskset (from util-linux). Where it is
+# not available (e.g. on macOS) the processes are not pinned.
+taskset = shutil.which('taskset')
 
-possible_units = ['sec','ms','us','ns']
-latex_units = ['s','ms','\\textmu s','ns']
+def run_process(cmd: "List[str]", time_compilation: "bool"=False, env = None, cwd = None, cores = None):
+    """
+    Run a command in a subprocess and collect its output.
 
-start_dir = os.getcwd()
+    The resource usage is collected with `os.wait4` so that it only describes
+    the child which was launched, even if other commands are running
+    concurrently.
 
-code_folder = os.path.join(os.path.dirname(__file__), 'tests')
+    Parameters
+    ----------
+    cmd : list of str
+        The command to be executed.
+    time_compilation : bool, default=False
+        Indicates whether the CPU time used by the command should be returned.
+    env : dict, optional
+        The environment in which the command is executed.
+    cwd : str, optional
+        The folder in which the command is executed.
+    cores : set of int, optional
+        The cores on which the command should be pinned (if taskset is available).
+
+    Returns
+    -------
+    returncode : int
+        The return code of the command.
+    out : str
+        The standard output of the command.
+    err : str
+        The standard error of the command.
+    cpu_time : float
+        The CPU time (user + system) used by the command (0.0 if time_compilation is False).
+    """
+    with tempfile.TemporaryFile('w+') as out_file, tempfile.TemporaryFile('w+') as err_file:
+        # taskset pins itself then executes the command in the same process, so the
+        # command never runs unpinned. A preexec_fn cannot be used as run_process is
+        # called from several threads when --jobs is used.
+        if cores is not None and taskset is not None:
+            cmd = [taskset, '--cpu-list', ','.join(str(c) for c in sorted(cores))] + list(cmd)
+        p = subprocess.Popen(cmd, stdout=out_file, stderr=err_file,
+                universal_newlines=True, env=env, cwd=cwd)
+        _, status, usage = os.wait4(p.pid, 0)
+        if os.WIFSIGNALED(status):
+            returncode = -os.WTERMSIG(status)
+        else:
+            returncode = os.WEXITSTATUS(status)
+        p.returncode = returncode
+        out_file.seek(0)
+        err_file.seek(0)
+        out = out_file.read()
+        err = err_file.read()
 
-def run_process(cmd: "List[str]", time_compilation: "bool"=False, env = None):
-    if not time_compilation:
-        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                universal_newlines=True, env=env) as p:
-            out, err = p.communicate()
-            returncode = p.returncode
-        return returncode, out, err, 0.0
-
-    usage_start = resource.getrusage(resource.RUSAGE_CHILDREN)
-    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-            universal_newlines=True, env=env) as p:
-        out, err = p.communicate()
-        returncode = p.returncode
-    usage_end = resource.getrusage(resource.RUSAGE_CHILDREN)
-    cpu_time = sum([
-        usage_end.ru_utime - usage_start.ru_utime,
-        usage_end.ru_stime - usage_start.ru_stime
-    ])
+    cpu_time = usage.ru_utime + usage.ru_stime if time_compilation else 0.0
     return returncode, out, err, cpu_time
 
+def print_case_header(t, case, log):
+    """
+    Print the header describing the test case to the log.
+    """
+    print("===========================================", file=log)
+    print("   ",t.name, file=log)
+    print("===========================================", file=log)
+    print("-------------------", file=log)
+    print("   ",case, file=log)
+    print("-------------------", file=log)
 
-for t in tests:
-    print("===========================================", file=log_file, flush=True)
-    print("   ",t.name, file=log_file, flush=True)
-    print("===========================================", file=log_file, flush=True)
-    basename = t.basename
+def flush_log(log):
+    """
+    Write the contents of a test case's log to the log file.
+    """
+    with log_lock:
+        print(log.getvalue(), end='', file=log_file, flush=True)
+
+def get_case_folder(t, case):
+    """
+    Get the scratch folder in which the test case is compiled and run.
+
+    The folder is named after the test as several tests may use the same code.
+    """
+    test_folder = ''.join(c if c.isalnum() else '_' for c in t.name)
+    return os.path.join(start_dir, 'tmp', test_folder, case)
+
+def get_import_cmd(t, case):
+    """
+    Get the command which imports the functions for the test case.
+    """
+    testname  = os.path.splitext(t.basename)[0]
+    return 'from {testname} import {funcs};'.format(
+            testname = 'numba_'+testname if case.startswith('numba') else testname,
+            funcs = ', '.join(t.imports))
+
+def get_setup_cmd(t, case, setup = None):
+    """
+    Get the setup command which imports the functions for the test case.
+
+    The test's setup code is appended to the imports unless another setup
+    code is provided.
+    """
+    setup_cmd = get_import_cmd(t, case)
+    setup_cmd += (t.setup if setup is None else setup).replace('\n','')
+    return setup_cmd
+
+def get_command_output(cmd: "List[str]"):
+    """
+    Get the output of a command, or an empty string if it cannot be run.
+    """
+    try:
+        p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                universal_newlines=True, check=False)
+    except OSError:
+        return ''
+    return p.stdout
+
+@functools.lru_cache(maxsize=None)
+def get_toolchain_description(tag, config):
+    """
+    Get a string describing the tools used to compile the code with a given configuration.
+
+    The description contains the version of python, the version of the
+    accelerator, the complete compiler configuration and the versions of the
+    compilers. It is used to identify builds in the build cache.
+
+    Parameters
+    ----------
+    tag : str
+        The accelerator used to compile the code ('pyccel' or 'pythran').
+    config : str
+        The pyccel configuration family or the path to the pythran configuration file.
+
+    Returns
+    -------
+    str
+        A description of the toolchain.
+    """
+    description = [sys.version]
+    if tag == 'pyccel':
+        description.append(get_command_output(['pyccel', '--version']))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = os.path.join(tmp_dir, 'config.json')
+            get_command_output(['pyccel', 'config', 'export', f'--compiler-family={config}', config_file])
+            try:
+                with open(config_file, encoding='utf-8') as f:
+                    compiler_config = f.read()
+            except OSError:
+                compiler_config = ''
+        description.append(compiler_config)
+        try:
+            compilers = [info['exec'] for info in json.loads(compiler_config).values()]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            compilers = []
+        description.extend(get_command_output([c, '--version']) for c in compilers)
+    elif tag == 'pythran':
+        description.append(get_command_output(['pythran', '--version']))
+        with open(config, encoding='utf-8') as f:
+            description.append(f.read())
+        description.extend(os.environ.get(v, '') for v in ('CC', 'CXX', 'CFLAGS', 'CXXFLAGS', 'LDFLAGS'))
+        description.append(get_command_output([os.environ.get('CXX', 'c++'), '--version']))
+    return '\n'.join(description)
+
+def get_case_config(case):
+    """
+    Get a dictionary describing the configuration used for a test case.
+    """
+    if case.startswith('pyccel'):
+        _, idx_str, language = case.split('_')
+        return {'accelerator' : 'pyccel', 'family' : pyccel_configs[int(idx_str)], 'language' : language}
+    elif case.startswith('pythran'):
+        config = pythran_configs[int(case.split('_')[1])]
+        with open(config, encoding='utf-8') as f:
+            contents = f.read()
+        return {'accelerator' : 'pythran', 'config_file' : config, 'config' : contents}
+    else:
+        return {'accelerator' : case}
+
+def enable_numba_cache(filename):
+    """
+    Save the code compiled by numba for a test case on disk.
+
+    The option cache=True is added to each njit decorator in the file. The
+    classes decorated with jitclass cannot be cached so they are still
+    compiled in each process.
+    """
+    with open(filename, encoding='utf-8') as f:
+        code = f.read()
+    code = re.sub(r'@njit\(', '@njit(cache=True, ', code)
+    code = re.sub(r'@njit$', '@njit(cache=True)', code, flags=re.MULTILINE)
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(code)
 
-    test_file = os.path.join(code_folder,basename)
-    testname  = os.path.splitext(basename)[0]
+def compile_case(t, case):
+    """
+    Create the scratch folder for the test case and compile the code if necessary.
 
+    Parameters
+    ----------
+    t : TestInfo
+        The test being run.
+    case : str
+        The accelerator being tested.
+
+    Returns
+    -------
+    success : bool
+        Indicates whether the test case is ready to be executed.
+    records : list of dict
+        The records describing the compilation (empty if the compilation was not timed).
+    """
+    basename = t.basename
     numba_basename = 'numba_'+basename
-    numba_testname = 'numba_'+testname
-    numba_test_file = os.path.join(os.path.dirname(test_file), numba_basename)
 
-    new_folder = os.path.join('tmp',t.imports[0])
+    new_folder = get_case_folder(t, case)
 
     os.makedirs(new_folder, exist_ok=True)
-    shutil.copyfile(test_file, os.path.join(new_folder, basename))
-    shutil.copyfile(numba_test_file, os.path.join(new_folder, numba_basename))
-    os.chdir(new_folder)
+    shutil.copyfile(os.path.join(code_folder, basename), os.path.join(new_folder, basename))
+    shutil.copyfile(os.path.join(code_folder, numba_basename), os.path.join(new_folder, numba_basename))
+
+    if case == 'numba_cached':
+        enable_numba_cache(os.path.join(new_folder, numba_basename))
+        # Ensure that the first run starts with an empty cache
+        shutil.rmtree(os.path.join(new_folder, '__pycache__'), ignore_errors=True)
+
+    if not (case.startswith('pyccel') or case.startswith('pythran')):
+        return True, []
+
+    log = io.StringIO()
+    print_case_header(t, case, log)
+
+    env = os.environ.copy()
+    tag, idx_str = case.split('_', 1)
+    if tag == 'pyccel':
+        idx_str, language = idx_str.split('_')
+        idx = int(idx_str)
+        config = pyccel_configs[idx]
+        cmd = ['pyccel', 'compile', f'--compiler-family={config}', f'--language={language}', '--verbose', basename]
+        if t.parallel:
+            cmd.append('--openmp')
+    elif tag == 'pythran':
+        idx = int(idx_str)
+        config = pythran_configs[idx]
+        language = 'c++'
+        cmd = ['pythran', '-v', basename]
+        env['PYTHRANRC'] = config
+
+    if build_cache is not None:
+        with open(os.path.join(code_folder, basename), 'rb') as f:
+            source = f.read()
+        cache_key = build_cache.get_key(source, tag, config, language, get_toolchain_description(tag, config))
+        # The cached library can only be used if the compilation does not need to be timed
+        if not time_compilation and build_cache.restore(cache_key, new_folder):
+            print("Restored from build cache : ", cache_key, file=log)
+            flush_log(log)
+            return True, []
+
+    if verbose:
+        print(cmd, file=log)
+
+    returncode, out, err, cpu_time = run_process(cmd, time_compilation, env=env, cwd=new_folder)
+
+    if returncode != 0:
+        print("Compilation Error!", file=log)
+        print(out, file=log)
+        print(err, file=log)
+        flush_log(log)
+        return False, [make_record(t.name, case, 'compilation', status='failed')] if time_compilation else []
+    elif verbose:
+        print(out, file=log)
+        print(err, file=log)
+
+    if build_cache is not None:
+        build_cache.store(cache_key, new_folder)
+
+    records = []
+    if time_compilation:
+        print("Compilation CPU time : ", cpu_time, file=log)
+        records.append(make_record(t.name, case, 'compilation', [round(cpu_time*1e9)]))
+
+    flush_log(log)
+    return True, records
+
+@contextlib.contextmanager
+def reserve_cores(n = 1):
+    """
+    Reserve n cores which are not used by any other timed run for the duration of the context.
+
+    If fewer than n cores are available for the timed runs then all of them are reserved.
+    The cores are reserved together so that two runs which each need several cores cannot
+    block each other.
+    """
+    with reserve_lock:
+        cores = {free_cores.get() for _ in range(min(n, n_cores))}
+    try:
+        yield cores
+    finally:
+        for core in cores:
+            free_cores.put(core)
+
+def run_timer(case, folder, setup_cmd, exec_cmd, log, threads = 1):
+    """
+    Time the execution of a statement in new processes.
+
+    The statement is timed with pyperf if requested, otherwise with the
+    timing worker. The timing is repeated in n_repeats independent
+    processes, each pinned to as many free cores as it uses threads, and
+    the samples are gathered. If requested, the memory usage is measured
+    by the timing worker (in an additional process if pyperf is used).
+
+    Parameters
+    ----------
+    case : str
+        The accelerator being tested.
+    folder : str
+        The folder containing the code for the test case.
+    setup_cmd : str
+        The code which is run once before the timing begins.
+    exec_cmd : str
+        The code whose execution is timed.
+    log : io.StringIO
+        The log of the test case.
+    threads : int, default=1
+        The number of threads used by OpenMP and numba.
 
-    import_funcs = ', '.join(t.imports)
+    Returns
+    -------
+    tuple or None
+        The duration of each timed call and of each warm-up call in
+        nanoseconds and the dictionary describing the memory usage (None if
+        it was not measured), or None if the execution failed.
+    """
+    env = os.environ.copy()
+    env['OMP_NUM_THREADS'] = str(threads)
+    env['NUMBA_NUM_THREADS'] = str(threads)
+    if threads > n_cores:
+        print(f"Warning : {threads} threads share {n_cores} cores", file=log)
+
+    samples = []
+    warmup = []
+    memory = None
+    for i in range(n_repeats):
+        with reserve_cores(threads) as cores:
+            trial = run_trial(case, folder, setup_cmd, exec_cmd, cores, env, log,
+                              memory = measure_memory and not pyperf and i == 0)
+        if trial is None:
+            return None
+        samples.extend(trial[0])
+        warmup.extend(trial[1])
+        memory = memory or trial[2]
+
+    if measure_memory and pyperf:
+        with reserve_cores(threads) as cores:
+            trial = run_trial(case, folder, setup_cmd, exec_cmd, cores, env, log, memory = True, timed = False)
+        if trial is None:
+            return None
+        memory = trial[2]
+
+    return samples, warmup, memory
+
+def run_trial(case, folder, setup_cmd, exec_cmd, cores, env, log, memory = False, timed = True):
+    """
+    Time the execution of a statement in a new process pinned to a set of cores.
+
+    The process is run in the environment env. If timed is False then the statement is only run by the timing worker
+    to measure its memory usage. See run_timer for a description of the
+    other parameters and of the results.
+    """
+    cmd = ['pypy'] if case=='pypy' else ['python3']
+    if timed and pyperf:
+        pyperf_fd, pyperf_file = tempfile.mkstemp(suffix='.json', dir=folder)
+        os.close(pyperf_fd)
+        # pyperf refuses to overwrite an existing file
+        os.remove(pyperf_file)
+        cmd += ['-m', 'pyperf', 'timeit', '--copy-env', '--fast', '--output', pyperf_file,
+                '-s', setup_cmd, exec_cmd]
+    elif timed:
+        cmd += [timing_worker, '--setup', setup_cmd,
+                '--warmup', str(args.warmup), '--min-samples', str(args.min_samples),
+                '--min-time', str(args.min_time)]
+    else:
+        # A single untimed call ensures that the measurement does not include any JIT compilation
+        cmd += [timing_worker, '--setup', setup_cmd, '--warmup', '1', '--min-samples', '0', '--min-time', '0']
+    if memory:
+        cmd.append('--memory')
+    if not (timed and pyperf):
+        cmd.append(exec_cmd)
+
+    if verbose:
+        print(cmd, file=log)
+
+    returncode, out, err, _ = run_process(cmd, env=env, cwd=folder, cores=cores)
+
+    if returncode != 0:
+        print("Execution Error!", file=log)
+        print(err, file=log)
+        return None
+
+    if verbose:
+        print(out, file=log)
+    if timed and pyperf:
+        with open(pyperf_file, encoding='utf-8') as f:
+            pyperf_results = json.load(f)
+        os.remove(pyperf_file)
+        # Only the runs containing values are used (the others are calibration runs)
+        samples = [round(v*1e9) for r in pyperf_results['benchmarks'][0]['runs'] for v in r.get('values', [])]
+        return samples, [], None
+    else:
+        worker_results = json.loads(out)
+        return worker_results['samples'], worker_results['warmup'], worker_results.get('memory', None)
+
+def time_interpreter(cmd, folder):
+    """
+    Time the execution of a command in a fresh interpreter pinned to a free core.
+
+    Parameters
+    ----------
+    cmd : list of str
+        The command which runs the interpreter.
+    folder : str
+        The folder in which the command is executed.
+
+    Returns
+    -------
+    returncode : int
+        The return code of the command.
+    err : str
+        The standard error of the command.
+    duration : int
+        The wall time taken by the command in nanoseconds.
+    """
+    env = os.environ.copy()
+    env['OMP_NUM_THREADS'] = '1'
+    env['NUMBA_NUM_THREADS'] = '1'
+    with reserve_cores() as cores:
+        t0 = time.perf_counter_ns()
+        returncode, _, err, _ = run_process(cmd, env=env, cwd=folder, cores=cores)
+        t1 = time.perf_counter_ns()
+    return returncode, err, t1 - t0
+
+@functools.lru_cache(maxsize=None)
+def get_startup_baseline(interpreter):
+    """
+    Get the wall time taken by an interpreter which does nothing.
+
+    The interpreter is launched startup_samples times in the folder where the
+    benchmarks are run and the duration of each run is returned in
+    nanoseconds.
+    """
+    samples = []
+    for _ in range(args.startup_samples):
+        returncode, err, duration = time_interpreter([interpreter, '-c', 'pass'], start_dir)
+        if returncode != 0:
+            raise RuntimeError(f"{interpreter} could not be launched : {err}")
+        samples.append(duration)
+    return samples
+
+def time_startup_case(t, case, folder, log):
+    """
+    Time the import of the functions of a test case in fresh interpreters.
+
+    The import is run in startup_samples new interpreters. The median wall
+    time of a bare interpreter is subtracted from the wall time of each run
+    so that the samples only describe the import (e.g. the loading of the
+    shared library or of numba). Samples which are negative because of noise
+    are clamped at 0.
+
+    Parameters
+    ----------
+    t : TestInfo
+        The test being run.
+    case : str
+        The accelerator being tested.
+    folder : str
+        The folder containing the code for the test case.
+    log : io.StringIO
+        The log of the test case.
+
+    Returns
+    -------
+    dict
+        The record describing the measurement.
+    """
+    interpreter = 'pypy' if case=='pypy' else 'python3'
+    cmd = [interpreter, '-c', get_import_cmd(t, case)]
+
+    if verbose:
+        print(cmd, file=log)
+
+    with baseline_lock:
+        baseline = get_startup_baseline(interpreter)
+    baseline_median = statistics.median(baseline)
+
+    samples = []
+    for _ in range(args.startup_samples):
+        returncode, err, duration = time_interpreter(cmd, folder)
+        if returncode != 0:
+            print("Import Error!", file=log)
+            print(err, file=log)
+            return make_record(t.name, case, 'startup', status='failed')
+        samples.append(duration)
+
+    record = make_record(t.name, case, 'startup', [max(s - baseline_median, 0) for s in samples],
+                         raw_samples_ns = samples, baseline_ns = baseline)
+    print("Startup time statistics (ns) : ", record['statistics'], file=log)
+    return record
+
+def time_first_call_case(t, case, folder, log):
+    """
+    Time the first call of a test case in fresh processes.
+
+    The setup code is run in first_call_samples new processes and the first
+    call is timed by the timing worker without any warm-up call. The time
+    therefore includes the costs which are hidden by the steady-state
+    timings (e.g. the compilation by numba, the page faults on newly
+    allocated arrays or cold caches). The number of page faults during the
+    first call of each process is also saved.
+
+    Parameters
+    ----------
+    t : TestInfo
+        The test being run.
+    case : str
+        The accelerator being tested.
+    folder : str
+        The folder containing the code for the test case.
+    log : io.StringIO
+        The log of the test case.
+
+    Returns
+    -------
+    dict
+        The record describing the measurement.
+    """
+    cmd = ['pypy'] if case=='pypy' else ['python3']
+    cmd += [timing_worker, '--setup', get_setup_cmd(t, case), '--warmup', '0',
+            '--min-samples', '1', '--min-time', '0', '--max-samples', '1', t.call]
+
+    if verbose:
+        print(cmd, file=log)
+
+    env = os.environ.copy()
+    env['OMP_NUM_THREADS'] = '1'
+    env['NUMBA_NUM_THREADS'] = '1'
+
+    samples = []
+    page_faults = []
+    for _ in range(args.first_call_samples):
+        with reserve_cores() as cores:
+            returncode, out, err, _ = run_process(cmd, env=env, cwd=folder, cores=cores)
+        if returncode != 0:
+            print("Execution Error!", file=log)
+            print(err, file=log)
+            return make_record(t.name, case, 'first_call', status='failed')
+        worker_results = json.loads(out)
+        samples.extend(worker_results['samples'])
+        page_faults.append(worker_results['minor_page_faults'] + worker_results['major_page_faults'])
+
+    record = make_record(t.name, case, 'first_call', samples, page_faults = page_faults)
+    print("First call time statistics (ns) : ", record['statistics'], file=log)
+    print("First call page faults : ", page_faults, file=log)
+    return record
+
+def run_weak_scaling(case, folder, setup_cmd, exec_cmd, processes, log):
+    """
+    Time the execution of a statement in several concurrent processes.
+
+    The statement is timed by the weak scaling worker which starts the
+    processes and pins each of them to one of the reserved cores. The
+    timing is repeated n_repeats times and the samples of each process are
+    gathered.
+
+    Parameters
+    ----------
+    case : str
+        The accelerator being tested.
+    folder : str
+        The folder containing the code for the test case.
+    setup_cmd : str
+        The code which is run once in each process before the timing begins.
+    exec_cmd : str
+        The code whose execution is timed.
+    processes : int
+        The number of concurrent processes.
+    log : io.StringIO
+        The log of the test case.
+
+    Returns
+    -------
+    tuple or None
+        The duration of each timed call and of each warm-up call of each
+        process in nanoseconds, or None if the execution failed.
+    """
+    env = os.environ.copy()
+    env['OMP_NUM_THREADS'] = '1'
+    env['NUMBA_NUM_THREADS'] = '1'
+    if processes > n_cores:
+        print(f"Warning : {processes} processes share {n_cores} cores", file=log)
+
+    cmd = ['pypy'] if case=='pypy' else ['python3']
+    cmd += [weak_scaling_worker, '--processes', str(processes), '--setup', setup_cmd,
+            '--warmup', str(args.warmup), '--min-samples', str(args.min_samples),
+            '--min-time', str(args.min_time), exec_cmd]
+
+    if verbose:
+        print(cmd, file=log)
+
+    samples = [[] for _ in range(processes)]
+    warmup = [[] for _ in range(processes)]
+    for _ in range(n_repeats):
+        with reserve_cores(processes) as cores:
+            returncode, out, err, _ = run_process(cmd, env=env, cwd=folder, cores=cores)
+
+        if returncode != 0:
+            print("Execution Error!", file=log)
+            print(err, file=log)
+            return None
+
+        if verbose:
+            print(out, file=log)
+        worker_results = json.loads(out)
+        for s, w, s_new, w_new in zip(samples, warmup, worker_results['samples'], worker_results['warmup']):
+            s.extend(s_new)
+            w.extend(w_new)
+
+    return samples, warmup
+
+def estimate_first_call_overhead(folder, setup_cmd, exec_cmd, log):
+    """
+    Estimate the additional CPU time needed by the first call of a test case.
+
+    The test case is called twice in a new process. The CPU time of the
+    second call is subtracted from the CPU time of the first call. For numba
+    this is the time needed to compile the code (or to load it from the
+    cache).
+
+    Parameters
+    ----------
+    folder : str
+        The folder containing the code for the test case.
+    setup_cmd : str
+        The code which is run once before the calls.
+    exec_cmd : str
+        The code which is called.
+    log : io.StringIO
+        The log of the test case.
+
+    Returns
+    -------
+    int or None
+        The CPU time in nanoseconds, or None if the execution failed.
+    """
+    cmd = ['python3']
+    run_str = "{setup}import resource; t0 = resource.getrusage(resource.RUSAGE_SELF); {run}; t1 = resource.getrusage(resource.RUSAGE_SELF); {run}; t2 = resource.getrusage(resource.RUSAGE_SELF); print(2*t1.ru_utime-t0.ru_utime-t2.ru_utime + 2*t1.ru_stime-t0.ru_stime-t2.ru_stime)".format(
+            setup=setup_cmd,
+            run=exec_cmd)
+    cmd += ['-c', run_str]
+
+    if verbose:
+        print(cmd, file=log)
+
+    # don't use `run_process` time_compilation here
+    # because the command executed uses the `time` module
+    with reserve_cores() as cores:
+        returncode, out, err, _ = run_process(cmd, cwd=folder, cores=cores)
+
+    if returncode != 0:
+        print("Execution Error!", file=log)
+        print(err, file=log)
+        return None
+    return round(float(out)*1e9)
+
+def time_case(t, case):
+    """
+    Time the execution of a test case which has already been compiled.
+
+    For numba the compilation time is also estimated here as it can only be
+    measured by running the code. The cache of numba_cached is filled before
+    the first call is timed, so the first call time of numba_cached includes
+    loading the code from the cache but not compiling it.
+
+    Parameters
+    ----------
+    t : TestInfo
+        The test being run.
+    case : str
+        The accelerator being tested.
+
+    Returns
+    -------
+    list of dict
+        The records describing the measurements.
+    """
+    new_folder = get_case_folder(t, case)
+    setup_cmd = get_setup_cmd(t, case)
     exec_cmd  = t.call
 
-    comp_times = [t.name]
-
-    run_times = []
-    run_units = []
-
-    for case in test_cases:
-        setup_cmd = 'from {testname} import {funcs};'.format(
-                testname = numba_testname if case == 'numba' else testname,
-                funcs = import_funcs)
-        setup_cmd += t.setup.replace('\n','')
-        print("-------------------", file=log_file, flush=True)
-        print("   ",case, file=log_file, flush=True)
-        print("-------------------", file=log_file, flush=True)
-        env = os.environ.copy()
-        create_shared_lib = case.startswith('pyccel') or case.startswith('pythran')
-        if create_shared_lib:
-            tag, idx_str = case.split('_', 1)
-            if tag == 'pyccel':
-                idx_str, language = idx_str.split('_')
-                idx = int(idx_str)
-                config = pyccel_configs[idx]
-                cmd = ['pyccel', 'compile', f'--compiler-family={config}', f'--language={language}', '--verbose', basename]
-            elif tag == 'pythran':
-                idx = int(idx_str)
-                config = pythran_configs[idx]
-                cmd = ['pythran', '-v', basename]
-                env['PYTHRANRC'] = config
-
-            if verbose:
-                print(cmd, file=log_file, flush=True)
-
-            returncode, out, err, cpu_time = run_process(cmd, time_compilation, env=env)
-
-            if returncode != 0:
-                print("Compilation Error!", file=log_file, flush=True)
-                print(out, file=log_file, flush=True)
-                print(err, file=log_file, flush=True)
-                comp_times.append('-')
-                run_times.append(None)
-                run_units.append(None)
-                continue
-            elif verbose:
-                print(out, file=log_file, flush=True)
-                print(err, file=log_file, flush=True)
-
-            if time_compilation:
-                print("Compilation CPU time : ", cpu_time, file=log_file)
-                comp_times.append('{:.2f}'.format(float(cpu_time)))
-
-        elif time_compilation and case == "numba":
-            cmd = ['pypy'] if case=='pypy' else ['python3']
-            run_str = "{setup}import resource; t0 = resource.getrusage(resource.RUSAGE_SELF); {run}; t1 = resource.getrusage(resource.RUSAGE_SELF); {run}; t2 = resource.getrusage(resource.RUSAGE_SELF); print(2*t1.ru_utime-t0.ru_utime-t2.ru_utime + 2*t1.ru_stime-t0.ru_stime-t2.ru_stime)".format(
-                    setup=setup_cmd,
-                    run=exec_cmd)
-            cmd += ['-c', run_str]
-
-            if verbose:
-                print(cmd, file=log_file, flush=True)
-
-            # don't use `run_process` time_compilation here
-            # because the command executed uses the `time` module
-            returncode, out, err, _ = run_process(cmd)
-
-            if returncode != 0:
-                print("Execution Error!", file=log_file, flush=True)
-                comp_times.append('-')
-                run_times.append(None)
-                run_units.append(None)
-                print(err, file=log_file, flush=True)
+    log = io.StringIO()
+    print_case_header(t, case, log)
+
+    records = []
+
+    if time_startup:
+        records.append(time_startup_case(t, case, new_folder, log))
+
+    if case.startswith('numba') and (time_compilation or case == 'numba_cached'):
+        # The cache of numba_cached is empty so this is the time needed to compile and save the code.
+        # The cache is filled even if the compilation is not timed so the later phases always load it
+        compilation_time = estimate_first_call_overhead(new_folder, setup_cmd, exec_cmd, log)
+        if time_compilation:
+            if compilation_time is None:
+                records.append(make_record(t.name, case, 'compilation', status='failed'))
             else:
-                print("Compilation Process time : ",out, file=log_file, flush=True)
-                comp_times.append('{:.2f}'.format(float(out)))
-        else:
-            comp_times.append('-')
+                print("Compilation Process time : ", compilation_time*1e-9, file=log)
+                records.append(make_record(t.name, case, 'compilation', [compilation_time]))
+
+        if case == 'numba_cached':
+            # The code is now loaded from the cache
+            load_time = None if compilation_time is None else estimate_first_call_overhead(new_folder, setup_cmd, exec_cmd, log)
+            if load_time is None:
+                records.append(make_record(t.name, case, 'cache_load', status='failed'))
+            else:
+                # The estimate is a difference of CPU times so it is negative if loading the cache is
+                # quicker than the noise on the CPU time. It is clamped at 0 as for the startup time
+                print("Cache load Process time : ", load_time*1e-9, file=log)
+                records.append(make_record(t.name, case, 'cache_load', [max(load_time, 0)],
+                                           raw_samples_ns = [load_time]))
 
-        if time_execution:
-            cmd = ['pypy'] if case=='pypy' else ['python3']
-            cmd += ['-m'] + timeit_cmd + ['-s', setup_cmd, exec_cmd]
+    if time_first_call:
+        records.append(time_first_call_case(t, case, new_folder, log))
 
-            if verbose:
-                print(cmd, file=log_file, flush=True)
+    if time_execution and run_sweep:
+        for point in t.sweep.points:
+            samples = run_timer(case, new_folder, get_setup_cmd(t, case, t.sweep.setup.format(**point)),
+                                t.sweep.call.format(**point), log)
+            if samples is None:
+                records.append(make_record(t.name, case, 'sweep', status='failed', parameters=point,
+                                           size=point[t.sweep.size]))
+            else:
+                record = make_record(t.name, case, 'sweep', samples[0], warmup_ns = samples[1], trials = n_repeats,
+                                     memory = samples[2], parameters = point, size = point[t.sweep.size], size_parameter = t.sweep.size,
+                                     work = t.sweep.work(point), work_unit = t.sweep.unit)
+                print("Execution time statistics (ns) : ", record['statistics'], file=log)
+                records.append(record)
 
-            returncode, out, err, _ = run_process(cmd)
+    elif time_execution and thread_counts:
+        # Only the code compiled with OpenMP or numba uses several threads. The other
+        # accelerators (python, pypy, pythran) run sequential code so they are not timed
+        threaded = case.startswith('numba') or case.startswith('pyccel')
+        for threads in (thread_counts if threaded else []):
+            samples = run_timer(case, new_folder, setup_cmd, exec_cmd, log, threads)
+            if samples is None:
+                records.append(make_record(t.name, case, 'scaling', status='failed', threads=threads))
+            else:
+                record = make_record(t.name, case, 'scaling', samples[0], warmup_ns = samples[1], trials = n_repeats,
+                                     memory = samples[2], threads = threads, cores = min(threads, n_cores))
+                print(f"Execution time statistics with {threads} threads (ns) : ", record['statistics'], file=log)
+                records.append(record)
 
-            if returncode != 0:
-                print("Execution Error!", file=log_file, flush=True)
-                run_times.append(None)
-                run_units.append(None)
-                print(err, file=log_file, flush=True)
+    elif time_execution and n_processes:
+        # A single process provides the reference for the slowdown
+        for processes in sorted({1, n_processes}):
+            samples = run_weak_scaling(case, new_folder, setup_cmd, exec_cmd, processes, log)
+            if samples is None:
+                records.append(make_record(t.name, case, 'weak_scaling', status='failed', processes=processes))
             else:
-                if verbose:
-                    print(out, file=log_file, flush=True)
-                if pyperf:
-                    regexp = re.compile(r'([0-9.]+) (\w\w\w?) \+- ([0-9.]+) (\w\w\w?)')
-                    r = regexp.search(out)
-                    assert r.group(2) == r.group(4)
-                    mean = float(r.group(1))
-                    stddev = float(r.group(3))
-                    units = r.group(2)
-
-                    bench_str = '{mean:.2f} $\pm$ {stddev:.2f}'.format(
-                            mean=mean,
-                            stddev=stddev)
-                    run_times.append((mean,stddev))
-                else:
-                    regexp = re.compile(r'([0-9]+) loops?, best of ([0-9]+): ([0-9.]+) (\w*)')
-                    r = regexp.search(out)
-                    best = float(r.group(3))
-                    units = r.group(4)
-                    if units!= 'sec':
-                        units = units[:-2]
-                    bench_str = best
-                    run_times.append(best)
-
-                run_units.append(possible_units.index(units))
-
-        if create_shared_lib:
-            subprocess.run([shutil.which('pyccel'), 'clean', '-s'])
+                record = make_record(t.name, case, 'weak_scaling', [s for p in samples[0] for s in p],
+                                     warmup_ns = [w for p in samples[1] for w in p], trials = n_repeats,
+                                     processes = processes, cores = min(processes, n_cores),
+                                     process_samples_ns = samples[0])
+                print(f"Execution time statistics with {processes} processes (ns) : ", record['statistics'], file=log)
+                records.append(record)
 
-    if time_compilation:
-        row = cell_splitter[output_format].join('{0: <25}'.format(s) for s in comp_times)
-        if verbose:
-            print(row, file=log_file, flush=True)
-        comp_result_table.append(row)
+    elif time_execution:
+        samples = run_timer(case, new_folder, setup_cmd, exec_cmd, log)
+        if samples is None:
+            records.append(make_record(t.name, case, 'execution', status='failed'))
+        else:
+            record = make_record(t.name, case, 'execution', samples[0], warmup_ns = samples[1], trials = n_repeats,
+                                 memory = samples[2])
+            print("Execution time statistics (ns) : ", record['statistics'], file=log)
+            if samples[2] is not None:
+                print("Memory usage : ", samples[2], file=log)
+            records.append(record)
+
+    flush_log(log)
+
+    return records
+
+case_list = [(t, case) for t in tests for case in test_cases]
+case_keys = [(t.name, case) for t, case in case_list]
+
+# Each timed process is pinned to dedicated cores (one per thread). The timed runs only
+# begin once all compilation has finished so the cores are otherwise idle.
+# os.sched_getaffinity is not available on all platforms (e.g. macOS). In this case the
+# cores are only used to decide how many runs can be carried out concurrently.
+if hasattr(os, 'sched_getaffinity'):
+    available_cores = sorted(os.sched_getaffinity(0))
+else:
+    available_cores = list(range(os.cpu_count() or 1))
+free_cores = queue.Queue()
+for c in available_cores[:max([n_jobs, n_processes] + thread_counts)]:
+    free_cores.put(c)
+n_cores = free_cores.qsize()
+reserve_lock = threading.Lock()
+baseline_lock = threading.Lock()
 
+# The compiled code of each (test, accelerator) pair is built once in its own folder, then
+# reused by every timed process (sweep points, repeats). The folders are only removed at
+# the end of the session.
+try:
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        compilation_results = dict(zip(case_keys, executor.map(lambda tc: compile_case(*tc), case_list)))
+
+    to_time = [(tc, key) for tc, key in zip(case_list, case_keys) if compilation_results[key][0]]
+    with ThreadPoolExecutor(max_workers=min(n_jobs, len(available_cores))) as executor:
+        timing_results = dict(zip((key for _, key in to_time),
+                                  executor.map(lambda tc: time_case(*tc[0]), to_time)))
+finally:
+    for t, case in case_list:
+        shutil.rmtree(get_case_folder(t, case), ignore_errors=True)
+    # Remove the parent folders if they are now empty
+    for folder in {os.path.dirname(get_case_folder(t, case)) for t, case in case_list}:
+        with contextlib.suppress(OSError):
+            os.rmdir(folder)
+    with contextlib.suppress(OSError):
+        os.rmdir(os.path.join(start_dir, 'tmp'))
+
+records = []
+for key in case_keys:
+    success, comp_records = compilation_results[key]
+    records.extend(comp_records)
+    if success:
+        records.extend(timing_results[key])
+        continue
+    if time_startup:
+        records.append(make_record(key[0], key[1], 'startup', status='failed'))
+    if time_first_call:
+        records.append(make_record(key[0], key[1], 'first_call', status='failed'))
     if time_execution:
-        used_units = [u for u in run_units if u is not None]
-        unit_index = round(sum(used_units)/len(used_units))
-        units = latex_units[unit_index]
-        row = [t.name + ' ('+units+')']
-
-        mult_fact = [1000**(unit_index-u) if u is not None else None for u in run_units]
-
-        if pyperf:
-            for time,f in zip(run_times,mult_fact):
-                if time is None:
-                    row.append('-')
-                else:
-                    mean,stddev = time
-                    row.append('{mean:.2f} $\pm$ {stddev:.2f}'.format(
-                                mean=mean*f,
-                                stddev=stddev*f))
-        else:
-            for time,f in zip(run_times,mult_fact):
-                if time is None:
-                    row.append('-')
-                else:
-                    row.append('{:.2f}'.format(time*f))
+        phase = 'sweep' if run_sweep else 'scaling' if thread_counts else 'weak_scaling' if n_processes else 'execution'
+        records.append(make_record(key[0], key[1], phase, status='failed'))
 
-        row = cell_splitter[output_format].join('{0: <25}'.format(s) for s in row)
-        if verbose:
-            print(row, file=log_file, flush=True)
-        exec_result_table.append(row)
-    os.chdir(start_dir)
+environment = get_environment()
+accelerators = [{'id' : case, 'name' : name, 'config' : get_case_config(case)}
+                for case, name in zip(test_cases, test_case_names)]
+accelerator_configs = {a['id'] : a['config'] for a in accelerators}
+for r in records:
+    r['config'] = accelerator_configs[r['accelerator']]
+    r['environment'] = environment
 
-log_file.close()
+results = {'environment' : environment,
+           'accelerators' : accelerators,
+           'tests' : [t.name for t in tests],
+           'phases' : [p for p, timed in (('compilation', time_compilation),
+                                          ('cache_load', 'numba_cached' in test_cases),
+                                          ('startup', time_startup),
+                                          ('first_call', time_first_call),
+                                          ('execution', time_execution and not run_sweep and not thread_counts and not n_processes),
+                                          ('memory', time_execution and measure_memory and not run_sweep and not thread_counts and not n_processes),
+                                          ('sweep', time_execution and run_sweep),
+                                          ('scaling', time_execution and bool(thread_counts)),
+                                          ('weak_scaling', time_execution and n_processes > 0)) if timed],
+           'timer' : 'pyperf' if pyperf else 'worker',
+           'records' : records}
 
-result_file = open("bench.out",'w')
-if time_compilation:
-    print(out_header[output_format]("Compilation time"), file=result_file, flush=True)
-    print(row_splitter[output_format].join(comp_result_table), file=result_file, flush=True)
+save_results("bench.json", results)
 
-print(file=result_file, flush=True)
+tables = render_tables(results, output_format)
+
+if verbose:
+    print(tables, file=log_file, flush=True)
+
+log_file.close()
 
-if time_execution:
-    print(out_header[output_format]("Execution time"), file=result_file, flush=True)
-    print(row_splitter[output_format].join(exec_result_table), file=result_file, flush=True)
-result_file.close()
+with open("bench.out",'w') as result_file:
+    print(tables, end='', file=result_file, flush=True)
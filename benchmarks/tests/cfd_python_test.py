@@ -1,3 +1,15 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Functions for solving the steps of the CFD Python lessons (1D and 2D convection,
+diffusion, Burgers' equation and the lid-driven cavity flow) and drivers which
+set up the initial conditions.
+To be accelerated with pyccel or pythran
+"""
+
 import numpy as np
 
 #==============================================================================
@@ -63,10 +75,11 @@ def linearconv_2d(u: 'float[:,:]', un: 'float[:,:]',
             for i in range(1, col):
                 u[j, i] = (un[j, i] - (c * dt / dx * (un[j, i] - un[j, i - 1])) -
                                       (c * dt / dy * (un[j, i] - un[j - 1, i])))
-                u[0, :] = 1
-                u[-1, :] = 1
-                u[:, 0] = 1
-                u[:, -1] = 1
+
+        u[0, :] = 1
+        u[-1, :] = 1
+        u[:, 0] = 1
+        u[:, -1] = 1
 
 #==============================================================================
 # pythran export lineardiff_2d(float[:,:], float[:,:], int, float, float, float, float)
@@ -194,7 +207,7 @@ def burgers_2d(u: 'float[:,:]', un: 'float[:,:]',
         for j in range(2, row):
             for i in range(2, col):
 
-                u[j-1, i-1] = (un[i-1, j-1] -
+                u[j-1, i-1] = (un[j-1, i-1] -
                                  dt / dx * un[j-1, i-1] *
                                  (un[j-1, i-1] - un[j-1, i-2]) -
                                  dt / dy * vn[j-1, i-1] *
@@ -225,59 +238,60 @@ def burgers_2d(u: 'float[:,:]', un: 'float[:,:]',
         v[:, -1] = 1
 
 #==============================================================================
-# pythran export cavity_flow_2d(float[:,:], float[:,:], float[:,:], int, float, float, float, float, float)
-def cavity_flow_2d(u: 'float[:,:]', v: 'float[:,:]', p: 'float[:,:]',
-                   nt: int, dt: float, dx: float, dy: float,
-                   rho: float, nu: float):
-
-    # ...
-    def build_up_b(b: 'float[:,:]', rho: float, dt: float, u: 'float[:,:]', v: 'float[:,:]', dx: float, dy: float):
-        row, col = p.shape
-
-        for j in range(2, row):
-            for i in range(2, col):
-                b[j-1, i-1] = (rho * (1 / dt *
-                                ((u[j-1, i] - u[j-1, i-2]) /
-                                 (2 * dx) + (v[j, i-1] - v[j-2, i-1]) / (2 * dy)) -
-                                ((u[j-1, i] - u[j-1, i-2]) / (2 * dx))**2 -
-                                  2 * ((u[j, i-1] - u[j-2, i-1]) / (2 * dy) *
-                                       (v[j-1, i] - v[j-1, i-2]) / (2 * dx))-
-                                      ((v[j, i-1] - v[j-2, i-1]) / (2 * dy))**2))
-    # ...
+def build_up_b(b: 'float[:,:]', rho: float, dt: float, u: 'float[:,:]', v: 'float[:,:]', dx: float, dy: float):
+    """
+    Compute the source term of the pressure Poisson equation from the velocity field.
+    """
+    row, col = b.shape
+
+    for j in range(2, row):
+        for i in range(2, col):
+            b[j-1, i-1] = (rho * (1 / dt *
+                            ((u[j-1, i] - u[j-1, i-2]) /
+                             (2 * dx) + (v[j, i-1] - v[j-2, i-1]) / (2 * dy)) -
+                            ((u[j-1, i] - u[j-1, i-2]) / (2 * dx))**2 -
+                              2 * ((u[j, i-1] - u[j-2, i-1]) / (2 * dy) *
+                                   (v[j-1, i] - v[j-1, i-2]) / (2 * dx))-
+                                  ((v[j, i-1] - v[j-2, i-1]) / (2 * dy))**2))
 
-    # ...
-    def pressure_poisson(p: 'float[:,:]', dx: float, dy: float, b: 'float[:,:]'):
+#==============================================================================
+def pressure_poisson(p: 'float[:,:]', pn: 'float[:,:]', dx: float, dy: float, b: 'float[:,:]'):
+    """
+    Carry out a fixed number of Jacobi iterations on the pressure Poisson equation.
+    The array pn is used as a work space.
+    """
+    row, col = p.shape
 
-        row, col = p.shape
-        pn = np.empty((row, col))
+    nit = 50
+    for q in range(nit):
         # ... copy p to pn
         pn[:,:] = p[:,:]
         # ...
 
-        nit = 50
-        for q in range(nit):
-            # ... copy p to pn
-            pn[:,:] = p[:,:]
-            # ...
+        for j in range(2, row):
+            for i in range(2, col):
+                p[j-1, i-1] = (((pn[j-1, i] + pn[j-1, i-2]) * dy**2 +
+                                  (pn[j, i-1] + pn[j-2, i-1]) * dx**2) /
+                                  (2 * (dx**2 + dy**2)) -
+                                  dx**2 * dy**2 / (2 * (dx**2 + dy**2)) *
+                                  b[j-1, i-1])
 
-            for j in range(2, row):
-                for i in range(2, col):
-                    p[j-1, i-1] = (((pn[j-1, i] + pn[j-1, i-2]) * dy**2 +
-                                      (pn[j, i-1] + pn[j-2, i-1]) * dx**2) /
-                                      (2 * (dx**2 + dy**2)) -
-                                      dx**2 * dy**2 / (2 * (dx**2 + dy**2)) *
-                                      b[j-1, i-1])
+        p[:, -1] = p[:, -2] # dp/dx = 0 at x = 2
+        p[0, :] = p[1, :]   # dp/dy = 0 at y = 0
+        p[:, 0] = p[:, 1]   # dp/dx = 0 at x = 0
+        p[-1, :] = 0        # p = 0 at y = 2
 
-            p[:, -1] = p[:, -2] # dp/dx = 0 at x = 2
-            p[0, :] = p[1, :]   # dp/dy = 0 at y = 0
-            p[:, 0] = p[:, 1]   # dp/dx = 0 at x = 0
-            p[-1, :] = 0        # p = 0 at y = 2
-    # ...
+#==============================================================================
+# pythran export cavity_flow_2d(float[:,:], float[:,:], float[:,:], int, float, float, float, float, float)
+def cavity_flow_2d(u: 'float[:,:]', v: 'float[:,:]', p: 'float[:,:]',
+                   nt: int, dt: float, dx: float, dy: float,
+                   rho: float, nu: float):
 
     row, col = p.shape
 
     un = np.empty((row, col))
     vn = np.empty((row, col))
+    pn = np.empty((row, col))
     b  = np.zeros((row, col))
 
     for n in range(nt):
@@ -287,7 +301,7 @@ def cavity_flow_2d(u: 'float[:,:]', v: 'float[:,:]', p: 'float[:,:]',
         # ...
 
         build_up_b(b, rho, dt, u, v, dx, dy)
-        pressure_poisson(p, dx, dy, b)
+        pressure_poisson(p, pn, dx, dy, b)
 
         for j in range(2, row):
             for i in range(2, col):
@@ -361,6 +375,8 @@ def test_lineardiff_1d(nx : int = 501, nt : int = 1500, nu : float = 0.3):
     lineardiff_1d(u, un, nt, nx, dt, dx, nu)
     # ...
 
+    return u
+
 #==============================================================================
 # pythran export test_nonlinearconv_1d(int,int,float,float)
 def test_nonlinearconv_1d(nx : int =2001, nt : int =2000, c : float =1., dt : float =0.00035):
@@ -404,6 +420,8 @@ def test_linearconv_2d(nx : int = 201, ny : int = 201, nt : int = 100, c : float
     linearconv_2d(u, un, nt, dt, dx, dy, c)
     # ...
 
+    return u
+
 #==============================================================================
 # pythran export test_lineardiff_2d(int, int, int, float)
 def test_lineardiff_2d(nt : int = 51, nx : int = 101, ny : int = 101, nu : float = .05):
@@ -425,6 +443,8 @@ def test_lineardiff_2d(nt : int = 51, nx : int = 101, ny : int = 101, nu : float
     lineardiff_2d(u, un, nt, dt, dx, dy, nu)
     # ...
 
+    return u
+
 #==============================================================================
 # pythran export test_poisson_2d(int,int,int)
 def test_poisson_2d(nx : int = 150, ny : int = 150, nt : int = 100):
@@ -472,3 +492,97 @@ def test_laplace_2d(nx : int = 31, ny : int = 31, c : float = 1., l1norm_target
     # ...
     laplace_2d(p, y, dx, dy, l1norm_target)
     # ...
+
+#==============================================================================
+# pythran export test_burgers_1d(int, int, float)
+def test_burgers_1d(nx : int = 101, nt : int = 100, nu : float = .07):
+
+    # ...
+    dx = 2 * np.pi / (nx - 1)
+    dt = min(dx * nu, .2 * dx**2 / nu)
+    grid = np.linspace(0, 2 * np.pi, nx)
+
+    # Saw-tooth initial condition u = -2 nu dphi/dx / phi + 4
+    phi  = np.exp(-grid**2 / (4 * nu)) + np.exp(-(grid - 2 * np.pi)**2 / (4 * nu))
+    dphi = (-grid / (2 * nu) * np.exp(-grid**2 / (4 * nu)) -
+            (grid - 2 * np.pi) / (2 * nu) * np.exp(-(grid - 2 * np.pi)**2 / (4 * nu)))
+    u = -2 * nu * dphi / phi + 4
+    un = np.empty(nx)
+    # ...
+
+    # ...
+    burgers_1d(u, un, nt, nx, dt, dx, nu)
+    # ...
+
+    return u
+
+#==============================================================================
+# pythran export test_nonlinearconv_2d(int, int, int, float)
+def test_nonlinearconv_2d(nx : int = 101, ny : int = 101, nt : int = 80, c : float = 1.):
+
+    # ...
+    dx = 2 / (nx - 1)
+    dy = 2 / (ny - 1)
+    sigma = .2
+    dt = sigma * dx
+
+    # Hat initial condition: u = v = 2 on [0.5, 1] x [0.5, 1]
+    u = np.ones((ny, nx))
+    v = np.ones((ny, nx))
+    u[int(.5 / dy):int(1 / dy + 1),int(.5 / dx):int(1 / dx + 1)] = 2
+    v[int(.5 / dy):int(1 / dy + 1),int(.5 / dx):int(1 / dx + 1)] = 2
+    un = np.ones((ny, nx))
+    vn = np.ones((ny, nx))
+    # ...
+
+    # ...
+    nonlinearconv_2d(u, un, v, vn, nt, dt, dx, dy, c)
+    # ...
+
+    return u, v
+
+#==============================================================================
+# pythran export test_burgers_2d(int, int, int, float)
+def test_burgers_2d(nx : int = 41, ny : int = 41, nt : int = 120, nu : float = .01):
+
+    # ...
+    dx = 2 / (nx - 1)
+    dy = 2 / (ny - 1)
+    sigma = .0009
+    dt = sigma * dx * dy / nu
+
+    # Hat initial condition: u = v = 2 on [0.5, 1] x [0.5, 1]
+    u = np.ones((ny, nx))
+    v = np.ones((ny, nx))
+    u[int(.5 / dy):int(1 / dy + 1),int(.5 / dx):int(1 / dx + 1)] = 2
+    v[int(.5 / dy):int(1 / dy + 1),int(.5 / dx):int(1 / dx + 1)] = 2
+    un = np.ones((ny, nx))
+    vn = np.ones((ny, nx))
+    # ...
+
+    # ...
+    burgers_2d(u, un, v, vn, nt, dt, dx, dy, nu)
+    # ...
+
+    return u, v
+
+#==============================================================================
+# pythran export test_cavity_flow_2d(int, int, int, float, float)
+def test_cavity_flow_2d(nx : int = 41, ny : int = 41, nt : int = 100, rho : float = 1., nu : float = .1):
+
+    # ...
+    dx = 2 / (nx - 1)
+    dy = 2 / (ny - 1)
+    sigma = .1
+    dt = sigma * dx * dy / nu
+
+    u = np.zeros((ny, nx))
+    v = np.zeros((ny, nx))
+    p = np.zeros((ny, nx))
+    # ...
+
+    # ...
+    cavity_flow_2d(u, v, p, nt, dt, dx, dy, rho, nu)
+    # ...
+
+    return u, v, p
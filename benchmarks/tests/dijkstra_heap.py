@@ -0,0 +1,136 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+""" Module containing functions for testing the Dijkstra algorithm on a sparse graph with a binary heap using pyccel or pythran
+"""
+
+import numpy as np
+
+# ================================================================
+def sift_up ( heap: 'int[:]', pos: 'int[:]', dist: 'int[:]', start: int ):
+    """ Move a node up the heap until its parent is nearer
+    """
+
+    i = start
+    v = heap[i]
+    d = dist[v]
+    while ( i > 0 and dist[heap[(i - 1) // 2]] > d ):
+        parent = (i - 1) // 2
+        heap[i] = heap[parent]
+        pos[heap[i]] = i
+        i = parent
+
+    heap[i] = v
+    pos[v] = i
+
+# ================================================================
+def sift_down ( heap: 'int[:]', pos: 'int[:]', dist: 'int[:]', size: int, start: int ):
+    """ Move a node down the heap until its children are further away
+    """
+
+    i = start
+    v = heap[i]
+    d = dist[v]
+    child = 2 * i + 1
+    while ( child < size ):
+        if ( child + 1 < size and dist[heap[child + 1]] < dist[heap[child]] ):
+            child = child + 1
+        if ( dist[heap[child]] >= d ):
+            break
+        heap[i] = heap[child]
+        pos[heap[i]] = i
+        i = child
+        child = 2 * i + 1
+
+    heap[i] = v
+    pos[v] = i
+
+# ================================================================
+def dijkstra_heap_distance ( nv: int, indptr: 'int[:]', indices: 'int[:]', weights: 'int[:]', mind: 'int[:]' ):
+    """ Find the shortest paths between nodes in a graph stored in CSR format
+    """
+
+    i4_huge = 2147483647
+
+    #  The heap contains the unconnected nodes which have been reached.
+    #  pos is the position of a node in the heap, -1 if it has not been
+    #  reached and -2 if it is connected to the tree.
+    heap = np.zeros ( nv, dtype = int )
+    pos = np.zeros ( nv, dtype = int )
+
+    for i in range ( 0, nv ):
+        mind[i] = i4_huge
+        pos[i] = -1
+
+    #  Start out with only node 1 in the heap.
+    mind[0] = 0
+    heap[0] = 0
+    pos[0] = 0
+    size = 1
+
+    while ( size > 0 ):
+        #  Remove the nearest unconnected node from the heap and connect it.
+        mv = heap[0]
+        pos[mv] = -2
+        size = size - 1
+        if ( size > 0 ):
+            heap[0] = heap[size]
+            pos[heap[0]] = 0
+            sift_down ( heap, pos, mind, size, 0 )
+
+        #  See if the minimum distance to node MV reduces the minimum
+        #  distance to its neighbours (decrease-key).
+        for k in range ( indptr[mv], indptr[mv + 1] ):
+            v = indices[k]
+            if ( pos[v] != -2 and mind[mv] + weights[k] < mind[v] ):
+                mind[v] = mind[mv] + weights[k]
+                if ( pos[v] == -1 ):
+                    heap[size] = v
+                    pos[v] = size
+                    size = size + 1
+                sift_up ( heap, pos, mind, pos[v] )
+
+# ================================================================
+def init ( nv: int, degree: int, indptr: 'int[:]', indices: 'int[:]', weights: 'int[:]' ):
+    """ Create a sparse graph where each node has the same number of outgoing edges
+    """
+
+    #  The edges are generated with a linear congruential generator so that
+    #  the graph is identical for all accelerators.
+    seed = 12345
+
+    for i in range ( 0, nv ):
+        indptr[i] = i * degree
+
+        #  Link each node to the next one so that the graph is connected.
+        indices[i * degree] = ( i + 1 ) % nv
+        weights[i * degree] = 100
+
+        for j in range ( 1, degree ):
+            seed = ( seed * 1103515245 + 12345 ) % 2147483648
+            indices[i * degree + j] = seed % nv
+            seed = ( seed * 1103515245 + 12345 ) % 2147483648
+            weights[i * degree + j] = 1 + seed % 100
+
+    indptr[nv] = nv * degree
+
+# ================================================================
+# pythran export dijkstra_heap_distance_test(int)
+def dijkstra_heap_distance_test ( nv : int ):
+    """ Test Dijkstra's algorithm on a sparse graph
+    """
+
+    #  Initialize the problem data.
+    degree = 8
+    indptr = np.zeros ( nv + 1, dtype = int )
+    indices = np.zeros ( nv * degree, dtype = int )
+    weights = np.zeros ( nv * degree, dtype = int )
+    init ( nv, degree, indptr, indices, weights )
+
+    #  Carry out the algorithm.
+    min_distance = np.zeros ( nv, dtype = int )
+    dijkstra_heap_distance ( nv, indptr, indices, weights, min_distance )
+
+    return min_distance
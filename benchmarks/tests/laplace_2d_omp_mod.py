@@ -0,0 +1,112 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Functions for solving a Laplace equation. The code is adapted from examples written by
+[J. Burkardt](https://people.sc.fsu.edu/~jburkardt/py_src/py_src.html).
+The Jacobi sweeps are carried out in parallel with OpenMP.
+To be accelerated with pyccel or pythran
+"""
+
+import numpy as np
+
+
+# pythran export laplace_2d_omp(int, int, float, int)
+def laplace_2d_omp(nx: int, ny: int, rtol: float, maxiter: int):
+    """
+    Solve the 2D Laplace equation for phi(x, y) on the rectangular
+    domain [0, 2] * [0, 1] with boundary conditions
+
+        phi = 0      at x = xmin,
+        phi = y      at x = xmax,
+        dphi/dy = 0  at y = ymin,
+        dphi/dy = 0  at y = ymax.
+
+    The numerical solution is computed on a uniform grid using 2nd
+    order finite differences and the Jacobi method with a prescribed
+    relative tolerance. The rows of the grid are shared between the
+    threads and the norms are computed with reductions.
+
+    Parameters
+    ----------
+    nx : int
+        Number of grid points along x axis.
+
+    ny : int
+        Number of grid points along y axis.
+
+    rtol : float
+        Stopping condition for the Jacobi method: the relative L1 norm
+        of the difference between successive solutions should be lower
+        than the value provided. If it is negative exactly maxiter
+        iterations are carried out.
+
+    maxiter : int
+        Maximum number of Jacobi iterations allowed.
+
+    Returns
+    -------
+    x : numpy.ndarray[nx]
+        Computational grid along x axis.
+
+    y : numpy.ndarray[ny]
+        Computational grid along y axis.
+
+    phi : numpy.ndarray[ny, nx]
+        Numerical solution on the computational grid.
+
+    niter : int
+        Number of Jacobi iterations performed.
+    """
+
+    # Domain size
+    xmin, xmax = 0., 2.
+    ymin, ymax = 0., 1.
+
+    # Computational grid
+    dx = (xmax - xmin) / (nx - 1)
+    dy = (ymax - ymin) / (ny - 1)
+    x  = np.linspace(xmin, xmax, nx)
+    y  = np.linspace(ymin, ymax, ny)
+
+    # Initial values
+    phi = np.ones((ny, nx))
+    l1norm = abs(rtol) + 1.0 # Ensure that the first iteration is carried out
+    niter = 0
+
+    # Temporary array
+    pn = np.empty((ny, nx))
+
+    # Jacobi iteration
+    while l1norm > rtol and niter < maxiter:
+        #$ omp parallel for private(i)
+        for j in range(ny):
+            for i in range(nx):
+                pn[j, i] = phi[j, i]
+
+        #$ omp parallel for private(i)
+        for j in range(1, ny-1):
+            for i in range(1, nx-1):
+                phi[j, i] = ((dy**2 * (pn[j, i+1] + pn[j, i-1]) +
+                              dx**2 * (pn[j+1, i] + pn[j-1, i])) /
+                              (2 * (dx**2 + dy**2)))
+
+        phi[ :, 0] = 0           #     phi = 0 @ x = 0
+        phi[ :,-1] = y           #     phi = y @ x = 2
+        phi[ 0, :] = phi[ 1, :]  # dphi/dy = 0 @ y = 0
+        phi[-1, :] = phi[-2, :]  # dphi/dy = 0 @ y = 1
+
+        err = 0.0
+        a = 0.0
+        #$ omp parallel for private(i) reduction(+:err, a)
+        for j in range(ny):
+            for i in range(nx):
+                err += abs(phi[j, i] - pn[j, i])
+                a += abs(pn[j, i])
+        l1norm = err / a
+        niter += 1
+
+    # Return axes' grid, solution, and number of iterations
+    return x, y, phi, niter
@@ -0,0 +1,109 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Functions for solving a linear convection equation using temporal blocking. The problem is
+the same as in linearconv_1d_mod.
+To be accelerated with pyccel or pythran
+"""
+
+import numpy as np
+
+def advance_tile(cp: float, u: 'float[:,:]', src: int, start: int, stop: int,
+                 nsteps: int, tile: 'float[:,:]'):
+    """
+    Advance the points u[src, start:stop] by nsteps time steps and save them in u[1-src].
+
+    The points are copied to a small buffer together with the nsteps points on
+    their left (the halo) on which they depend. The time steps are then carried
+    out in the buffer, which stays in cache. The number of valid points in the
+    buffer decreases by one at each step, except at the boundary of the domain.
+    """
+    lo = max(start - nsteps, 0)
+    n = stop - lo
+
+    for k in range(n):
+        tile[0, k] = u[src, lo + k]
+
+    for s in range(nsteps):
+        a = s % 2
+        b = 1 - a
+        # The point at the left boundary of the domain is fixed
+        if lo == 0:
+            first = 1
+            tile[b, 0] = tile[a, 0]
+        else:
+            first = s + 1
+        for k in range(first, n):
+            tile[b, k] = tile[a, k] - cp * (tile[a, k] - tile[a, k-1])
+
+    for k in range(start - lo, n):
+        u[1 - src, lo + k] = tile[nsteps % 2, k]
+
+# pythran export linearconv_1d_blocked(int, float, int)
+def linearconv_1d_blocked(nx: int, dt: float, nt: int):
+    """
+    Compute an approximation of the solution u(t, x) to the 1D
+    linear advection equation
+
+        du/dt + du/dx = 0
+
+    on the domain [0, 2], with discontinuous initial conditions
+
+        u(t=0, x) = 2   for 0.5 < x < 1,
+        u(t=0, x) = 1   otherwise.
+
+    The numerical solution is computed on a uniform grid using
+    the 1st-order Godunov method, i.e. explicit Euler time stepping
+    combined with upwind fluxes.
+
+    The domain is split into tiles which are advanced by several time
+    steps at once. The solution alternates between two buffers so it
+    is never copied.
+
+    Parameters
+    ----------
+    nx : int
+        Number of grid points in the domain.
+
+    dt : float
+        Time step size.
+
+    nt : int
+        Number of time steps to be taken.
+
+    Returns
+    -------
+    x : numpy.ndarray of nx floats
+        Spatial grid where solution is computed.
+
+    u : numpy.ndarray of nx floats
+        Numerical solution u at final time.
+
+    """
+
+    # Number of points in a tile and number of time steps carried out in a tile
+    tile_size = 4096
+    block_steps = 16
+
+    c  = 1.0
+    dx = 2 / (nx-1)
+    x  = np.linspace(0, 2, nx)
+    u  = np.ones((2, nx))
+    u[0, int(.5 / dx):int(1 / dx + 1)] = 2
+
+    cp = c * dt / dx
+    tile = np.empty((2, tile_size + block_steps))
+
+    step = 0
+    current = 0
+    while step < nt:
+        nsteps = min(block_steps, nt - step)
+        for start in range(0, nx, tile_size):
+            advance_tile(cp, u, current, start, min(start + tile_size, nx), nsteps, tile)
+        current = 1 - current
+        step += nsteps
+
+    return x, u[current].copy()
@@ -0,0 +1,284 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Functions for solving an ordinary differential equation using the adaptive Dormand-Prince
+method (RK45) with dense output. The problem is the same as in rk4_mod.
+To be accelerated with numba
+"""
+import numpy as np
+from numba import njit
+
+# ================================================================
+@njit(fastmath=True)
+def dopri5(dydt: '()(float, float[:], float[:])',
+           tspan: 'float[:]', y0: 'float[:]', rtol: float, atol: float,
+           t: 'float[:]', y: 'float[:,:]'):
+    """
+    Function implementing the explicit Runge-Kutta method of order 5(4)
+    of Dormand and Prince with step size control and dense output of
+    order 4. The solution is interpolated at the increasing times t
+    which lie in the interval tspan and saved in y. The number of
+    accepted and rejected steps is returned.
+    """
+
+    # Butcher tableau
+    c2 = 1.0 / 5.0
+    c3 = 3.0 / 10.0
+    c4 = 4.0 / 5.0
+    c5 = 8.0 / 9.0
+    a21 = 1.0 / 5.0
+    a31 = 3.0 / 40.0
+    a32 = 9.0 / 40.0
+    a41 = 44.0 / 45.0
+    a42 = -56.0 / 15.0
+    a43 = 32.0 / 9.0
+    a51 = 19372.0 / 6561.0
+    a52 = -25360.0 / 2187.0
+    a53 = 64448.0 / 6561.0
+    a54 = -212.0 / 729.0
+    a61 = 9017.0 / 3168.0
+    a62 = -355.0 / 33.0
+    a63 = 46732.0 / 5247.0
+    a64 = 49.0 / 176.0
+    a65 = -5103.0 / 18656.0
+    a71 = 35.0 / 384.0
+    a73 = 500.0 / 1113.0
+    a74 = 125.0 / 192.0
+    a75 = -2187.0 / 6784.0
+    a76 = 11.0 / 84.0
+
+    # Difference between the 5th and 4th order solutions
+    e1 = 71.0 / 57600.0
+    e3 = -71.0 / 16695.0
+    e4 = 71.0 / 1920.0
+    e5 = -17253.0 / 339200.0
+    e6 = 22.0 / 525.0
+    e7 = -1.0 / 40.0
+
+    # Dense output
+    d1 = -12715105075.0 / 11282082432.0
+    d3 = 87487479700.0 / 32700410799.0
+    d4 = -10690763975.0 / 1880347072.0
+    d5 = 701980252875.0 / 199316789632.0
+    d6 = -1453857185.0 / 822651844.0
+    d7 = 69997945.0 / 29380423.0
+
+    m = len(y0)
+    nout = len(t)
+    k1 = np.zeros(m)
+    k2 = np.zeros(m)
+    k3 = np.zeros(m)
+    k4 = np.zeros(m)
+    k5 = np.zeros(m)
+    k6 = np.zeros(m)
+    k7 = np.zeros(m)
+    ys = np.zeros(m)
+    yold = np.zeros(m)
+    ynew = np.zeros(m)
+    r3 = np.zeros(m)
+    r4 = np.zeros(m)
+    r5 = np.zeros(m)
+
+    t0 = tspan[0]
+    t1 = tspan[1]
+
+    for k in range(m):
+        yold[k] = y0[k]
+    dydt(t0, yold, k1)
+
+    # Initial step size estimated from the size of the solution and of its derivative
+    n0 = 0.0
+    n1 = 0.0
+    for k in range(m):
+        sk = atol + rtol * abs(yold[k])
+        n0 += (yold[k] / sk)**2
+        n1 += (k1[k] / sk)**2
+    n0 = np.sqrt(n0 / m)
+    n1 = np.sqrt(n1 / m)
+    if n0 < 1e-5 or n1 < 1e-5:
+        h = 1e-6
+    else:
+        h = 0.01 * n0 / n1
+    h = min(h, t1 - t0)
+
+    # Output points at the initial time
+    j = 0
+    while j < nout and t[j] <= t0:
+        for k in range(m):
+            y[j, k] = yold[k]
+        j += 1
+
+    naccept = 0
+    nreject = 0
+    reject = False
+    told = t0
+
+    while told < t1:
+
+        last = told + h >= t1
+        if last:
+            h = t1 - told
+
+        for k in range(m):
+            ys[k] = yold[k] + h * a21 * k1[k]
+        dydt(told + c2 * h, ys, k2)
+
+        for k in range(m):
+            ys[k] = yold[k] + h * (a31 * k1[k] + a32 * k2[k])
+        dydt(told + c3 * h, ys, k3)
+
+        for k in range(m):
+            ys[k] = yold[k] + h * (a41 * k1[k] + a42 * k2[k] + a43 * k3[k])
+        dydt(told + c4 * h, ys, k4)
+
+        for k in range(m):
+            ys[k] = yold[k] + h * (a51 * k1[k] + a52 * k2[k] + a53 * k3[k] + a54 * k4[k])
+        dydt(told + c5 * h, ys, k5)
+
+        for k in range(m):
+            ys[k] = yold[k] + h * (a61 * k1[k] + a62 * k2[k] + a63 * k3[k] + a64 * k4[k] + a65 * k5[k])
+        dydt(told + h, ys, k6)
+
+        for k in range(m):
+            ynew[k] = yold[k] + h * (a71 * k1[k] + a73 * k3[k] + a74 * k4[k] + a75 * k5[k] + a76 * k6[k])
+        dydt(told + h, ynew, k7)
+
+        # Scaled RMS norm of the local error estimate
+        err = 0.0
+        for k in range(m):
+            sk = atol + rtol * max(abs(yold[k]), abs(ynew[k]))
+            ek = h * (e1 * k1[k] + e3 * k3[k] + e4 * k4[k] + e5 * k5[k] + e6 * k6[k] + e7 * k7[k])
+            err += (ek / sk)**2
+        err = np.sqrt(err / m)
+
+        # Factor used to compute the next step size
+        fac = 0.9 * max(err, 1e-10)**(-0.2)
+        fac = min(10.0, max(0.2, fac))
+
+        if err <= 1.0:
+            naccept += 1
+            tnew = t1 if last else told + h
+
+            # Interpolate the solution at the output points in this step
+            if j < nout and t[j] <= tnew:
+                for k in range(m):
+                    r2 = ynew[k] - yold[k]
+                    r3[k] = h * k1[k] - r2
+                    r4[k] = r2 - h * k7[k] - r3[k]
+                    r5[k] = h * (d1 * k1[k] + d3 * k3[k] + d4 * k4[k] + d5 * k5[k] + d6 * k6[k] + d7 * k7[k])
+                while j < nout and t[j] <= tnew:
+                    theta = (t[j] - told) / h
+                    theta1 = 1.0 - theta
+                    for k in range(m):
+                        y[j, k] = yold[k] + theta * ((ynew[k] - yold[k]) + theta1 * (r3[k] + theta * (r4[k] + theta1 * r5[k])))
+                    j += 1
+
+            # The last stage is the first stage of the next step
+            for k in range(m):
+                yold[k] = ynew[k]
+                k1[k] = k7[k]
+            told = tnew
+
+            # Don't increase the step size just after a rejection
+            if reject:
+                fac = min(fac, 1.0)
+            reject = False
+        else:
+            nreject += 1
+            reject = True
+
+        h = h * fac
+
+    return naccept, nreject
+
+# ================================================================
+@njit(fastmath=True)
+def humps_fun(x: float):
+    """
+    Humps function
+    """
+
+    y = 1.0 / ( ( x - 0.3 )**2 + 0.01 ) \
+            + 1.0 / ( ( x - 0.9 )**2 + 0.04 ) \
+            - 6.0
+
+    return y
+
+# ================================================================
+@njit(fastmath=True)
+def humps_deriv(x: 'float', y: 'float[:]', out: 'float[:]'):
+    """
+    Derivative of the humps function
+    """
+
+    out[0] = - 2.0 * ( x - 0.3 ) / ( ( x - 0.3 )**2 + 0.01 )**2 - 2.0 * ( x - 0.9 ) / ( ( x - 0.9 )**2 + 0.04 )**2
+
+# ================================================================
+@njit(fastmath=True)
+def dopri5_humps_test(t0: float, t1: float, tol: float, nout: int):
+    """
+    Compute an approximate solution y_h(t) ~= y(t) of the initial
+    value problem
+
+      dy/dt = f(t)
+      y(t0) = y0
+
+    over the interval [t0, t1].
+
+    For test purposes we use the method of manufactured solutions,
+    i.e. we choose the humps function y(t) as the exact solution
+    and we compute f(t) := dy/dt, which is then passed to the ODE
+    integrator. Finally the numerical solution y_h(t) is compared to
+    the exact solution y(t) at the output times.
+
+    Numerical integration is performed with the adaptive Dormand-Prince
+    method, with the same relative and absolute tolerance. The solution
+    is computed at nout + 1 uniform output times with dense output.
+
+    Parameters
+    ----------
+    t0 : float
+        Initial time.
+
+    t1 : float
+        Final time.
+
+    tol : float
+        Relative and absolute tolerance of the local error.
+
+    nout : int
+        Number of uniform intervals between the output times.
+
+    Returns
+    -------
+    err : float
+        Maximum difference between numerical and exact solution at
+        the output times.
+
+    nsteps : int
+        Number of steps (accepted and rejected) carried out.
+
+    """
+
+    # Time interval and initial conditions
+    tspan = np.array([t0, t1])
+    y0 = np.array([humps_fun(t0)])
+
+    # Uniform time array where solution should be computed
+    t = np.linspace(t0, t1, nout + 1)
+
+    # Empty array which will contain numerical solution
+    yh = np.zeros((nout + 1, 1))
+
+    # Time integration
+    naccept, nreject = dopri5(humps_deriv, tspan, y0, tol, tol, t, yh)
+
+    # Maximum error at the output times
+    err = 0.0
+    for j in range(nout + 1):
+        err = max(err, abs(yh[j, 0] - humps_fun(t[j])))
+
+    return err, naccept + nreject
@@ -37,7 +37,8 @@ def laplace_2d(nx: int, ny: int, rtol: float, maxiter: int):
     rtol : float
         Stopping condition for the Jacobi method: the relative L1 norm
         of the difference between successive solutions should be lower
-        than the value provided.
+        than the value provided. If it is negative exactly maxiter
+        iterations are carried out.
 
     maxiter : int
         Maximum number of Jacobi iterations allowed.
@@ -69,7 +70,7 @@ def laplace_2d(nx: int, ny: int, rtol: float, maxiter: int):
 
     # Initial values
     phi = np.ones((ny, nx))
-    l1norm = 2 * rtol
+    l1norm = abs(rtol) + 1.0 # Ensure that the first iteration is carried out
     niter = 0
 
     # Temporary arrays
@@ -0,0 +1,122 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Functions for solving a Laplace equation with the red-black SOR method. The problem is the
+same as in laplace_2d_mod.
+To be accelerated with numba
+"""
+
+import numpy as np
+from numba import njit
+
+@njit(fastmath=True)
+def laplace_2d_sor(nx: int, ny: int, rtol: float, maxiter: int):
+    """
+    Solve the 2D Laplace equation for phi(x, y) on the rectangular
+    domain [0, 2] * [0, 1] with boundary conditions
+
+        phi = 0      at x = xmin,
+        phi = y      at x = xmax,
+        dphi/dy = 0  at y = ymin,
+        dphi/dy = 0  at y = ymax.
+
+    The numerical solution is computed on a uniform grid using 2nd
+    order finite differences and the red-black successive
+    over-relaxation (SOR) method with a prescribed relative tolerance.
+    The solution is updated in place and the norm of the update is
+    computed during the sweep. As in laplace_2d, the norm covers the
+    whole grid including the boundary rows and columns.
+
+    Parameters
+    ----------
+    nx : int
+        Number of grid points along x axis.
+
+    ny : int
+        Number of grid points along y axis.
+
+    rtol : float
+        Stopping condition for the SOR method: the relative L1 norm
+        of the difference between successive solutions should be lower
+        than the value provided. If it is negative exactly maxiter
+        iterations are carried out.
+
+    maxiter : int
+        Maximum number of SOR iterations allowed.
+
+    Returns
+    -------
+    x : numpy.ndarray[nx]
+        Computational grid along x axis.
+
+    y : numpy.ndarray[ny]
+        Computational grid along y axis.
+
+    phi : numpy.ndarray[ny, nx]
+        Numerical solution on the computational grid.
+
+    niter : int
+        Number of SOR iterations performed.
+    """
+
+    # Domain size
+    xmin, xmax = 0., 2.
+    ymin, ymax = 0., 1.
+
+    # Computational grid
+    dx = (xmax - xmin) / (nx - 1)
+    dy = (ymax - ymin) / (ny - 1)
+    x  = np.linspace(xmin, xmax, nx)
+    y  = np.linspace(ymin, ymax, ny)
+
+    # Optimal relaxation factor computed from the spectral radius of the Jacobi method.
+    # The boundaries at y = ymin and y = ymax are Neumann boundaries so the slowest mode
+    # along y is the constant one, whose Jacobi factor is 1.
+    rho = (dy**2 * np.cos(np.pi / (nx - 1)) + dx**2) / (dx**2 + dy**2)
+    omega = 2 / (1 + np.sqrt(1 - rho**2))
+
+    # Initial values
+    phi = np.ones((ny, nx))
+    phi[ :, 0] = 0           #     phi = 0 @ x = 0
+    phi[ :,-1] = y           #     phi = y @ x = 2
+    l1norm = abs(rtol) + 1.0 # Ensure that the first iteration is carried out
+    niter = 0
+
+    # Values of the Neumann boundary rows at the start of an iteration
+    edges = np.empty((2, nx))
+
+    # Red-black SOR iteration
+    while l1norm > rtol and niter < maxiter:
+        edges[0, :] = phi[ 0, :]
+        edges[1, :] = phi[-1, :]
+        err = 0.0
+        a = 0.0
+        for color in range(2):
+            for j in range(1, ny-1):
+                # Only update the points where (i + j) % 2 == color
+                for i in range(1 + (1 + j + color) % 2, nx-1, 2):
+                    update = omega * (((phi[j, i+1] + phi[j, i-1]) * dy**2 +
+                                       (phi[j+1, i] + phi[j-1, i]) * dx**2) /
+                                       (2 * (dx**2 + dy**2)) - phi[j, i])
+                    err += abs(update)
+                    a += abs(phi[j, i])
+                    phi[j, i] += update
+
+            phi[ 0, :] = phi[ 1, :]  # dphi/dy = 0 @ y = 0
+            phi[-1, :] = phi[-2, :]  # dphi/dy = 0 @ y = 1
+
+        # Add the boundaries to the norm (the Dirichlet columns do not change)
+        for i in range(nx):
+            a += abs(edges[0, i]) + abs(edges[1, i])
+            err += abs(phi[0, i] - edges[0, i]) + abs(phi[ny-1, i] - edges[1, i])
+        for j in range(1, ny-1):
+            a += abs(phi[j, 0]) + abs(phi[j, nx-1])
+
+        l1norm = err / a
+        niter += 1
+
+    # Return axes' grid, solution, and number of iterations
+    return x, y, phi, niter
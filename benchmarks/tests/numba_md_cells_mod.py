@@ -0,0 +1,271 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Functions for running a molecular dynamics simulation using cell lists. The potential is the
+same as in md_mod, but it is truncated at a cutoff radius so the interactions can be found in
+linear time. Each pair of particles is only evaluated once.
+To be accelerated with numba
+"""
+from numba import njit
+from numpy import zeros
+from numpy import sqrt
+from numpy import pi
+from numpy import sin
+
+# ================================================================
+@njit(fastmath=True)
+def compute_kinetic_energy(vel: 'double[:,:]', mass: float):
+    """ Compute the kinetic energy associated with the current configuration.
+    """
+    d_num, p_num = vel.shape
+
+    kinetic = 0.0
+    for k in range(d_num):
+        for j in range(p_num):
+            kinetic = kinetic + vel[k, j] ** 2
+
+    return 0.5 * mass * kinetic
+
+# ================================================================
+@njit(fastmath=True)
+def bin_particles(cutoff: float, pos: 'double[:,:]', lower: 'double[:]', n_cells: 'int[:]',
+                  cell_index: 'int[:]', cell_particles: 'int[:]'):
+    """
+    Sort the particles into cubic cells whose side is the cutoff radius.
+
+    The cells cover the bounding box of the particles. The particles in cell c
+    are cell_particles[cell_start[c]:cell_start[c+1]].
+
+    Returns
+    -------
+    cell_start : array of int
+        The index of the first particle of each cell in cell_particles.
+    """
+    (d_num, p_num) = pos.shape
+
+    #  Compute the bounding box.
+    for k in range(d_num):
+        lower[k] = pos[k, 0]
+        upper = pos[k, 0]
+        for i in range(p_num):
+            lower[k] = min(lower[k], pos[k, i])
+            upper = max(upper, pos[k, i])
+        n_cells[k] = int((upper - lower[k]) / cutoff) + 1
+
+    total_cells = n_cells[0] * n_cells[1] * n_cells[2]
+
+    #  Count the particles in each cell.
+    cell_start = zeros(total_cells + 1, dtype='int')
+    for i in range(p_num):
+        cx = int((pos[0, i] - lower[0]) / cutoff)
+        cy = int((pos[1, i] - lower[1]) / cutoff)
+        cz = int((pos[2, i] - lower[2]) / cutoff)
+        cell_index[i] = cx + n_cells[0] * (cy + n_cells[1] * cz)
+        cell_start[cell_index[i] + 1] += 1
+
+    for c in range(total_cells):
+        cell_start[c + 1] += cell_start[c]
+
+    #  Sort the particles by cell.
+    filled = zeros(total_cells, dtype='int')
+    for i in range(p_num):
+        c = cell_index[i]
+        cell_particles[cell_start[c] + filled[c]] = i
+        filled[c] += 1
+
+    return cell_start
+
+# ================================================================
+@njit(fastmath=True)
+def compute(mass: float, cutoff: float, pos: 'double[:,:]', vel: 'double[:,:]',
+        force: 'double[:,:]', cell_index: 'int[:]', cell_particles: 'int[:]'):
+    """
+    Calculate the potential energy and forces associated with the
+    current configuration.
+
+    Each cell only interacts with itself and with the 13 neighbouring cells
+    which follow it, so each pair of particles is evaluated once and the
+    force is applied to both particles.
+    """
+
+    (d_num, p_num) = pos.shape
+    lower = zeros(d_num)
+    n_cells = zeros(d_num, dtype='int')
+
+    cell_start = bin_particles(cutoff, pos, lower, n_cells, cell_index, cell_particles)
+
+    #  Pairs beyond the cutoff radius each contribute 1 to the potential energy.
+    potential = 0.5 * p_num * (p_num - 1)
+    force[:, :] = 0.0
+    cutoff2 = cutoff * cutoff
+
+    for cz in range(n_cells[2]):
+        for cy in range(n_cells[1]):
+            for cx in range(n_cells[0]):
+                c = cx + n_cells[0] * (cy + n_cells[1] * cz)
+                for dz in range(-1, 2):
+                    for dy in range(-1, 2):
+                        for dx in range(-1, 2):
+                            forward = dz > 0 or (dz == 0 and (dy > 0 or (dy == 0 and dx >= 0)))
+                            nx = cx + dx
+                            ny = cy + dy
+                            nz = cz + dz
+                            if (forward and nx >= 0 and nx < n_cells[0] and ny >= 0 and ny < n_cells[1]
+                                        and nz >= 0 and nz < n_cells[2]):
+                                nc = nx + n_cells[0] * (ny + n_cells[1] * nz)
+                                for a in range(cell_start[c], cell_start[c + 1]):
+                                    i = cell_particles[a]
+                                    if nc == c:
+                                        b_start = a + 1
+                                    else:
+                                        b_start = cell_start[nc]
+                                    for b in range(b_start, cell_start[nc + 1]):
+                                        j = cell_particles[b]
+
+                                        #  Compute RIJ, the displacement vector.
+                                        rx = pos[0, i] - pos[0, j]
+                                        ry = pos[1, i] - pos[1, j]
+                                        rz = pos[2, i] - pos[2, j]
+
+                                        d2 = rx * rx + ry * ry + rz * rz
+                                        if d2 < cutoff2:
+                                            d = sqrt(d2)
+                                            s = sin(d)
+                                            potential = potential + s * s - 1.0
+
+                                            #  Apply the force to both particles.
+                                            f = sin(2.0 * d) / d
+                                            force[0, i] = force[0, i] - rx * f
+                                            force[1, i] = force[1, i] - ry * f
+                                            force[2, i] = force[2, i] - rz * f
+                                            force[0, j] = force[0, j] + rx * f
+                                            force[1, j] = force[1, j] + ry * f
+                                            force[2, j] = force[2, j] + rz * f
+
+    return potential
+
+# ================================================================
+@njit(fastmath=True)
+def update(dt: float, mass: float, force: 'double[:,:]',
+           pos: 'double[:,:]', vel: 'double[:,:]', acc: 'double[:,:]'):
+
+    """ Update the position, velocity and acceleration of the particles
+    """
+
+    rmass = 1.0 / mass
+    #
+    #  Update positions.
+    #
+    pos += vel * dt + 0.5 * acc * dt * dt
+    #
+    #  Update velocities.
+    #
+    vel += 0.5 * dt * ( force * rmass + acc )
+    #
+    #  Update accelerations.
+    #
+    acc[:] = force * rmass
+
+# ================================================================
+@njit(fastmath=True)
+def r8mat_uniform_ab(r: 'double[:, :]', a: float, b: float, seed: int):
+    """ Fill r with random numbers with a uniform distribution
+    """
+
+    (m, n) = r.shape
+    i4_huge = 2147483647
+
+    if seed <= 0:
+        seed += i4_huge
+
+    elif seed > 0:
+
+        for j in range(n):
+            for i in range(m):
+
+                k = seed // 127773
+                seed = 16807 * (seed - k * 127773) - k * 2836
+                seed = seed % i4_huge
+
+                if seed <= 0:
+                    seed += i4_huge
+
+                r[i, j] = a + (b - a) * seed * 4.656612875E-10
+
+    return seed
+
+# ================================================================
+@njit(fastmath=True)
+def initialize(pos: 'double[:,:]', box_size: float):
+    """ Initialise the positions of the particles
+    """
+    #  Positions.
+    seed = 123456789
+    seed = r8mat_uniform_ab(pos, 0.0, box_size, seed)
+
+# ================================================================
+@njit(fastmath=True)
+def md_cells(p_num: int, step_num: int, dt: float):
+    """
+    Run a molecular dynamics simulation. This consists of an N-body
+    problem in 3D, where N identical particles of unit mass
+    interact through a potential truncated at a cutoff radius and
+    accelerate according to Newton's 2nd law of motion.
+
+    The particles are initially distributed in a cube with a density of
+    one particle per unit volume.
+
+    Parameters
+    ----------
+    p_num : int
+        Number of particles.
+
+    step_num : int
+        Number of time steps to be taken.
+
+    dt : float
+        Time step size.
+
+    Returns
+    -------
+    potential : float
+        Total potential energy of the system.
+
+    kinetic : float
+        Total kinetic energy of the system.
+
+    """
+
+    # Set particles' mass
+    mass = 1.0
+    d_num = 3
+
+    # The potential is constant beyond pi/2
+    cutoff = pi / 2.0
+    box_size = p_num ** (1.0 / 3.0)
+
+    # Allocate work arrays
+    pos   = zeros((d_num, p_num))  # positions
+    vel   = zeros((d_num, p_num))  # velocities
+    acc   = zeros((d_num, p_num))  # accelerations
+    force = zeros((d_num, p_num))  # forces
+    cell_index     = zeros(p_num, dtype='int') # cell containing each particle
+    cell_particles = zeros(p_num, dtype='int') # particles sorted by cell
+
+    # Initialization
+    initialize(pos, box_size)
+    potential = compute(mass, cutoff, pos, vel, force, cell_index, cell_particles)
+
+    # Time stepping
+    for _ in range(step_num):
+        update(dt, mass, force, pos, vel, acc)
+        potential = compute(mass, cutoff, pos, vel, force, cell_index, cell_particles)
+
+    # Compute total kinetic energy at final time
+    kinetic = compute_kinetic_energy(vel, mass)
+
+    # Return total potential and kinetic energies
+    return potential, kinetic
@@ -0,0 +1,387 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Functions for solving systems of ordinary differential equations with several explicit
+methods. The code is adapted from examples written by [J. Burkardt](https://people.sc.fsu.edu/~jburkardt/py_src/py_src.html)
+To be accelerated with numba
+"""
+from numpy import zeros
+from numpy import linspace
+from numpy import exp
+from numba import njit
+
+# ================================================================
+@njit(fastmath=True)
+def euler (dydt: '()(float, float[:], float[:])',
+           tspan: 'float[:]', y0: 'float[:]', n: int,
+           t: 'float[:]', y: 'float[:,:]'):
+
+    t0 = tspan[0]
+    t1 = tspan[1]
+    dt = ( t1 - t0 ) / float ( n )
+    y[0] = y0[:]
+
+    for i in range ( n ):
+        dydt ( t[i], y[i,:], y[i+1,:] )
+        y[i+1,:] = y[i,:] + dt * y[i+1,:]
+
+# ================================================================
+@njit(fastmath=True)
+def midpoint_explicit (dydt: '()(float, float[:], float[:])',
+                       tspan: 'float[:]', y0: 'float[:]', n: int,
+                       t: 'float[:]', y: 'float[:,:]'):
+
+    m = len( y0 )
+    ym = zeros(m)
+
+    dt = ( tspan[1] - tspan[0] ) / float ( n )
+
+    t[0] = tspan[0]
+    y[0,:] = y0[:]
+
+    for i in range ( 0, n ):
+
+        tm = t[i]   + 0.5 * dt
+        dydt ( t[i], y[i,:], ym[:] )
+        ym[:] = y[i,:] + 0.5 * dt * ym[:]
+
+        t[i+1]   = t[i]   + dt
+        dydt ( tm, ym[:], y[i+1,:] )
+        y[i+1,:] = y[i,:] + dt * y[i+1,:]
+
+# ================================================================
+@njit(fastmath=True)
+def midpoint_fixed (dydt: '()(float, float[:], float[:])',
+                    tspan: 'float[:]', y0: 'float[:]', n: int,
+                    t: 'float[:]', y: 'float[:,:]'):
+
+    m = len( y0 )
+    y1m = zeros(m)
+    y2m = zeros(m)
+
+    dt = ( tspan[1] - tspan[0] ) / float ( n )
+
+    it_max = 10
+    theta = 0.5
+
+    t[0] = tspan[0];
+    y[0,:] = y0
+
+    for i in range ( 0, n ):
+
+        xm = t[i] + theta * dt
+
+        y1m[:] = y[i,:]
+        for j in range ( 0, it_max ):
+            dydt ( xm, y1m[:], y2m[:] )
+            y1m[:] = y[i,:] + theta * dt * y2m[:]
+
+        t[i+1] = t[i] + dt
+        y[i+1,:] = (       1.0 / theta ) * y1m[:] \
+                 + ( 1.0 - 1.0 / theta ) * y[i,:]
+
+# ================================================================
+@njit(fastmath=True)
+def leapfrog (dydt: '()(float, float[:], float[:])',
+              tspan: 'float[:]', y0: 'float[:]', n: int,
+              t: 'float[:]', y: 'float[:,:]'):
+
+    # The first half of y contains the positions and the second half
+    # contains the velocities. The accelerations are read from the second
+    # half of the derivative, which may only depend on the positions.
+    m = len( y0 )
+    h = m // 2
+    aold = zeros(m)
+    anew = zeros(m)
+
+    t0 = tspan[0]
+    tstop = tspan[1]
+    dt = ( tstop - t0 ) / n
+
+    for i in range ( 0, n + 1 ):
+
+        if ( i == 0 ):
+            t[0]   = t0
+            y[0,:] = y0[:]
+            dydt ( t[i], y[i,:], anew )
+
+        else:
+            t[i]   = t[i-1] + dt
+            aold[:] = anew[:]
+            for k in range ( h ):
+                y[i,k] = y[i-1,k] + dt * ( y[i-1,h+k] + 0.5 * dt * aold[h+k] )
+            dydt ( t[i], y[i,:], anew )
+            for k in range ( h ):
+                y[i,h+k] = y[i-1,h+k] + 0.5 * dt * ( aold[h+k] + anew[h+k] )
+
+# ================================================================
+@njit(fastmath=True)
+def rk4 (dydt: '()(float, float[:], float[:])',
+         tspan: 'float[:]', y0: 'float[:]', n: int,
+         t: 'float[:]', y: 'float[:,:]'):
+
+    m = len( y0 )
+    f1 = zeros(m)
+    f2 = zeros(m)
+    f3 = zeros(m)
+    f4 = zeros(m)
+
+    tfirst = tspan[0]
+    tlast = tspan[1]
+    dt = ( tlast - tfirst ) / n
+
+    t[0] = tspan[0]
+    y[0,:] = y0[:]
+
+    for i in range ( 0, n ):
+
+        dydt ( t[i],            y[i,:], f1[:] )
+        dydt ( t[i] + dt / 2.0, y[i,:] + dt * f1[:] / 2.0, f2[:] )
+        dydt ( t[i] + dt / 2.0, y[i,:] + dt * f2[:] / 2.0, f3[:] )
+        dydt ( t[i] + dt,       y[i,:] + dt * f3[:], f4[:] )
+
+        t[i+1] = t[i] + dt
+        y[i+1,:] = y[i,:] + dt * ( f1[:] + 2.0 * f2[:] + 2.0 * f3[:] + f4[:] ) / 6.0
+
+# ================================================================
+@njit(fastmath=True)
+def humps_fun ( x : float ):
+
+        y = 1.0 / ( ( x - 0.3 )**2 + 0.01 ) \
+                + 1.0 / ( ( x - 0.9 )**2 + 0.04 ) \
+                - 6.0
+
+        return y
+
+# ================================================================
+@njit(fastmath=True)
+def humps_deriv ( x: 'float', y: 'float[:]', out: 'float[:]' ):
+
+    out[0] = - 2.0 * ( x - 0.3 ) / ( ( x - 0.3 )**2 + 0.01 )**2 - 2.0 * ( x - 0.9 ) / ( ( x - 0.9 )**2 + 0.04 )**2
+
+# ================================================================
+@njit(fastmath=True)
+def predator_prey_deriv ( t: 'float', rf: 'float[:]', out: 'float[:]' ):
+
+    r = rf[0]
+    f = rf[1]
+
+    drdt =    2.0 * r - 0.001 * r * f
+    dfdt = - 10.0 * f + 0.002 * r * f
+
+    out[0] = drdt
+    out[1] = dfdt
+
+# ================================================================
+@njit(fastmath=True)
+def shm_deriv ( x: 'float', y: 'float[:]', out: 'float[:]' ):
+
+    out[0] =   y[1]
+    out[1] = - y[0]
+
+# ================================================================
+@njit(fastmath=True)
+def chain_deriv ( t: 'float', y: 'float[:]', out: 'float[:]' ):
+
+    # Chain of unit masses linked by unit springs, with both ends fixed.
+    # The first half of y contains the positions and the second half
+    # contains the velocities.
+    m = len ( y )
+    h = m // 2
+
+    for k in range ( h ):
+        out[k] = y[h+k]
+
+    out[h] = y[1] - 2.0 * y[0]
+    for k in range ( 1, h - 1 ):
+        out[h+k] = y[k-1] - 2.0 * y[k] + y[k+1]
+    out[m-1] = y[h-2] - 2.0 * y[h-1]
+
+# ================================================================
+@njit(fastmath=True)
+def chain_energy ( y: 'float[:,:]', i: int ):
+
+    # Energy of the chain at the time step i
+    m = y.shape[1]
+    h = m // 2
+
+    e = 0.5 * y[i,0]**2 + 0.5 * y[i,h-1]**2
+    for k in range ( h ):
+        e += 0.5 * y[i,h+k]**2
+    for k in range ( h - 1 ):
+        e += 0.5 * ( y[i,k+1] - y[i,k] )**2
+
+    return e
+
+# ================================================================
+@njit(fastmath=True)
+def chain_init ( y0: 'float[:]' ):
+
+    # Narrow Gaussian displacement of the masses around the middle of the
+    # chain which excites all the modes, from the slowest to the fastest
+    m = len ( y0 )
+    h = m // 2
+    w = 2.0
+
+    for k in range ( h ):
+        y0[k] = exp ( - ( ( k - 0.5 * h ) / w )**2 )
+        y0[h+k] = 0.0
+
+# ================================================================
+@njit(fastmath=True)
+def euler_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
+
+
+    m = len ( y0 )
+
+    t0 = tspan[0]
+    t1 = tspan[1]
+
+    t = linspace ( t0, t1, n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    euler ( humps_deriv, tspan, y0, n, t, y )
+
+    return t, y
+
+# ================================================================
+@njit(fastmath=True)
+def midpoint_explicit_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
+
+    m = len ( y0 )
+
+    t0 = tspan[0]
+    t1 = tspan[1]
+
+    t = linspace ( t0, t1, n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    midpoint_explicit ( humps_deriv, tspan, y0, n, t, y )
+
+    return t, y
+
+# ================================================================
+@njit(fastmath=True)
+def midpoint_explicit_predator_prey_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
+
+    m = len ( y0 )
+
+    t = zeros ( n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    midpoint_explicit ( predator_prey_deriv, tspan, y0, n, t, y )
+
+    return t, y
+
+# ================================================================
+@njit(fastmath=True)
+def midpoint_fixed_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
+
+    m = len ( y0 )
+
+    t0 = tspan[0]
+    t1 = tspan[1]
+
+    t = linspace ( t0, t1, n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    midpoint_fixed ( humps_deriv, tspan, y0, n, t, y )
+
+    return t, y
+
+# ================================================================
+@njit(fastmath=True)
+def midpoint_fixed_predator_prey_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
+
+    m = len ( y0 )
+
+    t = zeros ( n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    midpoint_fixed ( predator_prey_deriv, tspan, y0, n, t, y )
+
+    return t, y
+
+# ================================================================
+@njit(fastmath=True)
+def leapfrog_shm_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
+
+    m = len ( y0 )
+
+    t = zeros ( n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    leapfrog ( shm_deriv, tspan, y0, n, t, y )
+
+    return t, y
+
+# ================================================================
+@njit(fastmath=True)
+def rk4_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
+
+    m = len ( y0 )
+
+    t = zeros ( n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    rk4 ( humps_deriv, tspan, y0, n, t, y )
+
+    return t, y
+
+# ================================================================
+@njit(fastmath=True)
+def rk4_predator_prey_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
+
+    m = len ( y0 )
+
+    t = zeros ( n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    rk4 ( predator_prey_deriv, tspan, y0, n, t, y )
+
+    return t, y
+
+# ================================================================
+@njit(fastmath=True)
+def rk4_chain_test ( nm: int, t1: float, n: int ):
+
+    m = 2 * nm
+
+    tspan = zeros ( 2 )
+    tspan[1] = t1
+    y0 = zeros ( m )
+    chain_init ( y0 )
+
+    t = zeros ( n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    rk4 ( chain_deriv, tspan, y0, n, t, y )
+
+    # Energy drift
+    err = chain_energy ( y, n ) - chain_energy ( y, 0 )
+
+    return err
+
+# ================================================================
+@njit(fastmath=True)
+def leapfrog_chain_test ( nm: int, t1: float, n: int ):
+
+    m = 2 * nm
+
+    tspan = zeros ( 2 )
+    tspan[1] = t1
+    y0 = zeros ( m )
+    chain_init ( y0 )
+
+    t = zeros ( n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    leapfrog ( chain_deriv, tspan, y0, n, t, y )
+
+    # Energy drift
+    err = chain_energy ( y, n ) - chain_energy ( y, 0 )
+
+    return err
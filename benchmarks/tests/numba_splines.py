@@ -52,6 +52,60 @@ class Spline:
             for j in range(self.degree+1):
                 y[i] += self._coeffs[span-self.degree+j]*basis[j]
 
+    def _basis_funcs_block(self, x: 'const float[:]', start: int, npts: int, spans: 'const int[:]',
+                           values: 'float[:,:]', left: 'float[:,:]', right: 'float[:,:]'):
+        """ Compute non-zero basis functions at the points x[start:start+npts]
+        following Algorithm A2.2 from the NURBS book [1]. The loops over the
+        points are the innermost loops. """
+        for p in range(npts):
+            values[p, 0] = 1.0
+
+        for j in range(0, self.degree):
+            for p in range(npts):
+                left[p, j] = x[start+p] - self._knots[spans[p]-j]
+                right[p, j] = self._knots[spans[p]+1+j] - x[start+p]
+                # values[p, j+1] holds the saved value until the end of the iteration
+                values[p, j+1] = 0.0
+
+            for r in range(0, j+1):
+                for p in range(npts):
+                    temp = values[p, r] / (right[p, r] + left[p, j-r])
+                    values[p, r] = values[p, j+1] + right[p, r] * temp
+                    values[p, j+1] = left[p, j-r] * temp
+
+    def eval_sorted(self, x : 'const float[:]', y : 'float[:]'):
+        """ Evaluate spline at points sorted in increasing order: sum_i N_i(x) * c_i.
+
+        The spans are found with a single sweep over the knots and the basis
+        functions are computed for blocks of points in preallocated workspaces.
+        """
+        npts = x.shape[0]
+        block = 256
+        spans = np.empty(block, dtype='int')
+        basis = np.empty((block, self.degree+1))
+        left = np.empty((block, self.degree))
+        right = np.empty((block, self.degree))
+
+        span = self.degree
+        high = len(self._knots)-1-self.degree
+
+        for start in range(0, npts, block):
+            n = min(block, npts-start)
+
+            # Find the spans by advancing through the knots
+            for p in range(n):
+                while span < high-1 and x[start+p] >= self._knots[span+1]:
+                    span += 1
+                spans[p] = span
+
+            self._basis_funcs_block(x, start, n, spans, basis, left, right)
+
+            # Evaluate the spline at the points of the block
+            for p in range(n):
+                y[start+p] = 0.0
+                for j in range(self.degree+1):
+                    y[start+p] += self._coeffs[spans[p]-self.degree+j]*basis[p, j]
+
     def _find_span(self, x: float) -> int:
         # Knot index at left/right boundary
         low = self.degree
@@ -77,3 +131,105 @@ class Spline:
 
         return returnVal
 
+spec2d = [
+    ('_spline1', Spline.class_type.instance_type),
+    ('_spline2', Spline.class_type.instance_type),
+    ('_coeffs', float64[:,:]),
+]
+
+@jitclass(spec2d)
+class Spline2D:
+    """ A tensor-product spline in 2D. The basis along each axis is described
+    by a 1D spline whose coefficients are not used. """
+    def __init__(self, spline1 : Spline, spline2 : Spline, coeffs : 'float[:,:]'):
+        self._spline1 = spline1
+        self._spline2 = spline2
+        self._coeffs = coeffs
+
+    @property
+    def degree1(self):
+        return self._spline1.degree
+
+    @property
+    def degree2(self):
+        return self._spline2.degree
+
+    @property
+    def coeffs(self):
+        return self._coeffs
+
+    def eval(self, x1 : 'const float[:]', x2 : 'const float[:]', y : 'float[:]'):
+        """ Evaluate spline at non-zero basis elements: sum_ij N_i(x1) * N_j(x2) * c_ij.
+        """
+        d1 = self.degree1
+        d2 = self.degree2
+        basis1 = np.empty(d1+1)
+        basis2 = np.empty(d2+1)
+        for i in range(x1.shape[0]):
+            span1 = self._spline1._find_span(x1[i])
+            span2 = self._spline2._find_span(x2[i])
+            self._spline1._basis_funcs(x1[i], span1, basis1)
+            self._spline2._basis_funcs(x2[i], span2, basis2)
+
+            # Evaluate the spline at (x1[i], x2[i])
+            y[i] = 0.0
+            for j1 in range(d1+1):
+                for j2 in range(d2+1):
+                    y[i] += self._coeffs[span1-d1+j1, span2-d2+j2]*basis1[j1]*basis2[j2]
+
+spec3d = [
+    ('_spline1', Spline.class_type.instance_type),
+    ('_spline2', Spline.class_type.instance_type),
+    ('_spline3', Spline.class_type.instance_type),
+    ('_coeffs', float64[:,:,:]),
+]
+
+@jitclass(spec3d)
+class Spline3D:
+    """ A tensor-product spline in 3D. The basis along each axis is described
+    by a 1D spline whose coefficients are not used. """
+    def __init__(self, spline1 : Spline, spline2 : Spline, spline3 : Spline, coeffs : 'float[:,:,:]'):
+        self._spline1 = spline1
+        self._spline2 = spline2
+        self._spline3 = spline3
+        self._coeffs = coeffs
+
+    @property
+    def degree1(self):
+        return self._spline1.degree
+
+    @property
+    def degree2(self):
+        return self._spline2.degree
+
+    @property
+    def degree3(self):
+        return self._spline3.degree
+
+    @property
+    def coeffs(self):
+        return self._coeffs
+
+    def eval(self, x1 : 'const float[:]', x2 : 'const float[:]', x3 : 'const float[:]', y : 'float[:]'):
+        """ Evaluate spline at non-zero basis elements: sum_ijk N_i(x1) * N_j(x2) * N_k(x3) * c_ijk.
+        """
+        d1 = self.degree1
+        d2 = self.degree2
+        d3 = self.degree3
+        basis1 = np.empty(d1+1)
+        basis2 = np.empty(d2+1)
+        basis3 = np.empty(d3+1)
+        for i in range(x1.shape[0]):
+            span1 = self._spline1._find_span(x1[i])
+            span2 = self._spline2._find_span(x2[i])
+            span3 = self._spline3._find_span(x3[i])
+            self._spline1._basis_funcs(x1[i], span1, basis1)
+            self._spline2._basis_funcs(x2[i], span2, basis2)
+            self._spline3._basis_funcs(x3[i], span3, basis3)
+
+            # Evaluate the spline at (x1[i], x2[i], x3[i])
+            y[i] = 0.0
+            for j1 in range(d1+1):
+                for j2 in range(d2+1):
+                    for j3 in range(d3+1):
+                        y[i] += self._coeffs[span1-d1+j1, span2-d2+j2, span3-d3+j3]*basis1[j1]*basis2[j2]*basis3[j3]
@@ -0,0 +1,88 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Functions for evaluating a spline at many points in parallel with prange. The algorithm is
+the same as in Spline.eval (see splines.py) but the spline is described by its degree, its
+knots and its coefficients instead of a class.
+To be accelerated with numba
+"""
+
+from numba import njit, prange
+import numpy as np
+
+@njit(fastmath=True)
+def find_span(knots: 'float[:]', degree: int, x: float) -> int:
+    """ Find the index of the knot span containing x with a binary search.
+    """
+    # Knot index at left/right boundary
+    low = degree
+    high = len(knots)-1-degree
+
+    # Check if point is exactly on left/right boundary, or outside domain
+    if x <= knots[low]:
+        returnVal = low
+    elif x >= knots[high]:
+        returnVal = high-1
+    else:
+        # Perform binary search
+        span = (low+high)//2
+
+        while x < knots[span] or x >= knots[span+1]:
+            if x < knots[span]:
+                high = span
+            else:
+                low = span
+            span = (low+high)//2
+
+        returnVal = span
+
+    return returnVal
+
+@njit(fastmath=True)
+def basis_funcs(knots: 'float[:]', degree: int, x: float, span: int, row: int,
+                values: 'float[:,:]', left: 'float[:,:]', right: 'float[:,:]'):
+    """ Compute non-zero basis functions at x following Algorithm A2.2
+    from the NURBS book [1]. The values are saved in values[row] and
+    left[row] and right[row] are used as workspaces. """
+    values[row, 0] = 1.0
+
+    for j in range(0, degree):
+        left[row, j] = x - knots[span-j]
+        right[row, j] = knots[span+1+j] - x
+        saved = 0.0
+
+        for r in range(0, j+1):
+            temp = values[row, r] / (right[row, r] + left[row, j-r])
+            values[row, r] = saved + right[row, r] * temp
+            saved = left[row, j-r] * temp
+
+        values[row, j+1] = saved
+
+@njit(parallel=True, fastmath=True)
+def spline_eval_omp(degree: int, knots: 'float[:]', coeffs: 'float[:]', x: 'float[:]', y: 'float[:]'):
+    """ Evaluate spline at non-zero basis elements: sum_i N_i(x) * c_i.
+
+    The points are split into blocks which are shared between the threads.
+    Each block has its own row in the workspaces so no memory is written
+    by several threads.
+    """
+    npts = x.shape[0]
+    block = 256
+    nblocks = (npts + block - 1) // block
+    basis = np.empty((nblocks, degree+1))
+    left = np.empty((nblocks, degree))
+    right = np.empty((nblocks, degree))
+
+    for b in prange(nblocks):
+        for i in range(b*block, min((b+1)*block, npts)):
+            span = find_span(knots, degree, x[i])
+            basis_funcs(knots, degree, x[i], span, b, basis, left, right)
+
+            # Evaluate the spline at x[i]
+            s = 0.0
+            for j in range(degree+1):
+                s += coeffs[span-degree+j]*basis[b, j]
+            y[i] = s
@@ -0,0 +1,302 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Functions for solving an ensemble of independent ordinary differential equations with
+Euler's method, the explicit and implicit midpoint methods and the fourth order Runge-Kutta
+method. The state of all the members is stored in an array of shape (m, batch) so that the
+members are stepped together along the contiguous dimension.
+To be accelerated with pyccel or pythran
+"""
+import numpy as np
+
+# ================================================================
+def euler_batch(dydt: '()(float, float[:,:], float[:,:])',
+                tspan: 'float[:]', n: int, y: 'float[:,:]'):
+    """
+    Function implementing Euler's method. y contains the initial
+    state on entry and the final state on exit.
+    """
+
+    m, nb = y.shape
+    f1 = np.zeros((m, nb))
+
+    t = tspan[0]
+    dt = (tspan[1] - tspan[0]) / float(n)
+
+    for _ in range(n):
+        dydt(t, y, f1)
+        for k in range(m):
+            for b in range(nb):
+                y[k, b] = y[k, b] + dt * f1[k, b]
+        t = t + dt
+
+# ================================================================
+def midpoint_explicit_batch(dydt: '()(float, float[:,:], float[:,:])',
+                            tspan: 'float[:]', n: int, y: 'float[:,:]'):
+    """
+    Function implementing the explicit midpoint method. y contains
+    the initial state on entry and the final state on exit.
+    """
+
+    m, nb = y.shape
+    f1 = np.zeros((m, nb))
+    ym = np.zeros((m, nb))
+
+    t = tspan[0]
+    dt = (tspan[1] - tspan[0]) / float(n)
+
+    for _ in range(n):
+        dydt(t, y, f1)
+        for k in range(m):
+            for b in range(nb):
+                ym[k, b] = y[k, b] + 0.5 * dt * f1[k, b]
+
+        dydt(t + 0.5 * dt, ym, f1)
+        for k in range(m):
+            for b in range(nb):
+                y[k, b] = y[k, b] + dt * f1[k, b]
+        t = t + dt
+
+# ================================================================
+def midpoint_fixed_batch(dydt: '()(float, float[:,:], float[:,:])',
+                         tspan: 'float[:]', n: int, y: 'float[:,:]'):
+    """
+    Function implementing the implicit midpoint method for 10
+    iterations. y contains the initial state on entry and the final
+    state on exit.
+    """
+
+    m, nb = y.shape
+    y1m = np.zeros((m, nb))
+    y2m = np.zeros((m, nb))
+
+    t = tspan[0]
+    dt = (tspan[1] - tspan[0]) / float(n)
+
+    it_max = 10
+    theta = 0.5
+
+    for i in range(n):
+
+        xm = t + theta * dt
+
+        for k in range(m):
+            for b in range(nb):
+                y1m[k, b] = y[k, b]
+        for _ in range(it_max):
+            dydt(xm, y1m, y2m)
+            for k in range(m):
+                for b in range(nb):
+                    y1m[k, b] = y[k, b] + theta * dt * y2m[k, b]
+
+        for k in range(m):
+            for b in range(nb):
+                y[k, b] = (1.0 / theta) * y1m[k, b] + (1.0 - 1.0 / theta) * y[k, b]
+        t = t + dt
+
+# ================================================================
+def rk4_batch(dydt: '()(float, float[:,:], float[:,:])',
+              tspan: 'float[:]', n: int, y: 'float[:,:]'):
+    """
+    Function implementing a fourth order Runge-Kutta method. y
+    contains the initial state on entry and the final state on exit.
+    """
+
+    m, nb = y.shape
+    f1 = np.zeros((m, nb))
+    f2 = np.zeros((m, nb))
+    f3 = np.zeros((m, nb))
+    f4 = np.zeros((m, nb))
+    ys = np.zeros((m, nb))
+
+    t = tspan[0]
+    dt = (tspan[1] - tspan[0]) / float(n)
+
+    for _ in range(n):
+
+        dydt(t, y, f1)
+
+        for k in range(m):
+            for b in range(nb):
+                ys[k, b] = y[k, b] + 0.5 * dt * f1[k, b]
+        dydt(t + dt / 2.0, ys, f2)
+
+        for k in range(m):
+            for b in range(nb):
+                ys[k, b] = y[k, b] + 0.5 * dt * f2[k, b]
+        dydt(t + dt / 2.0, ys, f3)
+
+        for k in range(m):
+            for b in range(nb):
+                ys[k, b] = y[k, b] + dt * f3[k, b]
+        dydt(t + dt, ys, f4)
+
+        for k in range(m):
+            for b in range(nb):
+                y[k, b] = y[k, b] + dt * (f1[k, b] + 2.0 * f2[k, b] + 2.0 * f3[k, b] + f4[k, b]) / 6.0
+        t = t + dt
+
+# ================================================================
+def predator_prey_deriv(t: 'float', y: 'float[:,:]', out: 'float[:,:]'):
+    """
+    Derivative of the predator-prey (Lotka-Volterra) system for each
+    member of the ensemble
+    """
+
+    nb = y.shape[1]
+
+    for b in range(nb):
+        r = y[0, b]
+        f = y[1, b]
+        out[0, b] =    2.0 * r - 0.001 * r * f
+        out[1, b] = - 10.0 * f + 0.002 * r * f
+
+# ================================================================
+def predator_prey_init(y: 'float[:,:]'):
+    """
+    Initial populations of the members of the ensemble. The number of
+    preys varies between members.
+    """
+
+    nb = y.shape[1]
+
+    for b in range(nb):
+        y[0, b] = 5000.0 * (0.5 + b / nb)
+        y[1, b] = 100.0
+
+# ================================================================
+# pythran export euler_batch_test(int, float, int)
+def euler_batch_test(batch: int, dt: float, n: int):
+    """
+    Integrate an ensemble of predator-prey systems with different
+    initial conditions using Euler's method.
+
+    Parameters
+    ----------
+    batch : int
+        Number of members of the ensemble.
+
+    dt : float
+        Time step size.
+
+    n : int
+        Number of uniform time steps.
+
+    Returns
+    -------
+    y : numpy.ndarray[2, batch]
+        Populations of each member of the ensemble at the final time.
+
+    """
+
+    tspan = np.array([0., n * dt])
+    y = np.zeros((2, batch))
+    predator_prey_init(y)
+
+    euler_batch(predator_prey_deriv, tspan, n, y)
+
+    return y
+
+# ================================================================
+# pythran export midpoint_explicit_batch_test(int, float, int)
+def midpoint_explicit_batch_test(batch: int, dt: float, n: int):
+    """
+    Integrate an ensemble of predator-prey systems with different
+    initial conditions using the explicit midpoint method.
+
+    Parameters
+    ----------
+    batch : int
+        Number of members of the ensemble.
+
+    dt : float
+        Time step size.
+
+    n : int
+        Number of uniform time steps.
+
+    Returns
+    -------
+    y : numpy.ndarray[2, batch]
+        Populations of each member of the ensemble at the final time.
+
+    """
+
+    tspan = np.array([0., n * dt])
+    y = np.zeros((2, batch))
+    predator_prey_init(y)
+
+    midpoint_explicit_batch(predator_prey_deriv, tspan, n, y)
+
+    return y
+
+# ================================================================
+# pythran export midpoint_fixed_batch_test(int, float, int)
+def midpoint_fixed_batch_test(batch: int, dt: float, n: int):
+    """
+    Integrate an ensemble of predator-prey systems with different
+    initial conditions using the implicit midpoint method with a fixed
+    number of iterations.
+
+    Parameters
+    ----------
+    batch : int
+        Number of members of the ensemble.
+
+    dt : float
+        Time step size.
+
+    n : int
+        Number of uniform time steps.
+
+    Returns
+    -------
+    y : numpy.ndarray[2, batch]
+        Populations of each member of the ensemble at the final time.
+
+    """
+
+    tspan = np.array([0., n * dt])
+    y = np.zeros((2, batch))
+    predator_prey_init(y)
+
+    midpoint_fixed_batch(predator_prey_deriv, tspan, n, y)
+
+    return y
+
+# ================================================================
+# pythran export rk4_batch_test(int, float, int)
+def rk4_batch_test(batch: int, dt: float, n: int):
+    """
+    Integrate an ensemble of predator-prey systems with different
+    initial conditions using the classical 4th-order Runge-Kutta
+    method.
+
+    Parameters
+    ----------
+    batch : int
+        Number of members of the ensemble.
+
+    dt : float
+        Time step size.
+
+    n : int
+        Number of uniform time steps.
+
+    Returns
+    -------
+    y : numpy.ndarray[2, batch]
+        Populations of each member of the ensemble at the final time.
+
+    """
+
+    tspan = np.array([0., n * dt])
+    y = np.zeros((2, batch))
+    predator_prey_init(y)
+
+    rk4_batch(predator_prey_deriv, tspan, n, y)
+
+    return y
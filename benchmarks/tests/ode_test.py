@@ -1,10 +1,19 @@
-#! /usr/bin/env python3
-from typing import Final
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Functions for solving systems of ordinary differential equations with several explicit
+methods. The code is adapted from examples written by [J. Burkardt](https://people.sc.fsu.edu/~jburkardt/py_src/py_src.html)
+To be accelerated with pyccel or pythran
+"""
 from numpy import zeros
 from numpy import linspace
+from numpy import exp
 
 # ================================================================
-def euler (dydt: '()(float, Final[float[:]], float[:])',
+def euler (dydt: '()(float, float[:], float[:])',
            tspan: 'float[:]', y0: 'float[:]', n: int,
            t: 'float[:]', y: 'float[:,:]'):
 
@@ -18,7 +27,7 @@ def euler (dydt: '()(float, Final[float[:]], float[:])',
         y[i+1,:] = y[i,:] + dt * y[i+1,:]
 
 # ================================================================
-def midpoint_explicit (dydt: '()(float, Final[float[:]], float[:])',
+def midpoint_explicit (dydt: '()(float, float[:], float[:])',
                        tspan: 'float[:]', y0: 'float[:]', n: int,
                        t: 'float[:]', y: 'float[:,:]'):
 
@@ -41,7 +50,7 @@ def midpoint_explicit (dydt: '()(float, Final[float[:]], float[:])',
         y[i+1,:] = y[i,:] + dt * y[i+1,:]
 
 # ================================================================
-def midpoint_fixed (dydt: '()(float, Final[float[:]], float[:])',
+def midpoint_fixed (dydt: '()(float, float[:], float[:])',
                     tspan: 'float[:]', y0: 'float[:]', n: int,
                     t: 'float[:]', y: 'float[:,:]'):
 
@@ -71,12 +80,16 @@ def midpoint_fixed (dydt: '()(float, Final[float[:]], float[:])',
                  + ( 1.0 - 1.0 / theta ) * y[i,:]
 
 # ================================================================
-def leapfrog (dydt: '()(float, Final[float[:]], float[:])',
+def leapfrog (dydt: '()(float, float[:], float[:])',
               tspan: 'float[:]', y0: 'float[:]', n: int,
               t: 'float[:]', y: 'float[:,:]'):
 
-    # TODO len(y0) == 2
+    # The first half of y contains the positions and the second half
+    # contains the velocities. The accelerations are read from the second
+    # half of the derivative, which may only depend on the positions.
     m = len( y0 )
+    h = m // 2
+    aold = zeros(m)
     anew = zeros(m)
 
     t0 = tspan[0]
@@ -87,19 +100,20 @@ def leapfrog (dydt: '()(float, Final[float[:]], float[:])',
 
         if ( i == 0 ):
             t[0]   = t0
-            y[0,0] = y0[0]
-            y[0,1] = y0[1]
+            y[0,:] = y0[:]
             dydt ( t[i], y[i,:], anew )
 
         else:
             t[i]   = t[i-1] + dt
-            aold   = anew
-            y[i,0] = y[i-1,0] + dt * ( y[i-1,1] + 0.5 * dt * aold[1] )
+            aold[:] = anew[:]
+            for k in range ( h ):
+                y[i,k] = y[i-1,k] + dt * ( y[i-1,h+k] + 0.5 * dt * aold[h+k] )
             dydt ( t[i], y[i,:], anew )
-            y[i,1] = y[i-1,1] + 0.5 * dt * ( aold[1] + anew[1] )
+            for k in range ( h ):
+                y[i,h+k] = y[i-1,h+k] + 0.5 * dt * ( aold[h+k] + anew[h+k] )
 
 # ================================================================
-def rk4 (dydt: '()(float, Final[float[:]], float[:])',
+def rk4 (dydt: '()(float, float[:], float[:])',
          tspan: 'float[:]', y0: 'float[:]', n: int,
          t: 'float[:]', y: 'float[:,:]'):
 
@@ -159,6 +173,51 @@ def shm_deriv ( x: 'float', y: 'float[:]', out: 'float[:]' ):
     out[0] =   y[1]
     out[1] = - y[0]
 
+# ================================================================
+def chain_deriv ( t: 'float', y: 'float[:]', out: 'float[:]' ):
+
+    # Chain of unit masses linked by unit springs, with both ends fixed.
+    # The first half of y contains the positions and the second half
+    # contains the velocities.
+    m = len ( y )
+    h = m // 2
+
+    for k in range ( h ):
+        out[k] = y[h+k]
+
+    out[h] = y[1] - 2.0 * y[0]
+    for k in range ( 1, h - 1 ):
+        out[h+k] = y[k-1] - 2.0 * y[k] + y[k+1]
+    out[m-1] = y[h-2] - 2.0 * y[h-1]
+
+# ================================================================
+def chain_energy ( y: 'float[:,:]', i: int ):
+
+    # Energy of the chain at the time step i
+    m = y.shape[1]
+    h = m // 2
+
+    e = 0.5 * y[i,0]**2 + 0.5 * y[i,h-1]**2
+    for k in range ( h ):
+        e += 0.5 * y[i,h+k]**2
+    for k in range ( h - 1 ):
+        e += 0.5 * ( y[i,k+1] - y[i,k] )**2
+
+    return e
+
+# ================================================================
+def chain_init ( y0: 'float[:]' ):
+
+    # Narrow Gaussian displacement of the masses around the middle of the
+    # chain which excites all the modes, from the slowest to the fastest
+    m = len ( y0 )
+    h = m // 2
+    w = 2.0
+
+    for k in range ( h ):
+        y0[k] = exp ( - ( ( k - 0.5 * h ) / w )**2 )
+        y0[h+k] = 0.0
+
 # ================================================================
 # pythran export euler_humps_test(float[:],float[:],int)
 def euler_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
@@ -170,10 +229,12 @@ def euler_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
     t1 = tspan[1]
 
     t = linspace ( t0, t1, n + 1 )
-    y = zeros ( [ n + 1, m ] )
+    y = zeros ( ( n + 1, m ) )
 
     euler ( humps_deriv, tspan, y0, n, t, y )
 
+    return t, y
+
 # ================================================================
 # pythran export midpoint_explicit_humps_test(float[:],float[:],int)
 def midpoint_explicit_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
@@ -184,10 +245,12 @@ def midpoint_explicit_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
     t1 = tspan[1]
 
     t = linspace ( t0, t1, n + 1 )
-    y = zeros ( [ n + 1, m ] )
+    y = zeros ( ( n + 1, m ) )
 
     midpoint_explicit ( humps_deriv, tspan, y0, n, t, y )
 
+    return t, y
+
 # ================================================================
 # pythran export midpoint_explicit_predator_prey_test(float[:],float[:],int)
 def midpoint_explicit_predator_prey_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
@@ -195,10 +258,12 @@ def midpoint_explicit_predator_prey_test ( tspan: 'float[:]', y0: 'float[:]', n:
     m = len ( y0 )
 
     t = zeros ( n + 1 )
-    y = zeros ( [ n + 1, m ] )
+    y = zeros ( ( n + 1, m ) )
 
     midpoint_explicit ( predator_prey_deriv, tspan, y0, n, t, y )
 
+    return t, y
+
 # ================================================================
 # pythran export midpoint_fixed_humps_test(float[:],float[:],int)
 def midpoint_fixed_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
@@ -209,10 +274,12 @@ def midpoint_fixed_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
     t1 = tspan[1]
 
     t = linspace ( t0, t1, n + 1 )
-    y = zeros ( [ n + 1, m ] )
+    y = zeros ( ( n + 1, m ) )
 
     midpoint_fixed ( humps_deriv, tspan, y0, n, t, y )
 
+    return t, y
+
 # ================================================================
 # pythran export midpoint_fixed_predator_prey_test(float[:],float[:],int)
 def midpoint_fixed_predator_prey_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
@@ -220,20 +287,25 @@ def midpoint_fixed_predator_prey_test ( tspan: 'float[:]', y0: 'float[:]', n: in
     m = len ( y0 )
 
     t = zeros ( n + 1 )
-    y = zeros ( [ n + 1, m ] )
+    y = zeros ( ( n + 1, m ) )
 
     midpoint_fixed ( predator_prey_deriv, tspan, y0, n, t, y )
 
+    return t, y
+
 # ================================================================
+# pythran export leapfrog_shm_test(float[:],float[:],int)
 def leapfrog_shm_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
 
     m = len ( y0 )
 
     t = zeros ( n + 1 )
-    y = zeros ( [ n + 1, m ] )
+    y = zeros ( ( n + 1, m ) )
 
     leapfrog ( shm_deriv, tspan, y0, n, t, y )
 
+    return t, y
+
 # ================================================================
 # pythran export rk4_humps_test(float[:],float[:],int)
 def rk4_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
@@ -241,10 +313,12 @@ def rk4_humps_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
     m = len ( y0 )
 
     t = zeros ( n + 1 )
-    y = zeros ( [ n + 1, m ] )
+    y = zeros ( ( n + 1, m ) )
 
     rk4 ( humps_deriv, tspan, y0, n, t, y )
 
+    return t, y
+
 # ================================================================
 # pythran export rk4_predator_prey_test(float[:],float[:],int)
 def rk4_predator_prey_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
@@ -252,6 +326,50 @@ def rk4_predator_prey_test ( tspan: 'float[:]', y0: 'float[:]', n: int ):
     m = len ( y0 )
 
     t = zeros ( n + 1 )
-    y = zeros ( [ n + 1, m ] )
+    y = zeros ( ( n + 1, m ) )
 
     rk4 ( predator_prey_deriv, tspan, y0, n, t, y )
+
+    return t, y
+
+# ================================================================
+# pythran export rk4_chain_test(int,float,int)
+def rk4_chain_test ( nm: int, t1: float, n: int ):
+
+    m = 2 * nm
+
+    tspan = zeros ( 2 )
+    tspan[1] = t1
+    y0 = zeros ( m )
+    chain_init ( y0 )
+
+    t = zeros ( n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    rk4 ( chain_deriv, tspan, y0, n, t, y )
+
+    # Energy drift
+    err = chain_energy ( y, n ) - chain_energy ( y, 0 )
+
+    return err
+
+# ================================================================
+# pythran export leapfrog_chain_test(int,float,int)
+def leapfrog_chain_test ( nm: int, t1: float, n: int ):
+
+    m = 2 * nm
+
+    tspan = zeros ( 2 )
+    tspan[1] = t1
+    y0 = zeros ( m )
+    chain_init ( y0 )
+
+    t = zeros ( n + 1 )
+    y = zeros ( ( n + 1, m ) )
+
+    leapfrog ( chain_deriv, tspan, y0, n, t, y )
+
+    # Energy drift
+    err = chain_energy ( y, n ) - chain_energy ( y, 0 )
+
+    return err
@@ -0,0 +1,175 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Functions for solving a Poisson equation with a geometric multigrid method.
+To be accelerated with pyccel or pythran
+"""
+
+import numpy as np
+
+
+def smooth(u: 'float[:,:]', f: 'float[:,:]', h: float, nsweeps: int):
+    """
+    Carry out red-black Gauss-Seidel sweeps on the discrete Poisson equation
+    -(u[j-1,i] + u[j+1,i] + u[j,i-1] + u[j,i+1] - 4 u[j,i]) / h**2 = f[j,i].
+    """
+    n = u.shape[0]
+    for _ in range(nsweeps):
+        for color in range(2):
+            for j in range(1, n-1):
+                # Only update the points where (i + j) % 2 == color
+                for i in range(1 + (1 + j + color) % 2, n-1, 2):
+                    u[j, i] = 0.25 * (u[j, i-1] + u[j, i+1] + u[j-1, i] + u[j+1, i] + h**2 * f[j, i])
+
+
+def residual(u: 'float[:,:]', f: 'float[:,:]', h: float, r: 'float[:,:]'):
+    """
+    Compute the residual r = f + laplacian(u) at the interior points and
+    return its L2 norm.
+    """
+    n = u.shape[0]
+    norm = 0.0
+    for j in range(1, n-1):
+        for i in range(1, n-1):
+            r[j, i] = f[j, i] + (u[j, i-1] + u[j, i+1] + u[j-1, i] + u[j+1, i] - 4 * u[j, i]) / h**2
+            norm += r[j, i]**2
+    return np.sqrt(norm)
+
+
+def restrict(r: 'float[:,:]', rc: 'float[:,:]'):
+    """
+    Restrict a fine grid function to the coarse grid using full weighting.
+    """
+    nc = rc.shape[0]
+    for jc in range(1, nc-1):
+        for ic in range(1, nc-1):
+            j = 2 * jc
+            i = 2 * ic
+            rc[jc, ic] = (4 * r[j, i] +
+                          2 * (r[j, i-1] + r[j, i+1] + r[j-1, i] + r[j+1, i]) +
+                          r[j-1, i-1] + r[j-1, i+1] + r[j+1, i-1] + r[j+1, i+1]) / 16
+
+
+def prolong_add(ec: 'float[:,:]', u: 'float[:,:]'):
+    """
+    Interpolate a coarse grid correction bilinearly and add it to the fine grid function.
+    """
+    nc = ec.shape[0]
+    for jc in range(nc-1):
+        for ic in range(nc-1):
+            j = 2 * jc
+            i = 2 * ic
+            u[j, i]     += ec[jc, ic]
+            u[j, i+1]   += 0.5 * (ec[jc, ic] + ec[jc, ic+1])
+            u[j+1, i]   += 0.5 * (ec[jc, ic] + ec[jc+1, ic])
+            u[j+1, i+1] += 0.25 * (ec[jc, ic] + ec[jc, ic+1] + ec[jc+1, ic] + ec[jc+1, ic+1])
+
+
+def v_cycle(u: 'float[:,:]', f: 'float[:,:]', h: float, nu1: int, nu2: int) -> int:
+    """
+    Carry out one V-cycle on a grid with 2**k+1 points in each direction.
+    The solution is updated in place. The number of levels is returned.
+    """
+    n = u.shape[0]
+
+    # Solve exactly on the coarsest grid which has a single interior point
+    if n <= 3:
+        u[1, 1] = 0.25 * (u[1, 0] + u[1, 2] + u[0, 1] + u[2, 1] + h**2 * f[1, 1])
+        return 1
+
+    # Pre-smoothing
+    smooth(u, f, h, nu1)
+
+    # Restrict the residual to the coarse grid
+    r = np.zeros((n, n))
+    residual(u, f, h, r)
+    nc = (n - 1) // 2 + 1
+    rc = np.zeros((nc, nc))
+    restrict(r, rc)
+
+    # Solve the error equation on the coarse grid and correct the solution
+    ec = np.zeros((nc, nc))
+    levels = v_cycle(ec, rc, 2 * h, nu1, nu2)
+    prolong_add(ec, u)
+
+    # Post-smoothing
+    smooth(u, f, h, nu2)
+
+    return levels + 1
+
+
+# pythran export poisson_2d_mg(int, float, int)
+def poisson_2d_mg(n: int, rtol: float, maxiter: int):
+    """
+    Solve the 2D poisson equation -laplacian(phi) = f on the unit square
+    [0, 1] * [0, 1] with the source term
+
+        f(x, y) = 2 pi**2 sin(pi x) sin(pi y),
+
+    and subject to the boundary conditions phi = 0 on all boundaries. The
+    exact solution is phi(x, y) = sin(pi x) sin(pi y).
+
+    The numerical solution is computed on a uniform grid using 2nd
+    order finite differences and V-cycles of a geometric multigrid
+    method with a prescribed relative tolerance. Each V-cycle uses 2
+    red-black Gauss-Seidel sweeps before and after the coarse grid
+    correction, full weighting restriction and bilinear prolongation.
+
+    Parameters
+    ----------
+    n : int
+        Number of grid points along each axis. This should be 2**k+1.
+
+    rtol : float
+        Stopping condition for the multigrid method: the L2 norm of the
+        residual relative to the L2 norm of the source term should be
+        lower than the value provided.
+
+    maxiter : int
+        Maximum number of V-cycles allowed.
+
+    Returns
+    -------
+    x : numpy.ndarray[n]
+        Computational grid along x axis.
+
+    y : numpy.ndarray[n]
+        Computational grid along y axis.
+
+    phi : numpy.ndarray[n, n]
+        Numerical solution on the computational grid.
+
+    niter : int
+        Number of V-cycles performed.
+    """
+
+    # Computational grid
+    h = 1. / (n - 1)
+    x = np.linspace(0., 1., n)
+    y = np.linspace(0., 1., n)
+
+    # Source term
+    f = np.zeros((n, n))
+    for j in range(1, n-1):
+        for i in range(1, n-1):
+            f[j, i] = 2 * np.pi**2 * np.sin(np.pi * x[i]) * np.sin(np.pi * y[j])
+
+    # First guess
+    phi = np.zeros((n, n))
+    r = np.zeros((n, n))
+
+    fnorm = residual(phi, f, h, r)
+    rnorm = fnorm
+    niter = 0
+
+    # Multigrid iteration
+    while rnorm > rtol * fnorm and niter < maxiter:
+        v_cycle(phi, f, h, 2, 2)
+        rnorm = residual(phi, f, h, r)
+        niter += 1
+
+    # Return axes' grid, solution, and number of iterations
+    return x, y, phi, niter
@@ -0,0 +1,163 @@
+#! /usr/bin/env python3
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+""" Module providing a worker which times a test case in a single process.
+
+The worker is launched in the folder containing the (compiled) test case. It
+runs the setup command once, calls the statement a few times to warm up,
+then collects the time taken by each call in nanoseconds and the number of
+page faults during the timed calls. If requested, the memory used by one
+additional call is then measured. The results are
+printed to stdout as a JSON dictionary. Anything printed by the test case
+itself is redirected to stderr so that it does not corrupt the results.
+"""
+from argparse import ArgumentParser
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+# The tracemalloc domain in which numpy reports the allocation of array data
+NUMPY_TRACEMALLOC_DOMAIN = 389047
+
+def get_max_rss():
+    """
+    Get the peak resident set size of the process in bytes.
+    """
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is expressed in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+def measure_memory(code, namespace):
+    """
+    Measure the memory used by the execution of some compiled code.
+
+    The code is run twice. The first call measures the peak resident set
+    size of the process. The second call is
+    traced with tracemalloc to find the peak size of the memory allocated
+    through python's allocators (including the data of numpy arrays) and
+    the size of the numpy arrays which are still allocated at the end of
+    the call. Memory allocated directly by compiled code (e.g. by pyccel or
+    numba) is only visible in the resident set size.
+
+    Parameters
+    ----------
+    code : code
+        The compiled code whose memory usage is measured.
+    namespace : dict
+        The namespace in which the code is executed.
+
+    Returns
+    -------
+    dict
+        A dictionary describing the memory usage.
+    """
+    exec(code, namespace) # pylint: disable=exec-used
+    max_rss = get_max_rss()
+
+    tracemalloc.start()
+    try:
+        exec(code, namespace) # pylint: disable=exec-used
+        _, traced_peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.DomainFilter(True, NUMPY_TRACEMALLOC_DOMAIN)])
+    finally:
+        tracemalloc.stop()
+    numpy_bytes = sum(stat.size for stat in snapshot.statistics('filename'))
+
+    return {'peak_rss_bytes' : max_rss,
+            'traced_peak_bytes' : traced_peak,
+            'numpy_retained_bytes' : numpy_bytes}
+
+def collect_samples(setup, stmt, warmup, min_samples, min_time, max_samples, memory = False):
+    """
+    Time the execution of a statement.
+
+    Parameters
+    ----------
+    setup : str
+        The code which should be run once before the timing begins.
+    stmt : str
+        The code whose execution is timed.
+    warmup : int
+        The number of calls which are not timed.
+    min_samples : int
+        The minimum number of timed calls.
+    min_time : float
+        The minimum total time (in seconds) spent in timed calls.
+    max_samples : int
+        The maximum number of timed calls.
+    memory : bool, default=False
+        Indicates whether the memory used by the statement should be measured
+        once the timing is finished.
+
+    Returns
+    -------
+    dict
+        A dictionary containing the duration of each warm-up call and of
+        each timed call in nanoseconds, the number of page faults during the
+        timed calls, and the memory usage if requested.
+    """
+    namespace = {}
+    exec(setup, namespace) # pylint: disable=exec-used
+    code = compile(stmt, '<timed statement>', 'exec')
+
+    perf_counter_ns = time.perf_counter_ns
+
+    warmup_samples = []
+    for _ in range(warmup):
+        t0 = perf_counter_ns()
+        exec(code, namespace) # pylint: disable=exec-used
+        t1 = perf_counter_ns()
+        warmup_samples.append(t1 - t0)
+
+    samples = []
+    min_time_ns = min_time * 1e9
+    total = 0
+    r0 = resource.getrusage(resource.RUSAGE_SELF)
+    while len(samples) < max_samples and (len(samples) < min_samples or total < min_time_ns):
+        t0 = perf_counter_ns()
+        exec(code, namespace) # pylint: disable=exec-used
+        t1 = perf_counter_ns()
+        samples.append(t1 - t0)
+        total += t1 - t0
+    r1 = resource.getrusage(resource.RUSAGE_SELF)
+
+    result = {'warmup' : warmup_samples, 'samples' : samples,
+              'minor_page_faults' : r1.ru_minflt - r0.ru_minflt,
+              'major_page_faults' : r1.ru_majflt - r0.ru_majflt}
+    if memory:
+        result['memory'] = measure_memory(code, namespace)
+    return result
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Time a statement and print the duration of each call as JSON')
+    parser.add_argument('--setup', type=str, default='', help='Code run once before the timing begins')
+    parser.add_argument('--warmup', type=int, default=1, help='Number of calls which are not timed (default=1)')
+    parser.add_argument('--min-samples', type=int, default=5, help='Minimum number of timed calls (default=5)')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum total time spent in timed calls in seconds (default=0.2)')
+    parser.add_argument('--max-samples', type=int, default=10000, help='Maximum number of timed calls (default=10000)')
+    parser.add_argument('--memory', action='store_true', help='Measure the memory used by the statement once the timing is finished')
+    parser.add_argument('stmt', type=str, help='The code whose execution is timed')
+    args = parser.parse_args()
+
+    # The test case is found in the folder where the worker is launched
+    sys.path.insert(0, os.getcwd())
+
+    # Redirect anything printed by the test case (including by compiled code) to stderr
+    sys.stdout.flush()
+    result_fd = os.dup(1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    result = collect_samples(args.setup, args.stmt, args.warmup, args.min_samples,
+                             args.min_time, args.max_samples, args.memory)
+
+    sys.stderr.flush()
+    with os.fdopen(result_fd, 'w') as result_file:
+        json.dump(result, result_file)
@@ -0,0 +1,186 @@
+#! /usr/bin/env python3
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+""" Module providing a worker which times a test case in several concurrent processes.
+
+The worker is launched in the folder containing the (compiled) test case. It
+starts one process per instance of the test case, each pinned to its own core
+if enough cores are available. Each process runs the setup command and the
+warm-up calls, then waits for the other processes so that the timed calls of
+all the processes overlap. A process keeps calling the statement (without
+timing it) after it has collected enough samples until all the processes have
+finished, so the load on the machine is constant while the samples are
+collected.
+
+Each process saves its samples in its own slice of an array in shared memory,
+so the results do not need to be sent through pipes. The results are printed
+to stdout as a JSON dictionary. Anything printed by the test case itself is
+redirected to stderr so that it does not corrupt the results.
+"""
+from argparse import ArgumentParser
+import json
+import multiprocessing
+from multiprocessing import shared_memory
+import os
+import sys
+import time
+
+def run_instance(index, n_processes, shm_name, barrier, setup, stmt, warmup, min_samples, min_time, max_samples):
+    """
+    Time the execution of a statement in one of the concurrent processes.
+
+    The shared array of 64-bit integers has one row per process. The first
+    element of the row indicates whether the process has finished collecting
+    samples, the second is the number of warm-up calls, the third is the
+    number of timed calls, and the durations (in nanoseconds) of the warm-up
+    calls and of the timed calls follow.
+
+    Parameters
+    ----------
+    index : int
+        The index of the process.
+    n_processes : int
+        The number of concurrent processes.
+    shm_name : str
+        The name of the block of shared memory containing the results.
+    barrier : multiprocessing.Barrier
+        The barrier at which the processes wait before the timing begins.
+    setup : str
+        The code which should be run once before the timing begins.
+    stmt : str
+        The code whose execution is timed.
+    warmup : int
+        The number of calls which are not timed.
+    min_samples : int
+        The minimum number of timed calls.
+    min_time : float
+        The minimum total time (in seconds) spent in timed calls.
+    max_samples : int
+        The maximum number of timed calls.
+    """
+    # Processes are only pinned on platforms which support it (e.g. not on macOS)
+    if hasattr(os, 'sched_setaffinity'):
+        cores = sorted(os.sched_getaffinity(0))
+        if len(cores) >= n_processes:
+            os.sched_setaffinity(0, {cores[index]})
+
+    # The test case is found in the folder where the worker is launched
+    sys.path.insert(0, os.getcwd())
+
+    # Redirect anything printed by the test case (including by compiled code) to stderr
+    sys.stdout.flush()
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    row_size = 3 + warmup + max_samples
+    results = shm.buf.cast('q')
+    row = results[index*row_size:(index+1)*row_size]
+
+    try:
+        try:
+            namespace = {}
+            exec(setup, namespace) # pylint: disable=exec-used
+            code = compile(stmt, '<timed statement>', 'exec')
+
+            perf_counter_ns = time.perf_counter_ns
+
+            for i in range(warmup):
+                t0 = perf_counter_ns()
+                exec(code, namespace) # pylint: disable=exec-used
+                t1 = perf_counter_ns()
+                row[3+i] = t1 - t0
+            row[1] = warmup
+        except BaseException:
+            # Release the other processes
+            barrier.abort()
+            raise
+
+        barrier.wait()
+
+        n_samples = 0
+        min_time_ns = min_time * 1e9
+        total = 0
+        while row[0] == 0 or not all(results[i*row_size] for i in range(n_processes)):
+            t0 = perf_counter_ns()
+            exec(code, namespace) # pylint: disable=exec-used
+            t1 = perf_counter_ns()
+            if row[0] == 0:
+                row[3+warmup+n_samples] = t1 - t0
+                n_samples += 1
+                row[2] = n_samples
+                total += t1 - t0
+                if n_samples >= max_samples or (n_samples >= min_samples and total >= min_time_ns):
+                    row[0] = 1
+    finally:
+        # Ensure that the other processes do not wait for this one if it fails
+        row[0] = 1
+        row.release()
+        results.release()
+        shm.close()
+
+def collect_samples(n_processes, setup, stmt, warmup, min_samples, min_time, max_samples):
+    """
+    Time the execution of a statement in several concurrent processes.
+
+    See run_instance for a description of the parameters.
+
+    Returns
+    -------
+    dict or None
+        A dictionary containing the duration of each warm-up call and of
+        each timed call of each process in nanoseconds, or None if one of
+        the processes failed.
+    """
+    row_size = 3 + warmup + max_samples
+    shm = shared_memory.SharedMemory(create=True, size=n_processes * row_size * 8)
+    try:
+        results = shm.buf.cast('q')
+        for i in range(n_processes * row_size):
+            results[i] = 0
+
+        ctx = multiprocessing.get_context('spawn')
+        barrier = ctx.Barrier(n_processes)
+        processes = [ctx.Process(target=run_instance,
+                                 args=(i, n_processes, shm.name, barrier, setup, stmt,
+                                       warmup, min_samples, min_time, max_samples))
+                     for i in range(n_processes)]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+
+        if any(p.exitcode != 0 for p in processes):
+            result = None
+        else:
+            rows = [results[i*row_size:(i+1)*row_size].tolist() for i in range(n_processes)]
+            result = {'warmup'  : [r[3:3+r[1]] for r in rows],
+                      'samples' : [r[3+warmup:3+warmup+r[2]] for r in rows]}
+        results.release()
+    finally:
+        shm.close()
+        shm.unlink()
+    return result
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Time a statement in several concurrent processes and print the duration of each call as JSON')
+    parser.add_argument('--processes', type=int, default=1, help='Number of concurrent processes (default=1)')
+    parser.add_argument('--setup', type=str, default='', help='Code run once in each process before the timing begins')
+    parser.add_argument('--warmup', type=int, default=1, help='Number of calls which are not timed (default=1)')
+    parser.add_argument('--min-samples', type=int, default=5, help='Minimum number of timed calls in each process (default=5)')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum total time spent in timed calls in each process in seconds (default=0.2)')
+    parser.add_argument('--max-samples', type=int, default=10000, help='Maximum number of timed calls in each process (default=10000)')
+    parser.add_argument('stmt', type=str, help='The code whose execution is timed')
+    args = parser.parse_args()
+
+    worker_results = collect_samples(max(args.processes, 1), args.setup, args.stmt, args.warmup,
+                                     args.min_samples, args.min_time, args.max_samples)
+
+    if worker_results is None:
+        print("A process failed", file=sys.stderr)
+        sys.exit(1)
+
+    json.dump(worker_results, sys.stdout)